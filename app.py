@@ -1,26 +1,39 @@
 # app.py  (Naver Land-ish UI/UX version)
-import re
-from urllib.parse import quote, urlparse, parse_qs
-
 import math
-import requests
-import team_explore
+import os
+import time
+from typing import List, Optional
 import pandas as pd
-import plotly.express as px
 import streamlit as st
-import folium
-from streamlit_folium import st_folium
 
+# plotly / folium / streamlit_folium / team_explore / subway_data 는 쓰는 페이지에서만 import
+# (로비 페이지 콜드 스타트 비용 절감, benchmarks/startup_bench.py 로 측정)
+import instrumentation
+from instrumentation import cached, record_error, timer
+import profiling
 import scraper
-from utils import (
-    items_to_dataframe,
-    parse_price_to_manwon,
-    sqm_to_pyeong,
-    haversine_distance,
-    estimate_walking_minutes,
+from resilience import UpstreamError
+from search_pipeline import (
+    apply_filters,
+    build_listing_frame,
+    filter_walking,
+    resolve_region,
+    sort_results,
 )
-from subway_data import SUBWAY_LINES
+from subway_data import get_subway_lines
 from poi_schools import fetch_nearby_schools_osm
+import poi_engine
+from listing_results import DEFAULT_PAGE_SIZE, ListingResults
+from listing_store import ListingStore
+
+# 외부 HTTP 녹화/재생: HTTP_REPLAY=record:<파일> / replay:<파일> 일 때만 (http_replay.py)
+if os.getenv("HTTP_REPLAY"):
+    import http_replay
+
+    http_replay.install_from_env()
+
+# 외부 호출 횟수/시간/오류 집계 (instrumentation.py, 프로세스당 한 번)
+instrumentation.install_http_metrics()
 
 
 # =========================================================
@@ -156,6 +169,12 @@ div.stButton>button[kind="primary"]:hover { filter: brightness(0.96); }
 .li-sub{ color:#6B7280; font-size:0.88rem; margin-top:6px; }
 .li-meta{ color:#6B7280; font-size:0.86rem; margin-top:4px; }
 .li-cta { padding: 0 12px 12px 12px; }
+.li-no{ color:#9AA0A6; font-weight:700; font-size:0.8rem; margin-right:6px; }
+.li-region{ color:#03C75A; font-weight:700; font-size:0.78rem; margin-left:6px; }
+.li-badge{ font-size:0.72rem; font-weight:800; margin-left:6px; padding:1px 6px; border-radius:999px; }
+.li-badge.new{ background:rgba(3,199,90,0.12); color:#03C75A; }
+.li-badge.down{ background:rgba(47,109,246,0.12); color:#2F6DF6; }
+.li-badge.up{ background:rgba(231,76,60,0.12); color:#E74C3C; }
 
 /* ===== 선택 강조 ===== */
 .list-item.selected { border-color: #03C75A; box-shadow: 0 8px 20px rgba(3,199,90,0.14); }
@@ -350,6 +369,8 @@ if "df" not in st.session_state:
     st.session_state.df = None
 if "selected_id" not in st.session_state:
     st.session_state.selected_id = None
+if "results" not in st.session_state:
+    st.session_state.results = None
 if "region_meta" not in st.session_state:
     st.session_state.region_meta = None  # (keyword, cortarNo, lat, lon)
 
@@ -357,74 +378,26 @@ if "region_meta" not in st.session_state:
 # =========================================================
 # 2) Region resolving
 # =========================================================
-def _mobile_headers():
-    return {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Mobile Safari/537.36"
-        ),
-        "Referer": "https://m.land.naver.com/",
-        "Accept": "text/html,application/json",
-    }
-
-
-def resolve_region(keyword: str):
-    keyword = (keyword or "").strip()
-    if not keyword:
-        raise ValueError("지역명을 입력하세요. 예) 서울 종로구 / 잠실동 / 판교")
-
-    url = f"https://m.land.naver.com/search/result/{quote(keyword)}"
-    resp = requests.get(url, headers=_mobile_headers(), timeout=15, allow_redirects=True)
-    resp.raise_for_status()
+@cached("sigungu_table", st.cache_data(show_spinner=False))
+def load_sigungu_table():
+    """시도 전체 검색용 시군구 목록 (시군구코드, 시도, 시군구, 위도, 경도)"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "korea_sigungu_coordinates.csv")
+    return pd.read_csv(path, encoding="utf-8-sig", dtype={"시군구코드": str})
 
-    final_url = resp.url
-    parsed = urlparse(final_url)
-    q = parse_qs(parsed.query)
 
-    def pick(name):
-        v = q.get(name)
-        return v[0] if v else None
-
-    cortar_no = pick("cortarNo")
-    lat = pick("lat")
-    lon = pick("lon")
-
-    if cortar_no and lat and lon:
-        return str(cortar_no), float(lat), float(lon)
-
-    html = resp.text
-    m_c = re.search(r'cortarNo["\']?\s*[:=]\s*["\']?(\d+)', html)
-    m_lat = re.search(r'lat["\']?\s*[:=]\s*["\']?([0-9.]+)', html)
-    m_lon = re.search(r'lon["\']?\s*[:=]\s*["\']?([0-9.]+)', html)
-
-    if m_c and m_lat and m_lon:
-        return m_c.group(1), float(m_lat.group(1)), float(m_lon.group(1))
-
-    raise RuntimeError("지역 좌표/코드를 찾지 못했어요. 더 구체적으로 입력해보세요.")
+def resolve_batch_region(name: str):
+    """'시도 시군구' 이름은 좌표표에서 바로 (cortarNo, lat, lon), 나머지는 resolve_region"""
+    t = load_sigungu_table()
+    hit = t[(t["시도"] + " " + t["시군구"]) == name]
+    if not hit.empty:
+        r = hit.iloc[0]
+        return r["시군구코드"].ljust(10, "0"), float(r["위도"]), float(r["경도"])
+    return resolve_region(name)
 
 
 # =========================================================
 # 2-1) Price bucket (list colors)
 # =========================================================
-def price_bucket_v2(price_manwon):
-    if price_manwon is None or pd.isna(price_manwon):
-        return "가격정보없음"
-    try:
-        p = float(price_manwon)
-    except:
-        return "가격정보없음"
-
-    if p < 10000:
-        return "1억 미만"
-    elif p < 50000:
-        return "1억 ~ 5억"
-    elif p < 100000:
-        return "5억 ~ 10억"
-    else:
-        return "10억 초과"
-
-
 BUCKET_COLOR = {
     "1억 미만": "#D8C9A8",   # 베이지
     "1억 ~ 5억": "#2E8B57",  # 초(그린)
@@ -445,7 +418,7 @@ def display_map(
     stations=None,
     walking_limit=10,
     school_overlay=None,
-    selected_id=None,
+    selected_pos=None,
 ):
     if df is None or df.empty:
         if center_lat is None or center_lon is None:
@@ -455,6 +428,18 @@ def display_map(
         center_lat = pd.to_numeric(df["위도"], errors="coerce").mean()
         center_lon = pd.to_numeric(df["경도"], errors="coerce").mean()
 
+    from streamlit_folium import st_folium
+
+    with timer("map.build"):
+        m = _build_map(df, center_lat, center_lon, zoom, stations, walking_limit, school_overlay, selected_pos)
+    with timer("map.render"):
+        st_folium(m, use_container_width=True, height=560, returned_objects=[])
+
+
+def _build_map(df, center_lat, center_lon, zoom, stations, walking_limit, school_overlay, selected_pos):
+    """folium 지도 객체 생성 (타일/학교/지하철/매물 마커)"""
+    import folium
+
     m = folium.Map(location=[center_lat, center_lon], zoom_start=zoom, tiles=None)
 
     folium.TileLayer("OpenStreetMap", name="기본 지도", control=True).add_to(m)
@@ -473,7 +458,11 @@ def display_map(
         try:
             radius_m = int(school_overlay.get("radius_m", 2000))
             levels = school_overlay.get("levels") or ["초", "중", "고"]
-            schools = fetch_nearby_schools_osm(center_lat, center_lon, radius_m)
+            try:
+                schools = fetch_nearby_schools_osm(center_lat, center_lon, radius_m)
+            except UpstreamError as e:
+                st.warning(f"학교 위치를 불러오지 못했습니다: {e}")
+                schools = []
             sch_color_map = {"초": "green", "중": "orange", "고": "red", "기타": "purple"}
 
             for s in schools:
@@ -488,8 +477,8 @@ def display_map(
                         prefix="fa",
                     ),
                 ).add_to(m)
-        except:
-            pass
+        except Exception as e:
+            record_error("app.school_overlay", e)
 
     # 지하철
     if stations:
@@ -521,12 +510,16 @@ def display_map(
             "가격정보없음": "gray",
         }
 
-        for _, row in df.iterrows():
-            lat, lon = pd.to_numeric(row["위도"]), pd.to_numeric(row["경도"])
+        # selected_pos: df 행 번호 (ListingResults.position 으로 조회한 값)
+        lats = pd.to_numeric(df["위도"], errors="coerce").to_numpy()
+        lons = pd.to_numeric(df["경도"], errors="coerce").to_numpy()
+        n_markers = 0
+        for pos, (_, row) in enumerate(df.iterrows()):
+            lat, lon = lats[pos], lons[pos]
             if pd.isna(lat) or pd.isna(lon):
                 continue
 
-            is_selected = selected_id is not None and str(row["매물ID"]) == str(selected_id)
+            is_selected = pos == selected_pos
             icon_name = "star" if is_selected else ("building" if "아파트" in str(row["매물유형"]) else "home")
 
             folium.Marker(
@@ -539,8 +532,82 @@ def display_map(
                     prefix="fa",
                 ),
             ).add_to(m)
+            n_markers += 1
+        instrumentation.count("map_markers", n_markers)
+
+    return m
+
+
+# =========================================================
+# 3-1) Listing infra score
+# =========================================================
+@cached("national_poi_store", st.cache_resource(show_spinner=False))
+def load_national_poi_store():
+    """data/poi_points.npz(전국 POI)를 프로세스당 한 번만 로드 (없으면 지하철역만)"""
+    return poi_engine.load_poi_store()
 
-    st_folium(m, use_container_width=True, height=560, returned_objects=[])
+
+@cached("poi_bbox_loader", st.cache_resource(show_spinner=False))
+def load_poi_bbox_loader():
+    """전국 POI 파일이 없고 POI_LIVE_FETCH=1 일 때: 검색 범위 bbox를 백그라운드에서 Overpass로 적재 (프로세스당 하나)"""
+    return poi_engine.BBoxPOILoader(load_national_poi_store())
+
+
+# =========================================================
+# 3-2) Local listing store (수집 이력 / 신규·가격 변동)
+# =========================================================
+STORE_MAX_AGE_S = 6 * 3600  # 이 시간 안에 수집한 지역은 저장소에서 바로 응답
+
+
+@cached("listing_store", st.cache_resource(show_spinner=False))
+def load_listing_store():
+    """프로세스 공용 SQLite 매물 저장소 (data/listings.sqlite3)"""
+    return ListingStore()
+
+
+def add_history_columns(df):
+    """
+    저장소 이력으로 '신규', '가격변동(만원)'(직전 가격 대비) 열 추가.
+    신규: 24시간 내 최초 확인 + 지역 첫 수집 이후에 나타난 매물 (처음 수집한 지역의 매물은 전부 신규가 아님)
+    """
+    hist = load_listing_store().history(df["매물ID"].tolist())
+    day_ago = time.time() - 86400
+    first_seen = pd.to_numeric(df["매물ID"].map(lambda a: hist.get(a, {}).get("first_seen")), errors="coerce")
+    first_synced = pd.to_numeric(df["매물ID"].map(lambda a: hist.get(a, {}).get("region_first_synced")), errors="coerce")
+    df["신규"] = (first_seen >= day_ago) & (first_seen > first_synced)
+    prev = pd.to_numeric(df["매물ID"].map(lambda a: hist.get(a, {}).get("prev_price")), errors="coerce")
+    df["가격변동(만원)"] = df["가격(만원)"] - prev
+    return df
+
+
+def add_infra_scores(df, weights, radius_m=500):
+    """결과 프레임 전체에 대해 매물별 인프라 점수(0~100)를 한 번에 계산해 '인프라점수' 컬럼 추가"""
+    if df.empty:
+        df["인프라점수"] = pd.Series(dtype=float)
+        return df
+
+    # 점수는 로컬 저장소로만 계산 (전국 POI 파일, 없으면 지하철역만) — 검색 rerun 이 네트워크를 기다리지 않게
+    store = load_national_poi_store()
+    if poi_engine.POI_LIVE_FETCH and not os.path.exists(poi_engine.DEFAULT_STORE_PATH):
+        lat, lon = df["위도"], df["경도"]
+        # 반경만큼 여유를 둔 bbox (캐시 적중률을 위해 소수 2자리로 반올림)
+        pad = radius_m / 100_000 + 0.01
+        bbox = (
+            round(lat.min() - pad, 2),
+            round(lon.min() - pad, 2),
+            round(lat.max() + pad, 2),
+            round(lon.max() + pad, 2),
+        )
+        live = load_poi_bbox_loader().get(bbox)
+        if live is None:
+            st.caption("주변 시설 정보를 불러오는 중이거나 불러오지 못해, 지금은 지하철역만 반영한 인프라 점수입니다.")
+        else:
+            store = live
+
+    df["인프라점수"] = poi_engine.score_listings(
+        store, df["위도"].to_numpy(), df["경도"].to_numpy(), weights, radius_m
+    )
+    return df
 
 
 # =========================================================
@@ -593,13 +660,23 @@ def sidebar_controls():
         if "kw" not in st.session_state or not str(st.session_state["kw"]).strip():
             st.session_state["kw"] = default_kw
 
-        keyword = st.text_input(
-            "지역",
-            key="kw",
-            placeholder="예) 잠실동 / 판교 / 서울 종로구",
-        )
+        search_mode = st.radio("검색 방식", ["지역 입력", "시도 전체"], horizontal=True, key="search_mode")
+        if search_mode == "지역 입력":
+            keyword = st.text_input(
+                "지역",
+                key="kw",
+                placeholder="예) 잠실동 / 판교 / 서울 종로구 (쉼표로 여러 지역)",
+            )
+            regions = [r.strip() for r in str(keyword).split(",") if r.strip()]
+        else:
+            sgg = load_sigungu_table()
+            sido = st.selectbox("시도", sorted(sgg["시도"].unique()), key="batch_sido")
+            sgg = sgg[sgg["시도"] == sido]
+            picked = st.multiselect("시군구 (비우면 전체)", sgg["시군구"].tolist(), key="batch_sgg")
+            regions = [f"{sido} {g}" for g in (picked or sgg["시군구"].tolist())]
+            keyword = sido if not picked else ", ".join(regions)
 
-        limit = st.slider("가져올 개수", 10, 50, 50, 10, key="limit")
+        limit = st.slider("가져올 개수 (지역당)", 10, 50, 50, 10, key="limit")
 
         st.markdown("---")
         st.markdown("### 🧰 필터")
@@ -671,16 +748,39 @@ def sidebar_controls():
         st.markdown("<div class='filter-title'>지하철</div>", unsafe_allow_html=True)
         st.markdown("<div class='filter-sub'>선택한 노선 기준 도보 제한</div>", unsafe_allow_html=True)
 
-        subway_line = st.selectbox("노선 선택", options=["선택 안 함"] + list(SUBWAY_LINES.keys()), key="subway_line")
+        subway_line = st.selectbox("노선 선택", options=["선택 안 함"] + list(get_subway_lines().keys()), key="subway_line")
         w_time = 10
         if subway_line != "선택 안 함":
             w_time = st.slider("최대 도보 시간 (분)", 5, 30, 10, 5, key="w_time")
         st.markdown("</div>", unsafe_allow_html=True)
 
+        # 생활 인프라 점수 (지역 탐색의 가중치 슬라이더와 같은 구성)
+        st.markdown("<div class='filter-card'>", unsafe_allow_html=True)
+        st.markdown("<div class='filter-title'>생활 인프라</div>", unsafe_allow_html=True)
+        st.markdown("<div class='filter-sub'>매물 주변 인프라 가중치 (점수 계산용)</div>", unsafe_allow_html=True)
+
+        infra_weights = {
+            "subway": st.slider("🚇 역세권", 0, 10, 5, key="s_w_subway"),
+            "school": st.slider("🎓 교육", 0, 10, 4, key="s_w_school"),
+            "hospital": st.slider("🏥 의료", 0, 10, 3, key="s_w_hospital"),
+            "culture": st.slider("🎭 문화생활", 0, 10, 2, key="s_w_culture"),
+            "mall": st.slider("🛍️ 쇼핑", 0, 10, 1, key="s_w_mall"),
+        }
+        infra_radius = st.select_slider("주변 반경(m)", options=[300, 500, 800, 1000], value=500, key="s_infra_radius")
+        st.markdown("</div>", unsafe_allow_html=True)
+
+        use_store = st.checkbox(
+            "최근 수집 데이터 우선 (6시간 이내)",
+            value=True,
+            key="use_store",
+            help="같은 지역을 최근에 수집했다면(또는 sync_worker.py 가 미리 수집해 두었다면) 네이버에 다시 요청하지 않고 로컬 저장소에서 바로 보여줍니다.",
+        )
+
         run = st.button("검색 실행", type="primary", use_container_width=True)
 
     return {
         "keyword": keyword,
+        "regions": regions,
         "limit": int(limit),
         "trad_selected": trad_selected,
         "rlet_selected": rlet_selected,
@@ -689,6 +789,9 @@ def sidebar_controls():
         "budget_limit": budget_limit,
         "subway_line": subway_line,
         "w_time": w_time,
+        "infra_weights": infra_weights,
+        "infra_radius": int(infra_radius),
+        "use_store": use_store,
         "run": run,
     }
 
@@ -779,7 +882,9 @@ def render_explore():
         st.session_state.page = "lobby"
         st.rerun()
 
-    # ✅ 팀 화면을 여기서 그대로 렌더
+    # ✅ 팀 화면을 여기서 그대로 렌더 (plotly/folium/피처 행렬은 이 페이지에서 처음 로드)
+    import team_explore
+
     team_explore.render_team_explore()
 
 
@@ -797,57 +902,60 @@ def render_search():
     if ctl["run"]:
         st.session_state.selected_id = None
         try:
-            c, lat, lon = resolve_region(ctl["keyword"])
-            st.session_state.region_meta = (ctl["keyword"], c, lat, lon)
+            regions = ctl["regions"]
+            if not regions:
+                raise ValueError("지역명을 입력하세요. 예) 서울 종로구 / 잠실동 / 판교")
+
+            # 여러 지역은 동시에 해석/수집 (요청 간격 예산은 scraper.rate_limited 로 공유)
+            with st.spinner(f"매물 수집 중... ({len(regions)}개 지역)"), timer("search.collect"):
+                items, failed = scraper.scrape_regions(
+                    regions,
+                    resolve_batch_region,
+                    limit=ctl["limit"],
+                    store=load_listing_store(),
+                    max_age_s=STORE_MAX_AGE_S if ctl["use_store"] else None,
+                )
+            if failed and len(failed) == len(regions):
+                raise RuntimeError(next(iter(failed.values())))
+            for name, msg in failed.items():
+                st.warning(f"{name}: {msg}")
+            st.session_state.region_meta = (ctl["keyword"], None, None, None)
 
-            with st.spinner("매물 수집 중..."):
-                items = scraper.scrape_articles(cortar_no=c, lat=lat, lon=lon, limit=ctl["limit"])
             if not items:
                 st.warning("매물이 없습니다.")
                 st.stop()
 
-            df = items_to_dataframe(items)
-            df["가격(만원)"] = df["가격"].apply(parse_price_to_manwon)
-            df["면적(평)"] = pd.to_numeric(df["면적(㎡)"], errors="coerce").apply(sqm_to_pyeong)
-            df["가격구간"] = df["가격(만원)"].apply(price_bucket_v2)
-            df["위도"] = pd.to_numeric(df["위도"], errors="coerce")
-            df["경도"] = pd.to_numeric(df["경도"], errors="coerce")
+            # 표 변환 → 도보/조건 필터 (search_pipeline.py, benchmarks/search_pipeline_bench.py 로 측정)
+            df = build_listing_frame(items)
+            with timer("search.history"):
+                df = add_history_columns(df)
 
             # subway filter
             if ctl["subway_line"] != "선택 안 함":
-                stns = SUBWAY_LINES[ctl["subway_line"]]
-
-                def get_w(row):
-                    if pd.isna(row["위도"]) or pd.isna(row["경도"]):
-                        return 999
-                    m_t = 999
-                    for _, (slat, slon) in stns.items():
-                        d = haversine_distance(row["위도"], row["경도"], slat, slon)
-                        t = estimate_walking_minutes(d)
-                        if t < m_t:
-                            m_t = t
-                    return m_t
-
-                df["도보시간(분)"] = df.apply(get_w, axis=1)
-                df = df[df["도보시간(분)"] <= ctl["w_time"]]
+                df = filter_walking(df, get_subway_lines()[ctl["subway_line"]], ctl["w_time"])
 
             # other filters
-            if ctl["trad_selected"]:
-                df = df[df["거래유형"].isin(ctl["trad_selected"])]
-            if ctl["rlet_selected"]:
-                df = df[df["매물유형"].isin(ctl["rlet_selected"])]
-
-            df = df[
-                (df["면적(평)"].isna())
-                | ((df["면적(평)"] >= ctl["py_min"]) & (df["면적(평)"] <= ctl["py_max"]))
-            ]
+            df = apply_filters(
+                df,
+                ctl["trad_selected"],
+                ctl["rlet_selected"],
+                ctl["py_min"],
+                ctl["py_max"],
+                ctl["budget_limit"],
+            )
 
-            if ctl["budget_limit"] > 0:
-                df = df[(df["가격(만원)"].isna()) | (df["가격(만원)"] <= ctl["budget_limit"])]
+            # 필터를 통과한 매물 전체에 대해 인프라 점수 일괄 계산
+            if not df.dropna(subset=["위도", "경도"]).empty:
+                with timer("search.infra_scores"):
+                    df = add_infra_scores(df.copy(), ctl["infra_weights"], ctl["infra_radius"])
 
-            st.session_state.df = df.sort_values("가격(만원)", ascending=False).reset_index(drop=True)
+            st.session_state.df = sort_results(df)
+            # 목록 카드 HTML 등 표시용 데이터는 결과가 확정될 때 한 번만 생성
+            with timer("search.results"):
+                st.session_state.results = ListingResults(st.session_state.df, BUCKET_COLOR)
 
         except Exception as e:
+            record_error("app.search", e)
             st.error(str(e))
 
     df = st.session_state.df
@@ -886,64 +994,70 @@ def render_search():
     with L:
         st.markdown("---")
         st.markdown("<div class='section-title'>📋 목록</div>", unsafe_allow_html=True)
-        q = st.text_input("목록 내 검색", placeholder="건물명 검색...", label_visibility="collapsed")
-        ldf = df[df["단지/건물명"].str.contains(q, case=False, na=False)] if q else df
+        q = st.text_input(
+            "목록 내 검색", placeholder="건물명·특징·중개사 검색 (초성 가능: ㄹㅁㅇ)", label_visibility="collapsed"
+        )
 
-        st.markdown("<div class='list-wrap'>", unsafe_allow_html=True)
+        results = st.session_state.results
+        if results is None or results.df is not df:
+            results = st.session_state.results = ListingResults(df, BUCKET_COLOR)
+        # 결과 도착 시 만든 n-gram 색인으로 검색 (매 입력마다 전체 열을 훑지 않음)
+        positions = results.search_index.search(q)
 
         # default selection if none
         if st.session_state.selected_id is None and not df.empty:
             st.session_state.selected_id = str(df.iloc[0]["매물ID"])
-
-        for _, r in ldf.head(80).iterrows():  # ✅ 네이버처럼 더 길게 보여도 목록만 스크롤
-            b = r.get("가격구간", "가격정보없음")
-            sw = BUCKET_COLOR.get(b, "#9AA0A6")
-            sel = (str(r["매물ID"]) == str(st.session_state.selected_id))
-            cls = "list-item selected" if sel else "list-item"
-
-            price = r.get("가격", "-")
-            rlet = r.get("매물유형", "-")
-            trad = r.get("거래유형", "-")
-            py = r.get("면적(평)")
-            py_txt = f"{py:.1f}평" if pd.notna(py) else "-"
-            floor = r.get("층", "-")
-
-            st.markdown(f"<div class='{cls}'>", unsafe_allow_html=True)
-            st.markdown(
-                f"""
-                <div class='list-row'>
-                  <div class='swatch' style='background:{sw}'></div>
-                  <div style='flex:1; min-width:0;'>
-                    <div class='li-title'>{r['단지/건물명']}</div>
-                    <div class='li-sub'><b>{price}</b> · {b}</div>
-                    <div class='li-meta'>{rlet} / {trad} · {py_txt} · {floor}</div>
-                  </div>
-                </div>
-                """,
-                unsafe_allow_html=True,
+        selected_pos = results.position(st.session_state.selected_id)
+
+        # ✅ 페이지 단위로 미리 렌더된 카드 HTML을 한 번에 출력 (결과 수와 무관하게 요소 수 일정)
+        n_pages = max(1, math.ceil(len(positions) / DEFAULT_PAGE_SIZE))
+        page_no = 1
+        if n_pages > 1:
+            page_no = int(
+                st.number_input(
+                    f"페이지 (총 {len(positions):,}건 · {n_pages}쪽)", 1, n_pages, 1, key=f"list_page_{q}"
+                )
+            )
+        page_pos = results.page(positions, page_no)
+        st.markdown(results.page_html(page_pos, selected_pos), unsafe_allow_html=True)
+
+        def _on_pick(widget_key):
+            p = st.session_state.get(widget_key)
+            if p is not None:
+                st.session_state.selected_id = str(results.ids[p])
+
+        if len(page_pos):
+            pick_key = f"list_pick_{q}_{page_no}"
+            page_list = page_pos.tolist()
+            st.selectbox(
+                "지도/상세 보기",
+                options=page_list,
+                index=page_list.index(selected_pos) if selected_pos in page_list else None,
+                format_func=lambda p: f"{p + 1}. {results.titles[p]}",
+                placeholder="목록에서 매물 선택",
+                key=pick_key,
+                on_change=_on_pick,
+                args=(pick_key,),
             )
-            st.markdown("<div class='li-cta'>", unsafe_allow_html=True)
-            if st.button("지도/상세 보기", key=f"btn_{r['매물ID']}", use_container_width=True):
-                st.session_state.selected_id = str(r["매물ID"])
-                st.rerun()
-            st.markdown("</div></div>", unsafe_allow_html=True)
 
-        st.markdown("</div>", unsafe_allow_html=True)  # list-wrap
         st.markdown("</div>", unsafe_allow_html=True)  # card
 
     # RIGHT: map + detail sticky
     with R:
         st.markdown("<div class='sticky-pane'>", unsafe_allow_html=True)
 
-        sel = st.session_state.selected_id or (str(df.iloc[0]["매물ID"]) if not df.empty else None)
-        if sel:
-            row = df[df["매물ID"] == sel].iloc[0]
+        # 매물ID 해시 색인으로 선택 행 조회 (선택 ID가 결과에 없으면 첫 행)
+        sel_pos = results.position(st.session_state.selected_id)
+        if sel_pos is None and not df.empty:
+            sel_pos = 0
+        if sel_pos is not None:
+            row = df.iloc[sel_pos]
 
             st.markdown("---")
             st.markdown("<div class='section-title'>🗺️ 지도</div>", unsafe_allow_html=True)
             st.markdown(f"<div class='muted'><b>{row['단지/건물명']}</b> 중심으로 표시</div>", unsafe_allow_html=True)
 
-            curr_stns = SUBWAY_LINES.get(ctl["subway_line"]) if ctl.get("subway_line") != "선택 안 함" else None
+            curr_stns = get_subway_lines().get(ctl["subway_line"]) if ctl.get("subway_line") != "선택 안 함" else None
             display_map(
                 df,
                 center_lat=row["위도"],
@@ -952,7 +1066,7 @@ def render_search():
                 stations=curr_stns,
                 walking_limit=ctl.get("w_time", 10),
                 school_overlay=school_overlay,
-                selected_id=sel,
+                selected_pos=sel_pos,
             )
             st.markdown("</div>", unsafe_allow_html=True)
 
@@ -966,6 +1080,8 @@ def render_search():
                     "층": row.get("층"),
                     "방향": row.get("방향"),
                     "확인일": row.get("확인일"),
+                    "검색 지역": row.get("검색지역"),
+                    "인프라 점수": f"{row['인프라점수']:.1f}점" if pd.notna(row.get("인프라점수")) else "-",
                 }
             )
             if row.get("특징"):
@@ -990,10 +1106,15 @@ def render_search():
 
             atcl_no = str(row["매물ID"])
             gallery_urls: List[str] = []
+            gallery_error: Optional[str] = None
             try:
                 # 네이버 프론트 API/HTML에서 방 사진(갤러리) 시도
-                gallery_urls = scraper.get_article_image_urls(atcl_no) or []
-            except Exception:
+                with timer("search.gallery"):
+                    gallery_urls = scraper.get_article_image_urls(atcl_no) or []
+            except UpstreamError as e:
+                gallery_error = str(e)
+            except Exception as e:
+                record_error("app.gallery", e)
                 gallery_urls = []
 
             # 썸네일 + 갤러리 URL을 하나의 리스트로 합치고 중복 제거
@@ -1018,6 +1139,11 @@ def render_search():
             if final_urls:
                 # 너무 많은 이미지는 부담이 될 수 있어 상위 12장만 노출
                 st.image(final_urls[:12])
+            elif gallery_error:
+                st.markdown(
+                    f"<div class='muted'>네이버 사진 서버 응답 오류로 이미지를 불러오지 못했습니다. 잠시 후 다시 시도해 주세요. ({gallery_error})</div>",
+                    unsafe_allow_html=True,
+                )
             else:
                 st.markdown(
                     "<div class='muted'>해당 매물에 대해 불러올 수 있는 사진이 없거나, 네이버 측 응답이 없어 이미지를 표시하지 못했습니다.</div>",
@@ -1031,6 +1157,8 @@ def render_search():
     st.markdown("<div class='card'>", unsafe_allow_html=True)
     st.markdown("<div class='section-title'>📊 가격 구간 분포</div>", unsafe_allow_html=True)
     order = ["1억 미만", "1억 ~ 5억", "5억 ~ 10억", "10억 초과"]
+    import plotly.express as px
+
     bc = df["가격구간"].value_counts().reindex(order).fillna(0).reset_index()
     bc.columns = ["가격구간", "건수"]
     fig = px.bar(
@@ -1047,9 +1175,19 @@ def render_search():
 # =========================================================
 # 6) Routing
 # =========================================================
-if st.session_state.page == "lobby":
-    render_lobby()
-elif st.session_state.page == "explore":
-    render_explore()
-else:
-    render_search()
+# rerun 한 번 = 추적 하나 (?debug=1 또는 DEBUG_PANEL=1 이면 사이드바에 시간 흐름 표시)
+# PROFILE_RERUNS=sample|cprofile 또는 (PROFILE_ALLOW_QUERY=1 일 때) ?profile=... 이면 페이지별 프로파일 누적 (profiling.py)
+_trace = instrumentation.start_trace(st.session_state.page)
+try:
+    with profiling.profile_rerun(st.session_state.page, st.query_params.to_dict()):
+        if st.session_state.page == "lobby":
+            render_lobby()
+        elif st.session_state.page == "explore":
+            render_explore()
+        else:
+            render_search()
+finally:
+    instrumentation.finish_trace(_trace)
+    instrumentation.export_from_env()
+    if instrumentation.debug_enabled(st.query_params.to_dict()):
+        instrumentation.render_debug_panel(_trace)
@@ -4,6 +4,8 @@ import folium
 from streamlit_folium import st_folium
 import os
 
+from region_scoring import top_k_frame
+
 # 페이지 설정
 st.set_page_config(layout="wide", page_title="이사 지역 가이드: 맞춤형 동네 찾기")
 
@@ -99,13 +101,13 @@ with col2:
         theme = st.radio("추천 테마 선택", ["💰 저렴한 월세", "🏠 저렴한 전세", "✨ 우수한 인프라"], horizontal=True)
         
         if theme == "💰 저렴한 월세":
-            target_df = view_df[view_df['월세_평균월세액'] > 0].sort_values('월세_평균월세액').head(5)
+            target_df = top_k_frame(view_df, '월세_평균월세액', 5, largest=False, positive_only=True)
             label, col_name = "평균 월세", "월세_평균월세액"
         elif theme == "🏠 저렴한 전세":
-            target_df = view_df[view_df['전세_평균보증금'] > 0].sort_values('전세_평균보증금').head(5)
+            target_df = top_k_frame(view_df, '전세_평균보증금', 5, largest=False, positive_only=True)
             label, col_name = "평균 전세", "전세_평균보증금"
         else:
-            target_df = view_df.sort_values('custom_score', ascending=False).head(5)
+            target_df = top_k_frame(view_df, 'custom_score', 5)
             label, col_name = "인프라 점수", "custom_score"
 
         selected_top5_codes = target_df['sggCd_key'].tolist()
@@ -122,7 +124,7 @@ with col2:
     else:
         # 특정 지역 선택 시 기존의 상세 expander 출력 유지
         st.subheader(f"🏆 {selected_sido} 맞춤 추천 TOP 5")
-        top5 = view_df.sort_values('custom_score', ascending=False).head(5)
+        top5 = top_k_frame(view_df, 'custom_score', 5)
         selected_top5_codes = top5['sggCd_key'].tolist()
 
         if top5.empty:
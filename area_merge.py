@@ -6,6 +6,12 @@ import folium
 from streamlit_folium import st_folium
 import os
 
+import boundaries
+import region_features
+import region_scoring
+from region_scoring import top_k_frame
+from team_explore import build_choropleth_layer, build_point_layer, follow_map_zoom, load_boundary_set, map_view_zoom
+
 # 1. 페이지 설정
 st.set_page_config(layout="wide", page_title="부동산 가이드 v4")
 
@@ -34,39 +40,15 @@ if 'map_center' not in st.session_state: st.session_state.map_center = [36.5, 12
 if 'map_zoom' not in st.session_state: st.session_state.map_zoom = 7
 
 # --- 데이터 로드 및 전처리 ---
-@st.cache_data
+# 병합/정규화/파생 점수는 region_features 빌드 단계에서 한 번만 계산 (team_explore와 공유)
+@st.cache_resource
 def load_data():
     try:
-        main_df = pd.read_csv(get_data_path('region_rent_infra_final.csv'))
-        coord_df = pd.read_csv(get_data_path('korea_sigungu_coordinates.csv'))
+        return region_features.load_region_features().to_frame()
     except FileNotFoundError as e:
         st.error(f"필수 파일({e.filename})을 찾을 수 없습니다.")
         st.stop()
 
-    main_df['sidoNm'] = main_df['region_name'].apply(lambda x: str(x).split()[0])
-    main_df['sidoNm'] = main_df['sidoNm'].replace({'전라북도': '전북특별자치도', '강원도': '강원특별자치도'})
-    main_df['sggCd_key'] = main_df['sigungu_code'].astype(str).str.zfill(5).str[:5]
-    coord_df['sggCd_key'] = coord_df['시군구코드'].astype(str).str.zfill(5).str[:5]
-    #  위경도 좌표 병합
-    df = pd.merge(main_df, coord_df[['sggCd_key', '위도', '경도']], on='sggCd_key', how='left')
-    df['full_region'] = df['region_name']
-    df.dropna(subset=['full_region', '위도', '경도'], inplace=True)
-        # 인프라 점수 정규화 (0~1)
-    for col in INFRA_COLS:
-        if col in df.columns:
-            min_v, max_v = df[col].min(), df[col].max()
-            df[f'norm_{col}'] = (df[col] - min_v) / (max_v - min_v) if max_v != min_v else 0
-    #  테마 점수 계산 (인프라 분석용)
-    df["edu_score"] = df.get("school", 0) + df.get("academy", 0)
-    df["transport_comm_score"] = df.get("subway", 0) + df.get("department", 0)
-    df["life_medical_score"] = df.get("hospital", 0) + df.get("convenience", 0) + df.get("cafe", 0)
-        #  임대 가성비 계산 (면적당 전세가)
-    df["면적당_보증금"] = 0.0
-    mask = (df["전세_평균면적"] > 0) & (df["전세_평균보증금"] > 0)
-    df.loc[mask, "면적당_보증금"] = df.loc[mask, "전세_평균보증금"] / df.loc[mask, "전세_평균면적"]
-    
-    return df
-
 df = load_data()
 
 # ==========================================================
@@ -105,62 +87,24 @@ with st.sidebar:
     w_culture = st.slider("🎭 문화생활", 0, 10, 2)
     w_mall = st.slider("🛍️ 쇼핑", 0, 10, 1)
 
+    map_mode = "점"
+    if "sigungu" in boundaries.available_levels():
+        map_mode = st.radio("지도 표시", ["점", "경계(코로플레스)"], horizontal=True, key="map_mode")
+
 # --- 필터링 및 점수 계산 (기존과 동일하지만 score_col에 따라 메인 화면이 반응함) ---
-view_df = df.copy()
-if selected_sido != "전국":
-    view_df = view_df[view_df['sidoNm'] == selected_sido]
+view_df = df if selected_sido == "전국" else df[df['sidoNm'] == selected_sido]
 
-weights_sum = w_subway + w_school + w_hospital + w_culture + w_mall
+# 테마별 점수 계산 함수 (region_scoring: 피처 배열 × 가중치 행렬곱 한 번으로 세 테마 동시 계산)
+@st.cache_resource
+def load_scorer():
+    return region_scoring.ThemeScorer(region_features.load_region_features())
 
-# 테마별 점수 계산 함수
 def calculate_custom_scores(target_df, current_theme):
-    # 원본 데이터 보존을 위해 복사본 생성
-    res_df = target_df.copy()
-    
-    # 1. 인프라 점수 계산
-    if current_theme == "인프라":
-        if weights_sum > 0:
-            edu_norm_score = (res_df.get('norm_school', 0) + res_df.get('norm_academy', 0)) / 2
-            infra_score = (
-                (res_df.get('norm_subway', 0) * w_subway) +
-                (edu_norm_score * w_school) +
-                (res_df.get('norm_hospital', 0) * w_hospital) +
-                (res_df.get('norm_culture', 0) * w_culture) +
-                (res_df.get('norm_department', 0) * w_mall)
-            )
-            res_df['custom_score'] = (infra_score / weights_sum * 100).round(1)
-        else:
-            res_df['custom_score'] = 0.0
-            
-    # 2. 전세 가성비 점수 계산 (저렴할수록 높은 점수)
-    elif current_theme == "전세":
-        # 0보다 큰 유효 데이터만 추출
-        valid_mask = res_df['전세_평균보증금'] > 0
-        valid_df = res_df[valid_mask]
-        
-        if not valid_df.empty:
-            max_deposit = valid_df['전세_평균보증금'].max()
-            # lambda x에서 .round(1) 대신 round(x, 1) 사용
-            res_df['custom_score'] = res_df['전세_평균보증금'].apply(
-                lambda x: round((1 - (x / max_deposit)) * 100, 1) if x > 0 else -1.0
-            )
-        else:
-            res_df['custom_score'] = -1.0
-            
-    # 3. 월세 가성비 점수 계산 (저렴할수록 높은 점수)
-    else:  # 월세
-        valid_mask = res_df['월세_평균월세'] > 0
-        valid_df = res_df[valid_mask]
-        
-        if not valid_df.empty:
-            max_monthly = valid_df['월세_평균월세'].max()
-            # lambda x에서 .round(1) 대신 round(x, 1) 사용
-            res_df['custom_score'] = res_df['월세_평균월세'].apply(
-                lambda x: round((1 - (x / max_monthly)) * 100, 1) if x > 0 else -1.0
-            )
-        else:
-            res_df['custom_score'] = -1.0
-            
+    weights = {"subway": w_subway, "school": w_school, "hospital": w_hospital, "culture": w_culture, "mall": w_mall}
+    scores = load_scorer().score(weights, target_df.index.to_numpy())
+    # 얕은 복사로 점수 열만 추가 (캐시된 원본 프레임 보호)
+    res_df = target_df.copy(deep=False)
+    res_df['custom_score'] = scores[current_theme]
     return res_df
 
 # ==========================================================
@@ -183,13 +127,13 @@ with col2:
     # 마커 색상 및 정렬 기준 설정
     marker_color = "#3186cc" # 기본색
     if theme == "월세":
-        target_df = view_df[view_df['월세_평균월세'] > 0].sort_values('월세_평균월세', ascending=True).head(5)
+        target_df = top_k_frame(view_df, '월세_평균월세', 5, largest=False, positive_only=True)
         theme_title, marker_color, metric_col = "💰 월세가 저렴한 지역 TOP 5", "green", "월세_평균월세"
     elif theme == "전세":
-        target_df = view_df[view_df['전세_평균보증금'] > 0].sort_values('전세_평균보증금', ascending=True).head(5)
+        target_df = top_k_frame(view_df, '전세_평균보증금', 5, largest=False, positive_only=True)
         theme_title, marker_color, metric_col = "🏠 전세가 저렴한 지역 TOP 5", "blue", "전세_평균보증금"
     else:  # 인프라
-        target_df = view_df.sort_values('custom_score', ascending=False).head(5)
+        target_df = top_k_frame(view_df, 'custom_score', 5)
         theme_title, marker_color, metric_col = "✨ 인프라 만족도 상위 TOP 5", "crimson", "custom_score"
 
     st.write(f"#### {theme_title}")
@@ -214,6 +158,7 @@ with col2:
             if r_col2.button("🔍", key=f"btn_nav_{data['sggCd_key']}", use_container_width=True):
                 st.session_state.map_center = [data['위도'], data['경도']]
                 st.session_state.map_zoom = 13 if selected_sido != "전국" else 11
+                st.session_state.pop("map_view_zoom", None)
                 st.rerun()
 
 # --- col1: 지도 출력 ---
@@ -221,22 +166,18 @@ with col1:
     st.subheader("📍 지역별 만족도 지도")
     m = folium.Map(location=st.session_state.map_center, zoom_start=st.session_state.map_zoom)
 
-    for _, row in view_df.iterrows():
-        # 이제 view_df에는 무조건 custom_score 컬럼이 존재합니다.
-        is_highlight = row['sggCd_key'] in highlight_codes
-        popup_html = f"<b>{row['full_region']}</b><br>테마 점수: {row['custom_score']:.1f}"
-        
-        folium.CircleMarker(
-            location=[row['위도'], row['경도']],
-            radius=10 if is_highlight else 5,
-            popup=folium.Popup(popup_html, max_width=300),
-            color=marker_color if is_highlight else "#3186cc",
-            fill=True,
-            fill_opacity=0.7 if is_highlight else 0.4,
-            weight=2 if is_highlight else 1
-        ).add_to(m)
+    # 지역 전체를 GeoJson 레이어 하나로 (점 또는 경계 코로플레스)
+    bset, bucket = None, None
+    if map_mode != "점":
+        bucket = boundaries.zoom_bucket(map_view_zoom("map_view_zoom", "map_zoom"))
+        bset = load_boundary_set("sigungu", bucket)
+    if bset is not None:
+        build_choropleth_layer(bset, view_df, highlight_codes, marker_color).add_to(m)
+    else:
+        build_point_layer(view_df, highlight_codes, marker_color).add_to(m)
 
-    st_folium(m, width="100%", height=500, key="main_map")
+    out = st_folium(m, width="100%", height=500, key="main_map")
+    follow_map_zoom(out, "map_view_zoom", "map_zoom", "map_center", bucket if bset is not None else None)
 
 
 # ==========================================================
@@ -254,7 +195,7 @@ with st.expander("💡 인프라 만족도 점수는 어떻게 계산되나요?"
 st.info(f"📍 현재 사이드바 설정에 따라 **'{score_label}'** 기준으로 분석 중입니다.")
 
 # 메인 바 차트 (사이드바에서 선택한 score_col에 따라 자동 정렬)
-top20_df = view_df.sort_values(by=score_col, ascending=False).head(20)
+top20_df = top_k_frame(view_df, score_col, 20)
 fig_top20 = px.bar(
     top20_df, 
     x=score_col, 
@@ -274,20 +215,20 @@ st.write("---")
 st.subheader("분야별 상세 순위")
 col_a, col_b = st.columns(2)
 with col_a:
-    fig_edu = px.bar(view_df.sort_values("edu_score", ascending=True).tail(15), x="edu_score", y="full_region", orientation="h", title="🎓 교육 우수 Top 15")
+    fig_edu = px.bar(top_k_frame(view_df, "edu_score", 15).iloc[::-1], x="edu_score", y="full_region", orientation="h", title="🎓 교육 우수 Top 15")
     st.plotly_chart(fig_edu, use_container_width=True)
-    fig_life = px.bar(view_df.sort_values("life_medical_score", ascending=True).tail(15), x="life_medical_score", y="full_region", orientation="h", title="🏥 생활/의료 우수 Top 15")
+    fig_life = px.bar(top_k_frame(view_df, "life_medical_score", 15).iloc[::-1], x="life_medical_score", y="full_region", orientation="h", title="🏥 생활/의료 우수 Top 15")
     st.plotly_chart(fig_life, use_container_width=True)
 with col_b:
-    fig_trans = px.bar(view_df.sort_values("transport_comm_score", ascending=True).tail(15), x="transport_comm_score", y="full_region", orientation="h", title="🚇 교통/상권 우수 Top 15")
+    fig_trans = px.bar(top_k_frame(view_df, "transport_comm_score", 15).iloc[::-1], x="transport_comm_score", y="full_region", orientation="h", title="🚇 교통/상권 우수 Top 15")
     st.plotly_chart(fig_trans, use_container_width=True)
     rent_eff_df = view_df[view_df["면적당_보증금"] > 0]
-    fig_eff = px.bar(rent_eff_df.sort_values("면적당_보증금", ascending=False).tail(15), x="면적당_보증금", y="full_region", orientation="h", title="💰 전세 가성비 우수 Top 15")
+    fig_eff = px.bar(top_k_frame(rent_eff_df, "면적당_보증금", 15, largest=False).iloc[::-1], x="면적당_보증금", y="full_region", orientation="h", title="💰 전세 가성비 우수 Top 15")
     st.plotly_chart(fig_eff, use_container_width=True)
 
 st.write("---")
 st.subheader("🎯 지역별 인프라 DNA 비교")
-target_regions = st.multiselect("비교할 지역 선택 (최대 4개)", options=view_df["full_region"].unique(), default=view_df.sort_values(score_col, ascending=False)['full_region'].head(3).tolist())
+target_regions = st.multiselect("비교할 지역 선택 (최대 4개)", options=view_df["full_region"].unique(), default=top_k_frame(view_df, score_col, 3)['full_region'].tolist())
 if target_regions:
     fig_radar = go.Figure()
     for reg in target_regions[:4]:
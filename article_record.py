@@ -0,0 +1,116 @@
+"""
+수집 매물 한 건 (네이버 articleList JSON → 필요한 필드만 담은 __slots__ 객체)
+- 목록 API 매물 JSON 은 키가 40개 넘는 dict 인데, 표/저장소가 쓰는 건 RECORD_KEYS 뿐
+  → 수집 즉시 ArticleRecord 로 바꿔 나머지 키와 dict 자체의 부담을 버림 (대량 수집/저장 시 메모리 절약)
+- 매물유형/거래유형/방향/중개사(+유형 코드)처럼 값 종류가 적은 문자열은 sys.intern 으로 한 객체를 공유
+- dict 와 같은 방식(it.get("atclNo"), it["hanPrc"], {**it})으로 읽을 수 있어 저장소/표 변환 코드는 dict 와 구분 없이 사용
+"""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Mapping
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Iterator, List
+
+# utils.TABLE_COLUMNS 의 키 + listing_store 가 쓰는 코드/월세/지역코드
+RECORD_KEYS = (
+    "atclNo",
+    "atclNm",
+    "bildNm",
+    "rletTpNm",
+    "tradTpNm",
+    "hanPrc",
+    "repImgUrl",
+    "spc2",
+    "flrInfo",
+    "direction",
+    "rltrNm",
+    "directTradYn",
+    "atclCfmYmd",
+    "atclFetrDesc",
+    "lat",
+    "lng",
+    "searchRegion",
+    "tradTpCd",
+    "rletTpCd",
+    "rentPrc",
+    "cortarNo",
+)
+# 값 종류가 적어 intern 으로 공유하는 필드
+CATEGORICAL_KEYS = frozenset({"rletTpNm", "tradTpNm", "direction", "rltrNm", "directTradYn", "tradTpCd", "rletTpCd", "cortarNo"})
+_KEY_SET = frozenset(RECORD_KEYS)
+_CATEGORICAL_IDX = [i for i, k in enumerate(RECORD_KEYS) if k in CATEGORICAL_KEYS]
+
+
+class ArticleRecord(Mapping):
+    """매물 한 건. 필드는 RECORD_KEYS 와 같은 이름의 속성 (없는 값은 None)"""
+
+    __slots__ = RECORD_KEYS
+
+    def __init__(self, *values: Any):
+        _fill(self, [*values, *(None,) * (len(RECORD_KEYS) - len(values))])
+
+    @classmethod
+    def from_json(cls, item: Dict[str, Any]) -> "ArticleRecord":
+        """articleList 매물 JSON(dict) → ArticleRecord"""
+        get = item.get
+        return _fill(object.__new__(cls), [get(k) for k in RECORD_KEYS])
+
+    def replace(self, **changes: Any) -> "ArticleRecord":
+        """일부 필드만 바꾼 새 레코드 (예: searchRegion 붙이기)"""
+        values = [changes[k] if k in changes else getattr(self, k) for k in RECORD_KEYS]
+        return _fill(object.__new__(ArticleRecord), values)
+
+    # dict 처럼 읽기 ------------------------------------------------------
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in _KEY_SET:
+            return default
+        v = getattr(self, key)
+        return default if v is None else v
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _KEY_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(RECORD_KEYS)
+
+    def __len__(self) -> int:
+        return len(RECORD_KEYS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """값이 있는 필드만 dict 로"""
+        return {k: v for k in RECORD_KEYS if (v := getattr(self, k)) is not None}
+
+    def __reduce__(self):
+        return (ArticleRecord, tuple(getattr(self, k) for k in RECORD_KEYS))
+
+    def __repr__(self) -> str:
+        return f"ArticleRecord(atclNo={self.atclNo!r}, atclNm={self.atclNm!r}, tradTpNm={self.tradTpNm!r}, hanPrc={self.hanPrc!r})"
+
+
+_SLOT_SETTERS = [getattr(ArticleRecord, k).__set__ for k in RECORD_KEYS]
+
+
+def _fill(record: ArticleRecord, values: List[Any]) -> ArticleRecord:
+    """values(RECORD_KEYS 순서)를 슬롯에 채움. 범주형 문자열은 intern.
+    수집 매물마다 불리므로 setattr 대신 슬롯 디스크립터에 바로 씀 (from_json 은 __init__ 호출 비용도 생략)"""
+    for i in _CATEGORICAL_IDX:
+        if type(values[i]) is str:
+            values[i] = sys.intern(values[i])
+    for set_slot, v in zip(_SLOT_SETTERS, values):
+        set_slot(record, v)
+    return record
+
+
+def records_from_json(items: Iterable[Any]) -> List[ArticleRecord]:
+    """articleList body(dict 목록) → ArticleRecord 목록 (dict 가 아닌 항목은 버림)"""
+    return [ArticleRecord.from_json(it) for it in items if isinstance(it, dict)]
+
+
+def record_columns(records: List[ArticleRecord], keys: Iterable[str]) -> Dict[str, List[Any]]:
+    """레코드 목록 → {키: 값 목록} (열 단위로 한 번에 꺼냄, 표 변환용)"""
+    return {k: list(map(attrgetter(k), records)) for k in keys}
+
@@ -0,0 +1,211 @@
+"""
+매물 검색 처리 경로 벤치마크 (render_search 의 데이터 처리를 Streamlit 밖에서)
+- 단계: resolve(resolve_region) → scrape(scrape_articles) → to_dataframe(items_to_dataframe)
+        → parse(가격/면적/가격구간/좌표, add_derived_columns) → walking(지하철 도보 필터) → filters(조건 필터) → sort
+- 외부 API 대신 로컬 대역 서버(mock_servers.py)를 별도 프로세스로 띄워 사용 (서버 쪽 메모리/CPU 가 측정에 섞이지 않게)
+  --replay 를 주면 http_replay.py 보관 파일의 실제 응답으로 측정
+- 매물 수(50 ~ 10,000건)와 노선 역 수를 바꿔 가며 단계별 시간(중앙값)과 최대 메모리(tracemalloc, 별도 1회)를 측정
+- 결과를 기준값(benchmarks/search_pipeline_baseline.json)과 비교해 허용 범위를 넘으면 종료 코드 1
+
+사용:
+    python benchmarks/search_pipeline_bench.py                           # 측정 + 기준값과 비교
+    python benchmarks/search_pipeline_bench.py --sizes 50 500 --lines 10 # 일부 조합만
+    python benchmarks/search_pipeline_bench.py --update-baseline         # 현재 측정값을 기준값으로 저장
+    python benchmarks/search_pipeline_bench.py --replay benchmarks/fixtures/gangnam.jsonl.gz --keyword 강남구 --sizes 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import nullcontext
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "search_pipeline_baseline.json")
+STAGES = ["resolve", "scrape", "to_dataframe", "parse", "walking", "filters", "sort"]
+DEFAULT_SIZES = [50, 500, 2000, 10000]
+DEFAULT_LINES = [10, 50]
+DEFAULT_KEYWORD = "강남구"
+
+# 화면 기본값과 비슷한 조건 (전세/월세, 0~200평, 예산 5억, 도보 10분)
+FILTERS = {"trad_selected": ["전세", "월세"], "rlet_selected": [], "py_min": 0.0, "py_max": 200.0, "budget_limit": 50000}
+WALK_MINUTES = 10
+# 시간이 이보다 짧은 단계는 측정 잡음이 커서 기준값 비교에서 절대 여유를 둠
+MIN_SLACK_S = 0.005
+
+
+def start_stand_in(max_size: int, keyword: str) -> Tuple[subprocess.Popen, Dict[str, str]]:
+    """mock_servers.py 를 자식 프로세스로 실행하고, 검색 지역 매물이 max_size 건 이상이 되도록 배율 지정"""
+    from mock_servers import REGIONS, naver_region_total
+
+    cortar_no = REGIONS.find(keyword)
+    if cortar_no is None:
+        raise SystemExit(f"대역 서버 지역표에 없는 검색어: {keyword}")
+    scale = math.ceil(max_size / max(naver_region_total(cortar_no, 1.0), 1) * 100) / 100 + 0.01
+    proc = subprocess.Popen(
+        [sys.executable, "-u", os.path.join(ROOT, "mock_servers.py"), "--latency-scale", "0", "--no-rate-limit", "--listing-scale", str(scale)],
+        cwd=ROOT,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    env: Dict[str, str] = {}
+    for line in proc.stdout:
+        if line.startswith("export "):
+            for pair in line[len("export "):].split():
+                k, _, v = pair.partition("=")
+                env[k] = v
+            if "KAKAO_REST_API_KEY" in env:
+                break
+    return proc, env
+
+
+def synthetic_line(lat: float, lon: float, n_stations: int) -> Dict[str, Tuple[float, float]]:
+    """검색 지역 중심을 가로지르는 역 n개짜리 노선 (역 간격 약 1km)"""
+    half = (n_stations - 1) / 2
+    return {f"역{i + 1}": (lat + (i - half) * 0.006, lon + (i - half) * 0.008) for i in range(n_stations)}
+
+
+def run_pipeline(keyword: str, size: int, n_stations: int, measure_memory: bool = False) -> Dict[str, Dict[str, float]]:
+    """검색 한 번을 단계별로 측정 → {단계: {"time_s", "peak_kb", "rows"}}"""
+    import scraper
+    from search_pipeline import add_derived_columns, apply_filters, filter_walking, resolve_region, sort_results
+    from utils import items_to_dataframe
+
+    out: Dict[str, Dict[str, float]] = {}
+
+    def stage(name: str, fn: Callable[[], object]):
+        if measure_memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - t0
+        rec = {"time_s": elapsed, "rows": len(result) if hasattr(result, "__len__") else 1}
+        if measure_memory:
+            rec["peak_kb"] = (tracemalloc.get_traced_memory()[1] - base) / 1024
+        out[name] = rec
+        return result
+
+    cortar_no, lat, lon = stage("resolve", lambda: resolve_region(keyword))
+    items = stage("scrape", lambda: scraper.scrape_articles(cortar_no=cortar_no, lat=lat, lon=lon, limit=size))
+    df = stage("to_dataframe", lambda: items_to_dataframe(items))
+    df = stage("parse", lambda: add_derived_columns(df))
+    stations = synthetic_line(lat, lon, n_stations)
+    df = stage("walking", lambda: filter_walking(df, stations, WALK_MINUTES))
+    df = stage("filters", lambda: apply_filters(df, **FILTERS))
+    stage("sort", lambda: sort_results(df))
+    return out
+
+
+def run(keyword: str, sizes: List[int], lines: List[int], repeat: int) -> Dict[str, Dict[str, Dict[str, float]]]:
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    # 첫 호출에만 드는 비용(pandas 지연 import, 대역 서버 지역표 로드 등)은 버림
+    run_pipeline(keyword, min(sizes), min(lines))
+    for size in sizes:
+        for n_stations in lines:
+            key = f"n={size},line={n_stations}"
+            runs = [run_pipeline(keyword, size, n_stations) for _ in range(repeat)]
+            tracemalloc.start()
+            try:
+                mem = run_pipeline(keyword, size, n_stations, measure_memory=True)
+            finally:
+                tracemalloc.stop()
+            results[key] = {
+                s: {
+                    "time_s": round(statistics.median(r[s]["time_s"] for r in runs), 5),
+                    "peak_kb": round(mem[s]["peak_kb"], 1),
+                    "rows": runs[-1][s]["rows"],
+                }
+                for s in STAGES
+            }
+            total = sum(v["time_s"] for v in results[key].values())
+            print(f"{key:>18}: 합계 {total:.3f}s  " + "  ".join(f"{s} {results[key][s]['time_s'] * 1000:.1f}ms" for s in STAGES))
+    return results
+
+
+def compare(results, baseline, tolerance: float) -> List[str]:
+    """기준값 대비 (1 + tolerance)배 + 절대 여유를 넘는 단계 목록 (시간, 메모리)"""
+    problems = []
+    for key, stages in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        for s, cur in stages.items():
+            b = base.get(s)
+            if not b:
+                continue
+            if cur["time_s"] > b["time_s"] * (1 + tolerance) + MIN_SLACK_S:
+                problems.append(f"{key} {s}: {cur['time_s'] * 1000:.1f}ms > 기준 {b['time_s'] * 1000:.1f}ms (+{tolerance:.0%})")
+            if cur["peak_kb"] > b["peak_kb"] * (1 + tolerance) + 64:
+                problems.append(f"{key} {s}: 메모리 {cur['peak_kb']:.0f}KB > 기준 {b['peak_kb']:.0f}KB (+{tolerance:.0%})")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="매물 검색 처리 경로 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="매물 수")
+    parser.add_argument("--lines", type=int, nargs="+", default=DEFAULT_LINES, help="노선 역 수")
+    parser.add_argument("--keyword", default=DEFAULT_KEYWORD)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.3, help="기준값 대비 허용 증가율")
+    parser.add_argument("--replay", help="대역 서버 대신 재생할 http_replay 보관 파일")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    proc: Optional[subprocess.Popen] = None
+    if args.replay:
+        import http_replay
+
+        ctx = http_replay.replaying(args.replay, latency_scale=0)
+    else:
+        proc, env = start_stand_in(max(args.sizes), args.keyword)
+        os.environ.update(env)  # scraper 가 import 될 때 읽는 기본 주소
+        ctx = nullcontext()
+
+    try:
+        import scraper
+
+        scraper.REQUEST_DELAY = 0  # 요청 간격 대기는 측정에서 제외 (처리 비용만)
+        with ctx:
+            results = run(args.keyword, args.sizes, args.lines, args.repeat)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(BASELINE_PATH):
+            with open(BASELINE_PATH, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2)
+        print(f"✅ 기준값 저장: {BASELINE_PATH}")
+        return 0
+
+    if not os.path.exists(BASELINE_PATH):
+        print("기준값 파일이 없습니다. --update-baseline 으로 먼저 저장하세요.")
+        return 0
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        baseline = json.load(f)
+    problems = compare(results, baseline, args.tolerance)
+    for p in problems:
+        print(f"❌ {p}")
+    if not problems:
+        print("✅ 기준값 이내")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Streamlit 앱 콜드 스타트 벤치마크
+- 페이지(lobby / explore / search)마다 새 파이썬 프로세스에서
+  1) app.py 가 import 하는 모듈 로드 시간 (import 단계)
+  2) AppTest 첫 렌더 시간 (스크립트 1회 실행)
+  3) 첫 렌더 후 로드된 무거운 모듈 목록 (plotly / folium / team_explore ...)
+  를 측정한다. 새 파드에서의 첫 요청과 같은 조건을 흉내내기 위해 매 측정을 별도 프로세스로 실행.
+- 결과를 기준값(benchmarks/startup_baseline.json)과 비교해 허용 범위를 넘으면 종료 코드 1
+
+사용:
+    python benchmarks/startup_bench.py                     # 측정 + 기준값과 비교
+    python benchmarks/startup_bench.py --repeat 5          # 반복 측정 후 중앙값 사용
+    python benchmarks/startup_bench.py --update-baseline   # 현재 측정값을 기준값으로 저장
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "startup_baseline.json")
+PAGES = ["lobby", "explore", "search"]
+# 로비 페이지에서 로드되면 안 되는(페이지별로 지연 로드해야 하는) 모듈
+# (plotly 본체는 streamlit 이 테마 등록용으로 import 하므로 plotly.express 로 판별)
+HEAVY_MODULES = ["plotly.express", "folium", "streamlit_folium", "team_explore", "region_features"]
+
+# 측정용 자식 프로세스 코드: import 단계와 첫 렌더를 분리해서 잰다
+_CHILD = r"""
+import json, logging, sys, time
+logging.disable(logging.WARNING)
+t0 = time.perf_counter()
+import streamlit
+from streamlit.testing.v1 import AppTest
+t1 = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+at.session_state.page = sys.argv[2]
+at.run()
+t2 = time.perf_counter()
+heavy = [m for m in json.loads(sys.argv[3]) if m in sys.modules]
+print(json.dumps({
+    "streamlit_import_s": t1 - t0,
+    "first_render_s": t2 - t1,
+    "heavy_modules": heavy,
+    "exception": bool(at.exception),
+}))
+"""
+
+
+def measure_page(page: str) -> Dict[str, object]:
+    """새 프로세스에서 page 첫 렌더 1회 측정"""
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD, os.path.join(ROOT, "app.py"), page, json.dumps(HEAVY_MODULES)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def measure_app_import() -> float:
+    """app.py 최상단 import 구간만 (-X importtime 합계, 초). streamlit 자체는 제외"""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import streamlit; import scraper, utils, poi_engine, poi_schools"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_us = 0
+    for line in out.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package" 의 최상위 항목만 합산
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].rstrip() and not parts[2].startswith("  ") and parts[1].strip().isdigit():
+            if parts[2].strip() in ("scraper", "utils", "poi_engine", "poi_schools"):
+                total_us += int(parts[1])
+    return total_us / 1e6
+
+
+def run(repeat: int) -> Dict[str, Dict[str, object]]:
+    results: Dict[str, Dict[str, object]] = {}
+    for page in PAGES:
+        runs: List[Dict[str, object]] = [measure_page(page) for _ in range(repeat)]
+        results[page] = {
+            "first_render_s": round(statistics.median(r["first_render_s"] for r in runs), 4),
+            "heavy_modules": runs[-1]["heavy_modules"],
+            "exception": any(r["exception"] for r in runs),
+        }
+    results["_app_imports"] = {"import_s": round(statistics.median(measure_app_import() for _ in range(repeat)), 4)}
+    return results
+
+
+def compare(results: Dict[str, Dict[str, object]], baseline: Dict[str, Dict[str, object]], tolerance: float) -> List[str]:
+    """기준값 대비 (1 + tolerance)배를 넘는 항목 목록"""
+    problems = []
+    for key, cur in results.items():
+        base = baseline.get(key, {})
+        for metric in ("first_render_s", "import_s"):
+            if metric in cur and metric in base and cur[metric] > base[metric] * (1 + tolerance):
+                problems.append(f"{key}.{metric}: {cur[metric]:.3f}s > 기준 {base[metric]:.3f}s (+{tolerance:.0%})")
+        if cur.get("exception"):
+            problems.append(f"{key}: 렌더 중 예외 발생")
+    lobby_heavy = results.get("lobby", {}).get("heavy_modules") or []
+    if lobby_heavy:
+        problems.append(f"lobby: 무거운 모듈이 로드됨 {lobby_heavy}")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Streamlit 앱 콜드 스타트 벤치마크")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.3, help="기준값 대비 허용 증가율")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    for key, r in results.items():
+        print(f"{key:>14}: {json.dumps(r, ensure_ascii=False)}")
+
+    if args.update_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"✅ 기준값 저장: {BASELINE_PATH}")
+        return 0
+
+    if not os.path.exists(BASELINE_PATH):
+        print("기준값 파일이 없습니다. --update-baseline 으로 먼저 저장하세요.")
+        return 0
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        baseline = json.load(f)
+    problems = compare(results, baseline, args.tolerance)
+    for p in problems:
+        print(f"❌ {p}")
+    if not problems:
+        print("✅ 기준값 이내")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,302 @@
+"""
+지역 경계(시군구/법정동) 코로플레스용 간소화 도형 저장소
+- 원본: data/boundaries/<level>.geojson (예: SGIS / 시군구·읍면동 경계 GeoJSON, WGS84)
+- 줌 구간별 허용오차로 Douglas-Peucker 간소화 → 1e-5도 정수 양자화 + 링 단위 델타 인코딩(int32)
+  → data/boundaries/<level>_z<zoom>.npz 한 파일에 저장 (원본 대비 수십 배 작음)
+- 점수는 지역 코드로 조인해 GeoJSON FeatureCollection 하나로 만들고,
+  색상/강조 여부는 feature 속성(fill, hl)에 넣어 지도 레이어 하나가 속성 기반으로 스타일을 적용
+
+사용:
+    python boundaries.py [sigungu|dong]          # 모든 줌 구간 빌드
+    bset = load_boundaries("sigungu", zoom=7)     # 없으면 None
+    fc = choropleth_geojson(bset, codes, values, names)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+BOUNDARY_VERSION = 2
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BOUNDARY_ROOT = os.path.join(BASE_DIR, "data", "boundaries")
+SOURCE_FILES = {
+    "sigungu": os.path.join(BOUNDARY_ROOT, "sigungu.geojson"),
+    "dong": os.path.join(BOUNDARY_ROOT, "dong.geojson"),
+}
+# 원본 GeoJSON 마다 코드/이름 속성명이 달라 앞에서부터 있는 것을 사용
+CODE_KEYS = ["code", "SIG_CD", "EMD_CD", "ADM_CD", "adm_cd", "sgg", "BJCD"]
+NAME_KEYS = ["name", "SIG_KOR_NM", "EMD_KOR_NM", "ADM_NM", "adm_nm"]
+
+# 줌 구간 시작값 → Douglas-Peucker 허용오차(도). 지도 줌이 커질수록 세밀한 도형 사용
+ZOOM_TOLERANCES = {0: 0.01, 9: 0.003, 11: 0.0008, 13: 0.0002}
+QUANT = 1e-5  # 양자화 단위(도), 약 1m
+
+# 낮은 점수 → 높은 점수 색상 (YlGnBu 계열)
+PALETTE = ["#ffffcc", "#c7e9b4", "#7fcdbb", "#41b6c4", "#2c7fb8", "#253494"]
+MISSING_COLOR = "#d9d9d9"
+
+
+def zoom_bucket(zoom: float) -> int:
+    """지도 줌 → 사용할 간소화 구간 (구간 시작값 중 zoom 이하 최댓값)"""
+    return max(z for z in ZOOM_TOLERANCES if z <= max(zoom, 0))
+
+
+def simplify_ring(coords: np.ndarray, tolerance: float, hole: bool = False) -> Optional[np.ndarray]:
+    """
+    Douglas-Peucker 간소화 (스택 기반, 구간별 수직거리는 벡터 연산).
+    닫힌 링(첫 점 = 끝 점)을 유지한다. 4점 미만으로 줄어들면 구멍(hole=True)은 None(버림),
+    외곽선은 첫 점 / 가장 먼 점 / 그 선분에서 가장 먼 점으로 된 최소 삼각형 링을 돌려준다.
+    """
+    n = len(coords)
+    if n <= 4 or tolerance <= 0:
+        return coords
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j - i < 2:
+            continue
+        seg = coords[i + 1 : j]
+        a, b = coords[i], coords[j]
+        ab = b - a
+        norm = np.hypot(ab[0], ab[1])
+        if norm == 0:
+            d = np.hypot(seg[:, 0] - a[0], seg[:, 1] - a[1])
+        else:
+            d = np.abs(ab[0] * (seg[:, 1] - a[1]) - ab[1] * (seg[:, 0] - a[0])) / norm
+        k = int(np.argmax(d))
+        if d[k] > tolerance:
+            m = i + 1 + k
+            keep[m] = True
+            stack.append((i, m))
+            stack.append((m, j))
+    if keep.sum() >= 4:
+        return coords[keep]
+    if hole:
+        return None
+    return _minimal_ring(coords)
+
+
+def _minimal_ring(coords: np.ndarray) -> np.ndarray:
+    """간소화로 사라질 링을 대신할 닫힌 4점 링 (첫 점, 가장 먼 점, 다음으로 먼 점, 첫 점 — 원래 순서 유지)"""
+    a = coords[0]
+    body = coords[1:-1]
+    far = int(np.argmax(np.hypot(body[:, 0] - a[0], body[:, 1] - a[1])))
+    ab = body[far] - a
+    d = np.abs(ab[0] * (body[:, 1] - a[1]) - ab[1] * (body[:, 0] - a[0]))
+    d[far] = -1
+    nxt = int(np.argmax(d))
+    i, j = sorted((far, nxt))
+    return np.stack([a, body[i], body[j], a])
+
+
+class BoundarySet:
+    """
+    간소화된 경계 도형 묶음 (모든 feature를 MultiPolygon으로 취급).
+    - code/name: feature별 코드·이름 / code_index: 코드 → feature 번호
+    - feat_ring_off: feature별 링 범위, ring_outer: 링이 새 폴리곤의 외곽선이면 True
+    - ring_pt_off: 링별 점 범위, xy: 양자화+링 단위 델타 인코딩된 int32 (경도, 위도)
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.code = arrays["code"]
+        self.name = arrays["name"]
+        self.feat_ring_off = arrays["feat_ring_off"]
+        self.ring_outer = arrays["ring_outer"]
+        self.ring_pt_off = arrays["ring_pt_off"]
+        self.xy = arrays["xy"]
+        self.code_index: Dict[str, int] = {str(c): i for i, c in enumerate(self.code)}
+        self._code_len = max((len(str(c)) for c in self.code), default=0)
+        self._geom_cache: Dict[int, Dict[str, object]] = {}
+
+    def __len__(self) -> int:
+        return len(self.code)
+
+    def ring(self, r: int) -> List[List[float]]:
+        a, b = self.ring_pt_off[r], self.ring_pt_off[r + 1]
+        pts = np.cumsum(self.xy[a:b].astype(np.int64), axis=0) * QUANT
+        return np.round(pts, 5).tolist()
+
+    def geometry(self, i: int) -> Dict[str, object]:
+        """feature i 의 GeoJSON MultiPolygon (한 번 디코딩한 도형은 재사용하므로 변경하지 말 것)"""
+        if i in self._geom_cache:
+            return self._geom_cache[i]
+        polys: List[List[List[List[float]]]] = []
+        for r in range(self.feat_ring_off[i], self.feat_ring_off[i + 1]):
+            if self.ring_outer[r] or not polys:
+                polys.append([])
+            polys[-1].append(self.ring(r))
+        geom = {"type": "MultiPolygon", "coordinates": polys}
+        self._geom_cache[i] = geom
+        return geom
+
+    def match(self, codes: Sequence[str]) -> np.ndarray:
+        """지역 코드 배열 → feature 번호 (없으면 -1). 법정동 10자리 ↔ 경계 8자리처럼 앞자리 일치도 허용"""
+        out = np.full(len(codes), -1, dtype=np.intp)
+        for k, c in enumerate(codes):
+            c = str(c)
+            pos = self.code_index.get(c)
+            if pos is None and len(c) > self._code_len:
+                pos = self.code_index.get(c[: self._code_len])
+            if pos is not None:
+                out[k] = pos
+        return out
+
+
+def _read_features(path: str) -> List[Dict[str, object]]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f).get("features", [])
+
+
+def _first_prop(props: Dict[str, object], keys: Sequence[str]) -> str:
+    for k in keys:
+        if props.get(k) not in (None, ""):
+            return str(props[k])
+    return ""
+
+
+def _polygons(geom: Dict[str, object]) -> List[List[List[List[float]]]]:
+    if geom.get("type") == "Polygon":
+        return [geom["coordinates"]]
+    if geom.get("type") == "MultiPolygon":
+        return list(geom["coordinates"])
+    return []
+
+
+def _pack(features: List[Dict[str, object]], tolerance: float) -> Dict[str, np.ndarray]:
+    codes, names, feat_ring_off, ring_outer, ring_pt_off, chunks = [], [], [0], [], [0], []
+    for feat in features:
+        props = feat.get("properties") or {}
+        code = _first_prop(props, CODE_KEYS)
+        polys = _polygons(feat.get("geometry") or {})
+        if not code or not polys:
+            continue
+        for poly in polys:
+            for r, ring in enumerate(poly):
+                pts = simplify_ring(np.asarray(ring, dtype=np.float64)[:, :2], tolerance, hole=r > 0)
+                if pts is None:
+                    continue
+                q = np.round(pts / QUANT).astype(np.int64)
+                # 링 첫 점은 절댓값, 이후는 직전 점과의 차이
+                q[1:] = np.diff(q, axis=0)
+                chunks.append(q.astype(np.int32))
+                ring_outer.append(r == 0)
+                ring_pt_off.append(ring_pt_off[-1] + len(q))
+        codes.append(code)
+        names.append(_first_prop(props, NAME_KEYS))
+        feat_ring_off.append(len(ring_outer))
+
+    return {
+        "code": np.array(codes, dtype=str),
+        "name": np.array(names, dtype=str),
+        "feat_ring_off": np.array(feat_ring_off, dtype=np.int32),
+        "ring_outer": np.array(ring_outer, dtype=bool),
+        "ring_pt_off": np.array(ring_pt_off, dtype=np.int64),
+        "xy": np.concatenate(chunks) if chunks else np.empty((0, 2), dtype=np.int32),
+    }
+
+
+def _packed_path(level: str, bucket: int) -> str:
+    return os.path.join(BOUNDARY_ROOT, f"{level}_z{bucket}.npz")
+
+
+def _source_signature(level: str) -> np.ndarray:
+    st = os.stat(SOURCE_FILES[level])
+    return np.array([BOUNDARY_VERSION, st.st_size, st.st_mtime], dtype=np.float64)
+
+
+def build_boundaries(level: str = "sigungu") -> List[str]:
+    """원본 GeoJSON → 줌 구간별 간소화 npz 생성"""
+    src = SOURCE_FILES[level]
+    features = _read_features(src)
+    signature = _source_signature(level)
+    paths = []
+    for bucket, tol in sorted(ZOOM_TOLERANCES.items()):
+        arrays = _pack(features, tol)
+        path = _packed_path(level, bucket)
+        tmp = f"{path}.tmp-{os.getpid()}.npz"
+        np.savez_compressed(tmp, signature=signature, **arrays)
+        os.replace(tmp, path)
+        paths.append(path)
+        print(f"✅ 경계 간소화 ({level}, z{bucket}, tol={tol}): {len(arrays['code'])}개 지역, {len(arrays['xy']):,}점 → {path}")
+    return paths
+
+
+def available_levels() -> List[str]:
+    return [lv for lv in SOURCE_FILES if os.path.exists(SOURCE_FILES[lv]) or os.path.exists(_packed_path(lv, 0))]
+
+
+def load_boundaries(level: str = "sigungu", zoom: float = 7) -> Optional[BoundarySet]:
+    """줌에 맞는 간소화 경계 로드 (원본이 바뀌었으면 다시 빌드). 원본도 npz도 없으면 None"""
+    path = _packed_path(level, zoom_bucket(zoom))
+    has_source = os.path.exists(SOURCE_FILES[level])
+    if os.path.exists(path):
+        with np.load(path) as z:
+            arrays = {k: z[k] for k in z.files}
+        if not has_source or np.array_equal(arrays.pop("signature"), _source_signature(level)):
+            return BoundarySet(arrays)
+    if not has_source:
+        return None
+    build_boundaries(level)
+    with np.load(path) as z:
+        return BoundarySet({k: z[k] for k in z.files if k != "signature"})
+
+
+def value_colors(values: Sequence[float], missing: Optional[np.ndarray] = None) -> List[str]:
+    """점수 배열 → PALETTE 색상 (최솟값~최댓값 선형 구간). missing/NaN 은 MISSING_COLOR"""
+    v = np.asarray(values, dtype=np.float64)
+    bad = np.isnan(v) if missing is None else (np.asarray(missing, dtype=bool) | np.isnan(v))
+    out = np.full(len(v), MISSING_COLOR, dtype=object)
+    if (~bad).any():
+        lo, hi = np.nanmin(v[~bad]), np.nanmax(v[~bad])
+        t = (v[~bad] - lo) / (hi - lo) if hi > lo else np.full((~bad).sum(), 0.5)
+        idx = np.minimum((t * len(PALETTE)).astype(int), len(PALETTE) - 1)
+        out[~bad] = np.array(PALETTE, dtype=object)[idx]
+    return out.tolist()
+
+
+def choropleth_geojson(
+    bset: BoundarySet,
+    codes: Sequence[str],
+    values: Sequence[float],
+    names: Sequence[str],
+    highlight: Optional[set] = None,
+    missing: Optional[np.ndarray] = None,
+) -> Dict[str, object]:
+    """
+    지역 코드로 점수를 경계 도형에 조인한 FeatureCollection.
+    속성: code, name, score, fill(색상), hl(강조 여부) → 레이어 style_function 이 속성만 읽어 스타일 적용
+    """
+    highlight = highlight or set()
+    pos = bset.match(codes)
+    colors = value_colors(values, missing)
+    values = np.round(np.asarray(values, dtype=np.float64), 1)
+    features = []
+    for k in np.flatnonzero(pos >= 0):
+        code = str(codes[k])
+        features.append(
+            {
+                "type": "Feature",
+                "geometry": bset.geometry(int(pos[k])),
+                "properties": {
+                    "code": code,
+                    "name": str(names[k]),
+                    "score": float(values[k]),
+                    "fill": colors[k],
+                    "hl": code in highlight,
+                },
+            }
+        )
+    return {"type": "FeatureCollection", "features": features}
+
+
+if __name__ == "__main__":
+    import sys
+
+    build_boundaries(sys.argv[1] if len(sys.argv) > 1 else "sigungu")
@@ -1,9 +1,16 @@
+import argparse
+import os
 import pandas as pd
 from concurrent.futures import ThreadPoolExecutor
 from public_api import get_all_dongs
+from resilience import UpstreamError
 from scoring import calculate_score
 import tqdm # 진행 상황 확인용 (pip install tqdm 필요)
 
+DONG_COORDS_PATH = "data/korea_dong_coordinates.csv"
+DONG_INFRA_PATH = "data/전국_법정동_인프라_점수.csv"
+DONG_RADIUS_M = 1000 # 법정동 중심좌표 기준 인프라 집계 반경
+
 def process_region(row):
     try:
         region_name = row["region_name"]
@@ -17,8 +24,84 @@ def process_region(row):
         print(f"Error processing {row.get('region_name')}: {e}")
         return None
 
+def build_dong_coordinates(dong_df, output_path=DONG_COORDS_PATH):
+    """
+    법정동 중심좌표 CSV(법정동코드, 위도, 경도) 생성
+    - 카카오 주소 검색 API 사용, 이미 저장된 코드는 건너뛰므로 중단 후 이어서 실행 가능
+    """
+    from kakao_api import get_kakao_coordinates
+
+    def lookup(r):
+        # 호출 실패는 저장하지 않고 건너뜀 → 다음 실행 때 다시 조회
+        try:
+            return get_kakao_coordinates(r["region_name"])
+        except UpstreamError:
+            failed.append(r["dong_code"])
+            return None
+
+    done = pd.DataFrame(columns=["법정동코드", "위도", "경도"])
+    if os.path.exists(output_path):
+        done = pd.read_csv(output_path, encoding="utf-8-sig", dtype={"법정동코드": str})
+    todo = dong_df[~dong_df["dong_code"].isin(done["법정동코드"])]
+    print(f"📍 법정동 좌표 조회: {len(todo)}건 (기존 {len(done)}건)")
+
+    rows = []
+    failed = []
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        records = todo.to_dict("records")
+        coords = executor.map(lookup, records)
+        for row, latlon in tqdm.tqdm(zip(records, coords), total=len(records)):
+            if latlon:
+                rows.append({"법정동코드": row["dong_code"], "위도": latlon[0], "경도": latlon[1]})
+
+    out = pd.concat([done, pd.DataFrame(rows, columns=done.columns)], ignore_index=True)
+    out.to_csv(output_path, index=False, encoding="utf-8-sig")
+    if failed:
+        print(f"⚠️ 좌표 조회 실패 {len(failed)}건 (다시 실행하면 이어서 조회)")
+    return out
+
+def build_dong_infra(radius_m=DONG_RADIUS_M, output_path=DONG_INFRA_PATH):
+    """
+    법정동(동/리) 단위 인프라 개수
+    - 지역당 API 호출(카테고리 x 지역 수) 대신 POI 저장소(poi_engine) 한 번으로
+      모든 법정동 중심좌표의 반경 내 개수를 벡터 연산으로 집계
+    """
+    from poi_engine import load_poi_store
+    from region_pipeline import load_dong_codes
+
+    dong_df = load_dong_codes().drop_duplicates("dong_code")
+    if os.path.exists(DONG_COORDS_PATH):
+        coords = pd.read_csv(DONG_COORDS_PATH, encoding="utf-8-sig", dtype={"법정동코드": str})
+    else:
+        coords = build_dong_coordinates(dong_df)
+    df = dong_df.merge(coords, left_on="dong_code", right_on="법정동코드", how="inner")
+
+    store = load_poi_store()
+    print(f"🚀 총 {len(df)}개 법정동 인프라 집계 (POI {len(store)}개, 반경 {radius_m}m)...")
+    counts = store.count_within_frame(df["위도"].to_numpy(), df["경도"].to_numpy(), radius_m)
+
+    final_df = pd.DataFrame({
+        "dong_code": df["dong_code"].to_numpy(),
+        "region_name": df["region_name"].to_numpy(),
+        "sigungu_code": df["sgg_key"].to_numpy(),
+        "위도": df["위도"].to_numpy(),
+        "경도": df["경도"].to_numpy(),
+    })
+    score_cols = ["school", "subway", "hospital", "cafe", "academy", "department", "convenience", "culture"]
+    for col in score_cols:
+        final_df[col] = counts[col].to_numpy() if col in counts.columns else 0
+    final_df["total_score"] = final_df[score_cols].sum(axis=1)
+
+    final_df.to_csv(output_path, index=False, encoding="utf-8-sig")
+    print(f"✅ 분석 완료! 저장된 행 개수: {len(final_df)}")
+    return final_df
+
 def main():
-    df_regions = get_all_dongs()
+    try:
+        df_regions = get_all_dongs()
+    except UpstreamError as e:
+        print(f"❌ 지역 목록 수집 실패: {e}")
+        return
     
     if df_regions.empty:
         print("❌ 불러온 지역 데이터가 없습니다. 프로그램을 종료합니다.")
@@ -40,4 +123,12 @@ def main():
     print(f"✅ 분석 완료! 저장된 행 개수: {len(final_df)}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="지역 인프라 점수 데이터셋 생성")
+    parser.add_argument("--level", choices=["sigungu", "dong"], default="sigungu")
+    parser.add_argument("--radius", type=int, default=DONG_RADIUS_M, help="법정동 단위 집계 반경(m)")
+    args = parser.parse_args()
+
+    if args.level == "dong":
+        build_dong_infra(args.radius)
+    else:
+        main()
@@ -0,0 +1,84 @@
+"""
+지역 중심좌표 최근접 이웃 인덱스 (대원거리 기준)
+- scikit-learn 이 설치되어 있으면 BallTree(metric="haversine", 라디안 좌표) 사용
+- 없으면 위도 정렬 + 이진 탐색 대역(band) 검색으로 대체 (O(log n) + 대역 내 후보)
+- nearest: 지도 클릭 좌표 → 가장 가까운 지역 / within_km: 반경 X km 내 지역 목록
+
+거리 단위는 utils.haversine_distance 와 같은 km 입니다.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from utils import haversine_distance_array
+
+# 런타임 환경에 따라 라이브러리가 없을 경우를 대비한 예외 처리 (선택 의존성)
+try:
+    from sklearn.neighbors import BallTree
+except ImportError:
+    BallTree = None
+
+EARTH_RADIUS_KM = 6371.0
+_KM_PER_DEG_LAT = 111.195  # 2πR / 360
+
+
+class GeoIndex:
+    """위경도 배열에 대한 대원거리 최근접/반경 검색 인덱스 (반환 인덱스는 입력 배열 위치)"""
+
+    def __init__(self, lat: Sequence[float], lon: Sequence[float]):
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self._tree = None
+        if BallTree is not None and len(self.lat):
+            self._tree = BallTree(np.radians(np.column_stack([self.lat, self.lon])), metric="haversine")
+        # 대체 경로: 위도 오름차순 정렬 순서
+        self._order = np.argsort(self.lat, kind="stable")
+        self._sorted_lat = self.lat[self._order]
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    def _band(self, lat: float, lon: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """위도 대역 [lat ± r] 안 후보를 이진 탐색으로 고르고 실제 거리 계산 (반환: 위치, km)"""
+        d_lat = radius_km / _KM_PER_DEG_LAT
+        i0 = np.searchsorted(self._sorted_lat, lat - d_lat, side="left")
+        i1 = np.searchsorted(self._sorted_lat, lat + d_lat, side="right")
+        cand = self._order[i0:i1]
+        d = haversine_distance_array(lat, lon, self.lat[cand], self.lon[cand])
+        keep = d <= radius_km
+        return cand[keep], d[keep]
+
+    def nearest(self, lat: float, lon: float) -> Tuple[int, float]:
+        """가장 가까운 지점의 (위치, 거리 km). 인덱스가 비어 있으면 (-1, inf)"""
+        if len(self) == 0:
+            return -1, float("inf")
+        if self._tree is not None:
+            dist, ind = self._tree.query(np.radians([[lat, lon]]), k=1)
+            return int(ind[0, 0]), float(dist[0, 0] * EARTH_RADIUS_KM)
+
+        # 반경을 4배씩 넓혀 가며 대역 검색. 반경 r 안에서 찾은 최솟값은 전역 최솟값과 같다.
+        radius = 2.0
+        while True:
+            idx, d = self._band(lat, lon, radius)
+            if len(idx):
+                j = int(np.argmin(d))
+                return int(idx[j]), float(d[j])
+            if radius > 2 * np.pi * EARTH_RADIUS_KM:
+                return -1, float("inf")
+            radius *= 4
+
+    def within_km(self, lat: float, lon: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """반경 radius_km 안 지점들의 (위치 배열, 거리 km 배열), 가까운 순"""
+        if len(self) == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        if self._tree is not None:
+            ind, dist = self._tree.query_radius(
+                np.radians([[lat, lon]]), r=radius_km / EARTH_RADIUS_KM, return_distance=True, sort_results=True
+            )
+            return ind[0].astype(np.intp), dist[0] * EARTH_RADIUS_KM
+        idx, d = self._band(lat, lon, radius_km)
+        order = np.lexsort((idx, d))
+        return idx[order], d[order]
@@ -0,0 +1,297 @@
+"""
+외부 HTTP 호출 녹화/재생 (requests 전송 계층)
+- 녹화: 실제(또는 mock_servers.py) 응답을 요청별로 받아 gzip JSONL 보관 파일에 저장
+  (clusterList / articleList / galleryImages / 카카오 / Overpass / 공공데이터 등 requests 로 나가는 모든 호출)
+- 재생: 같은 요청에 녹화된 응답을 네트워크 없이 돌려줌. 응답 지연은 녹화 값 그대로, 배율 조정, 또는 없음
+  → 파싱·DataFrame 변환·점수 계산의 성능 회귀를 실제 응답 크기/형태로 반복 측정
+- requests.adapters.HTTPAdapter.send 를 바꿔 끼우므로 requests.get/post, Session, 리다이렉트 모두 대상
+- 같은 요청이 여러 번 녹화돼 있으면 녹화 순서대로 돌려주고, 마지막 응답은 이후에도 반복
+
+보관 파일 한 줄 = 요청 하나:
+    {"method", "url", "body_sha1", "status", "reason", "headers", "content"(텍스트) 또는 "content_b64", "elapsed_s"}
+
+사용:
+    with recording("benchmarks/fixtures/gangnam.jsonl.gz"):
+        scraper.scrape_articles(...)
+    with replaying("benchmarks/fixtures/gangnam.jsonl.gz", latency_scale=0):
+        scraper.scrape_articles(...)
+
+    HTTP_REPLAY=record:benchmarks/fixtures/app.jsonl.gz streamlit run app.py   # 앱 전체 녹화
+    HTTP_REPLAY=replay:benchmarks/fixtures/app.jsonl.gz streamlit run app.py   # 앱 전체 재생
+
+    python http_replay.py info benchmarks/fixtures/gangnam.jsonl.gz
+    python http_replay.py record out.jsonl.gz build_infra_dataset.py --level dong   # 스크립트 실행을 녹화
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import gzip
+import hashlib
+import json
+import os
+import runpy
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# 재생 시 그대로 돌려주면 안 되는 응답 헤더 (본문은 이미 압축 해제된 상태로 저장)
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "set-cookie", "connection", "keep-alive"}
+
+_original_send = HTTPAdapter.send
+_install_lock = threading.Lock()
+_active: Optional["_Transport"] = None
+
+
+class ReplayMiss(requests.ConnectionError):
+    """재생 중 녹화되지 않은 요청 (네트워크 오류처럼 처리되도록 ConnectionError 하위 클래스)"""
+
+
+def request_key(method: str, url: str, body_sha1: str = "") -> str:
+    """
+    요청 식별 키: 메서드 + 경로 + 정렬한 쿼리 파라미터 + 본문 해시.
+    호스트는 넣지 않음 — 업스트림마다 경로가 달라 겹치지 않고, 대역 서버 포트나 기본 주소 환경변수가 바뀌어도 같은 보관 파일로 재생
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{method.upper()} {urlunsplit(('', '', parts.path, query, ''))} {body_sha1}"
+
+
+def _body_sha1(body: Any) -> str:
+    if not body:
+        return ""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if not isinstance(body, (bytes, bytearray)):
+        return ""  # 스트리밍 본문은 키에 넣지 않음
+    return hashlib.sha1(body).hexdigest()[:16]
+
+
+# =========================================================
+# 보관 파일
+# =========================================================
+def load_archive(path: str) -> List[Dict[str, Any]]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def save_archive(path: str, entries: List[Dict[str, Any]]) -> None:
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=9) as f:
+        for e in entries:
+            f.write(json.dumps(e, ensure_ascii=False, separators=(",", ":")) + "\n")
+    os.replace(tmp, path)
+
+
+def _entry_content(e: Dict[str, Any]) -> bytes:
+    if "content_b64" in e:
+        return base64.b64decode(e["content_b64"])
+    return e.get("content", "").encode("utf-8")
+
+
+# =========================================================
+# 전송 계층 교체
+# =========================================================
+class _Transport:
+    def send(self, adapter: HTTPAdapter, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        raise NotImplementedError
+
+
+class _Recorder(_Transport):
+    def __init__(self, path: str, append: bool = False):
+        self.path = path
+        self.entries: List[Dict[str, Any]] = load_archive(path) if append and os.path.exists(path) else []
+        self.lock = threading.Lock()
+
+    def send(self, adapter, request, **kwargs):
+        t0 = time.perf_counter()
+        resp = _original_send(adapter, request, **kwargs)
+        content = resp.content  # 스트리밍 응답도 여기서 전부 읽어 둠
+        elapsed = time.perf_counter() - t0
+        e: Dict[str, Any] = {
+            "method": request.method,
+            "url": request.url,
+            "body_sha1": _body_sha1(request.body),
+            "status": resp.status_code,
+            "reason": resp.reason,
+            "headers": {k: v for k, v in resp.headers.items() if k.lower() not in _DROP_HEADERS},
+            "elapsed_s": round(elapsed, 6),
+        }
+        try:
+            e["content"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            e["content_b64"] = base64.b64encode(content).decode("ascii")
+        with self.lock:
+            self.entries.append(e)
+        return resp
+
+    def save(self) -> None:
+        with self.lock:
+            save_archive(self.path, self.entries)
+
+
+class _Replayer(_Transport):
+    def __init__(self, path: str, latency_scale: float = 1.0, strict: bool = True):
+        self.path = path
+        self.latency_scale = latency_scale
+        self.strict = strict
+        self.by_key: Dict[str, List[Dict[str, Any]]] = {}
+        for e in load_archive(path):
+            self.by_key.setdefault(request_key(e["method"], e["url"], e.get("body_sha1", "")), []).append(e)
+        self.cursor: Dict[str, int] = {}
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def send(self, adapter, request, **kwargs):
+        key = request_key(request.method, request.url, _body_sha1(request.body))
+        with self.lock:
+            seq = self.by_key.get(key)
+            if seq:
+                i = self.cursor.get(key, 0)
+                self.cursor[key] = i + 1
+                e = seq[min(i, len(seq) - 1)]
+                self.stats["hits"] += 1
+            else:
+                e = None
+                self.stats["misses"] += 1
+        if e is None:
+            if self.strict:
+                raise ReplayMiss(f"녹화되지 않은 요청: {request.method} {request.url}", request=request)
+            return _original_send(adapter, request, **kwargs)
+
+        if self.latency_scale > 0 and e.get("elapsed_s"):
+            time.sleep(e["elapsed_s"] * self.latency_scale)
+
+        resp = requests.Response()
+        resp.status_code = e["status"]
+        resp.reason = e.get("reason", "")
+        resp.headers = CaseInsensitiveDict(e.get("headers", {}))
+        resp._content = _entry_content(e)
+        resp._content_consumed = True
+        resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+        resp.url = request.url
+        resp.request = request
+        resp.connection = adapter
+        resp.elapsed = timedelta(seconds=e.get("elapsed_s", 0.0))
+        return resp
+
+
+def _patched_send(adapter, request, **kwargs):
+    transport = _active
+    if transport is None:
+        return _original_send(adapter, request, **kwargs)
+    return transport.send(adapter, request, **kwargs)
+
+
+def _install(transport: Optional[_Transport]) -> None:
+    global _active
+    with _install_lock:
+        _active = transport
+        HTTPAdapter.send = _patched_send if transport is not None else _original_send
+
+
+@contextmanager
+def recording(path: str, append: bool = False) -> Iterator[_Recorder]:
+    """블록 안의 모든 requests 호출을 녹화해 path 에 저장 (append=True 면 기존 파일에 이어서)"""
+    rec = _Recorder(path, append=append)
+    _install(rec)
+    try:
+        yield rec
+    finally:
+        _install(None)
+        rec.save()
+
+
+@contextmanager
+def replaying(path: str, latency_scale: float = 1.0, strict: bool = True) -> Iterator[_Replayer]:
+    """
+    블록 안의 requests 호출을 path 의 녹화 응답으로 대체.
+    latency_scale: 녹화 지연 배율 (0 이면 대기 없음), strict=False 면 녹화에 없는 요청은 실제로 전송
+    """
+    rep = _Replayer(path, latency_scale=latency_scale, strict=strict)
+    _install(rep)
+    try:
+        yield rep
+    finally:
+        _install(None)
+
+
+def install_from_env(var: str = "HTTP_REPLAY") -> Optional[_Transport]:
+    """
+    환경변수 HTTP_REPLAY="record:<파일>" / "replay:<파일>[:지연배율]" 이면 프로세스 전체에 적용.
+    녹화는 프로세스 종료 시 저장. 설정이 없으면 아무것도 하지 않음
+    """
+    spec = os.getenv(var, "").strip()
+    if not spec or _active is not None:
+        return _active
+    mode, _, rest = spec.partition(":")
+    if mode == "record":
+        import atexit
+
+        rec = _Recorder(rest, append=True)
+        _install(rec)
+        atexit.register(rec.save)
+        return rec
+    if mode == "replay":
+        path, _, scale = rest.partition(":")
+        rep = _Replayer(path, latency_scale=float(scale) if scale else 1.0)
+        _install(rep)
+        return rep
+    raise ValueError(f"{var} 형식 오류: {spec!r} (record:<파일> 또는 replay:<파일>[:지연배율])")
+
+
+# =========================================================
+# CLI
+# =========================================================
+def _info(path: str) -> None:
+    entries = load_archive(path)
+    by_host: Dict[str, List[Dict[str, Any]]] = {}
+    for e in entries:
+        by_host.setdefault(urlsplit(e["url"]).netloc, []).append(e)
+    print(f"{path}: 요청 {len(entries)}건, 파일 {os.path.getsize(path) / 1024:.1f} KB")
+    for host, es in sorted(by_host.items()):
+        lat = sorted(e.get("elapsed_s", 0) for e in es)
+        size = sum(len(_entry_content(e)) for e in es)
+        print(
+            f"  {host}: {len(es)}건, 본문 {size / 1024:.1f} KB, "
+            f"지연 p50 {lat[len(lat) // 2] * 1000:.0f}ms / p95 {lat[int(len(lat) * 0.95)] * 1000:.0f}ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="외부 HTTP 호출 녹화/재생")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_info = sub.add_parser("info", help="보관 파일 요약")
+    p_info.add_argument("archive")
+    for name in ("record", "replay"):
+        p = sub.add_parser(name, help=f"파이썬 스크립트를 {name} 모드로 실행")
+        p.add_argument("archive")
+        p.add_argument("script")
+        p.add_argument("args", nargs=argparse.REMAINDER)
+        if name == "replay":
+            p.add_argument("--latency-scale", type=float, default=1.0)
+    args = parser.parse_args()
+
+    if args.cmd == "info":
+        _info(args.archive)
+        return
+    sys.argv = [args.script] + args.args
+    sys.path.insert(0, os.path.dirname(os.path.abspath(args.script)))
+    ctx = recording(args.archive, append=True) if args.cmd == "record" else replaying(args.archive, args.latency_scale)
+    with ctx:
+        runpy.run_path(args.script, run_name="__main__")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,457 @@
+"""
+경량 계측 (시간 / 카운터 / 히스토그램 + 화면 한 번(rerun)의 시간 흐름)
+- timer(stage) 컨텍스트 매니저 / timed(stage) 데코레이터: 단계 소요 시간을 히스토그램(stage_seconds)에 기록하고,
+  진행 중인 추적(trace)이 있으면 구간(span)으로도 남김 → 디버그 패널의 시간 흐름(waterfall)
+- count(metric) / observe(metric, 값): 카운터, 히스토그램 (라벨은 키워드 인자)
+- install_http_metrics(): requests 의 모든 외부 호출(Session.send)을 호스트/경로별로 횟수·시간·오류 집계
+  (http_replay.py 는 그 아래 전송 계층(HTTPAdapter.send)을 바꾸므로 함께 써도 서로 덮어쓰지 않음)
+- cached(name, st.cache_data(...)): Streamlit 캐시 함수의 호출 수/실제 계산(miss) 수 집계
+- 내보내기: render_prometheus() (Prometheus 텍스트), snapshot() (JSON),
+  환경변수 METRICS_PORT 면 /metrics, /metrics.json HTTP 엔드포인트, METRICS_FILE 이면 rerun 마다 파일로 저장
+
+표준 라이브러리만 사용하며, 계측 자체 비용은 호출당 수 마이크로초 수준.
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextvars
+import functools
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# 히스토그램 구간 경계 (초)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, n_buckets: int):
+        self.counts = [0] * (n_buckets + 1)  # 마지막 칸 = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+
+class Registry:
+    """프로세스 공용 지표 저장소 (스레드 안전)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.counters: Dict[str, Dict[LabelKey, float]] = {}
+        self.histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+
+    def inc(self, metric: str, value: float = 1.0, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self.counters.setdefault(metric, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, metric: str, value: float, **labels) -> None:
+        key = _label_key(labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self.histograms.setdefault(metric, {})
+            h = series.get(key)
+            if h is None:
+                h = series[key] = _Histogram(len(self.buckets))
+            h.counts[i] += 1
+            h.sum += value
+            h.count += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """{"counters": {지표: [{labels, value}]}, "histograms": {지표: [{labels, count, sum, buckets}]}}"""
+        with self._lock:
+            counters = {
+                m: [{"labels": dict(k), "value": v} for k, v in sorted(series.items())]
+                for m, series in sorted(self.counters.items())
+            }
+            histograms = {
+                m: [
+                    {
+                        "labels": dict(k),
+                        "count": h.count,
+                        "sum": round(h.sum, 6),
+                        "buckets": dict(zip([str(b) for b in self.buckets] + ["+Inf"], h.counts)),
+                    }
+                    for k, h in sorted(series.items())
+                ]
+                for m, series in sorted(self.histograms.items())
+            }
+        return {"counters": counters, "histograms": histograms}
+
+    def render_prometheus(self, prefix: str = "realestate_") -> str:
+        """Prometheus 텍스트 형식 (카운터는 _total, 히스토그램은 누적 _bucket/_sum/_count)"""
+
+        def fmt(labels: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            body = ",".join(f'{k}="{v.replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for k, v in pairs)
+            return "{" + body + "}"
+
+        lines: List[str] = []
+        with self._lock:
+            for m, series in sorted(self.counters.items()):
+                name = prefix + (m if m.endswith("_total") else f"{m}_total")
+                lines.append(f"# TYPE {name} counter")
+                lines.extend(f"{name}{fmt(k)} {v:g}" for k, v in sorted(series.items()))
+            for m, series in sorted(self.histograms.items()):
+                name = prefix + m
+                lines.append(f"# TYPE {name} histogram")
+                for k, h in sorted(series.items()):
+                    acc = 0
+                    for b, c in zip(list(self.buckets) + [float("inf")], h.counts):
+                        acc += c
+                        le = "+Inf" if b == float("inf") else f"{b:g}"
+                        lines.append(f"{name}_bucket{fmt(k, (('le', le),))} {acc}")
+                    lines.append(f"{name}_sum{fmt(k)} {h.sum:.6f}")
+                    lines.append(f"{name}_count{fmt(k)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def count(metric: str, value: float = 1.0, **labels) -> None:
+    REGISTRY.inc(metric, value, **labels)
+
+
+def observe(metric: str, value: float, **labels) -> None:
+    REGISTRY.observe(metric, value, **labels)
+
+
+def record_error(where: str, exc: BaseException) -> None:
+    """삼킨 예외도 errors{where, kind} 로 남김 (except: pass 대신)"""
+    REGISTRY.inc("errors", 1.0, where=where, kind=type(exc).__name__)
+
+
+def snapshot() -> Dict[str, Any]:
+    return REGISTRY.snapshot()
+
+
+def render_prometheus() -> str:
+    return REGISTRY.render_prometheus()
+
+
+# =========================================================
+# 추적 (rerun 한 번의 구간 목록)
+# =========================================================
+class Trace:
+    """추적 하나: 시작 시각 기준 구간 목록 [(이름, 시작 오프셋 s, 소요 s, 깊이, 스레드)]"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        self.wall_started = time.time()
+        self.duration: Optional[float] = None
+        self.spans: List[Tuple[str, float, float, int, str]] = []
+        self._lock = threading.Lock()
+
+    def add(self, name: str, t0: float, elapsed: float, depth: int) -> None:
+        with self._lock:
+            self.spans.append((name, t0 - self.started, elapsed, depth, threading.current_thread().name))
+
+    def finish(self) -> "Trace":
+        self.duration = time.perf_counter() - self.started
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "started": self.wall_started,
+            "duration_s": self.duration,
+            "spans": [
+                {"name": n, "start_s": round(s, 6), "duration_s": round(d, 6), "depth": dep, "thread": th}
+                for n, s, d, dep, th in sorted(self.spans, key=lambda x: x[1])
+            ],
+        }
+
+
+_current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("instrumentation_trace", default=None)
+_depth: contextvars.ContextVar[int] = contextvars.ContextVar("instrumentation_depth", default=0)
+
+
+def start_trace(name: str) -> Trace:
+    """현재 실행 흐름(스레드/컨텍스트)에 새 추적 시작. 이후 timer/HTTP 호출이 구간으로 기록됨"""
+    trace = Trace(name)
+    _current_trace.set(trace)
+    _depth.set(0)
+    return trace
+
+
+def finish_trace(trace: Trace, metric: str = "rerun_seconds") -> Trace:
+    """추적 종료: 전체 소요를 metric 히스토그램(page 라벨)에 기록하고 현재 추적 해제"""
+    trace.finish()
+    observe(metric, trace.duration, page=trace.name)
+    if _current_trace.get() is trace:
+        _current_trace.set(None)
+    return trace
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """지표 없이 추적 구간만 남김"""
+    trace = _current_trace.get()
+    depth = _depth.get()
+    token = _depth.set(depth + 1)
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        _depth.reset(token)
+        if trace is not None:
+            trace.add(name, t0, time.perf_counter() - t0, depth)
+
+
+@contextmanager
+def timer(stage: str, metric: str = "stage_seconds", **labels) -> Iterator[None]:
+    """블록 소요 시간 → metric{stage=...} 히스토그램 + 추적 구간. 예외가 나도 기록(status=error)"""
+    trace = _current_trace.get()
+    depth = _depth.get()
+    token = _depth.set(depth + 1)
+    t0 = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except BaseException as e:
+        # st.rerun()/st.stop() 등 제어 흐름 예외는 오류로 세지 않음
+        if isinstance(e, Exception) and type(e).__module__.split(".")[0] != "streamlit":
+            status = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - t0
+        _depth.reset(token)
+        observe(metric, elapsed, stage=stage, **labels)
+        if status == "error":
+            count("stage_errors", stage=stage, **labels)
+        if trace is not None:
+            trace.add(stage, t0, elapsed, depth)
+
+
+def timed(stage: Optional[str] = None, metric: str = "stage_seconds", **labels) -> Callable:
+    """함수 전체를 timer 로 감싸는 데코레이터 (stage 기본값: 모듈.함수명)"""
+
+    def deco(fn: Callable) -> Callable:
+        name = stage or f"{fn.__module__}.{fn.__name__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timer(name, metric, **labels):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return deco
+
+
+def propagate(fn: Callable) -> Callable:
+    """ThreadPoolExecutor 등 다른 스레드에서 실행할 함수가 현재 추적에 구간을 남기도록 컨텍스트를 복사해 감쌈"""
+    ctx = contextvars.copy_context()
+    return functools.partial(ctx.run, fn)
+
+
+# =========================================================
+# Streamlit 캐시 적중 집계
+# =========================================================
+def cached(name: str, cache_decorator: Callable) -> Callable:
+    """
+    st.cache_data / st.cache_resource 함수의 호출 수(cache_requests)와 실제 계산 수(cache_misses) 집계.
+        @cached("sigungu_table", st.cache_data(show_spinner=False))
+        def load_sigungu_table(): ...
+    적중 수 = cache_requests - cache_misses. .clear() 는 그대로 사용 가능
+    """
+
+    def deco(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def body(*args, **kwargs):
+            count("cache_misses", cache=name)
+            with timer(f"cache.{name}", metric="cache_fill_seconds"):
+                return fn(*args, **kwargs)
+
+        inner = cache_decorator(body)
+
+        @functools.wraps(fn)
+        def outer(*args, **kwargs):
+            count("cache_requests", cache=name)
+            return inner(*args, **kwargs)
+
+        outer.clear = getattr(inner, "clear", None)
+        return outer
+
+    return deco
+
+
+# =========================================================
+# 외부 HTTP 호출
+# =========================================================
+# 숫자가 들어간 4자 이상 조각(매물번호, 좌표), 퍼센트 인코딩(검색어) → :x  ('v1' 같은 버전 조각은 유지)
+_ID_SEGMENT = re.compile(r"^(?:(?=.*\d).{4,}|.*%.*)$")
+_original_session_send = None
+_http_lock = threading.Lock()
+
+
+def endpoint_of(url: str) -> Tuple[str, str]:
+    """URL → (호스트, 경로). 숫자/인코딩된 검색어 조각은 :x 로 묶어 라벨 종류가 늘지 않게"""
+    parts = urlsplit(url)
+    segs = [":x" if _ID_SEGMENT.match(s) else s for s in parts.path.split("/")]
+    return parts.netloc, "/".join(segs) or "/"
+
+
+def install_http_metrics() -> None:
+    """requests.Session.send 를 감싸 http_requests/http_request_seconds/http_errors 집계 (여러 번 불러도 한 번만)"""
+    global _original_session_send
+    import requests
+
+    with _http_lock:
+        if _original_session_send is not None:
+            return
+        _original_session_send = requests.Session.send
+
+        def send(session, request, **kwargs):
+            host, path = endpoint_of(request.url)
+            trace = _current_trace.get()
+            depth = _depth.get()
+            t0 = time.perf_counter()
+            try:
+                resp = _original_session_send(session, request, **kwargs)
+            except Exception as e:
+                elapsed = time.perf_counter() - t0
+                observe("http_request_seconds", elapsed, host=host, endpoint=path)
+                count("http_errors", host=host, endpoint=path, kind=type(e).__name__)
+                if trace is not None:
+                    trace.add(f"HTTP {request.method} {host}{path} ✗", t0, elapsed, depth)
+                raise
+            elapsed = time.perf_counter() - t0
+            observe("http_request_seconds", elapsed, host=host, endpoint=path)
+            count("http_requests", host=host, endpoint=path, status=f"{resp.status_code // 100}xx")
+            if resp.status_code >= 500 or resp.status_code == 429:
+                count("http_errors", host=host, endpoint=path, kind=f"HTTP{resp.status_code}")
+            if trace is not None:
+                trace.add(f"HTTP {request.method} {host}{path} {resp.status_code}", t0, elapsed, depth)
+            return resp
+
+        requests.Session.send = send
+
+
+# =========================================================
+# 내보내기
+# =========================================================
+def write_metrics(path: str) -> None:
+    """path 확장자가 .json 이면 snapshot, 아니면 Prometheus 텍스트로 저장 (임시 파일 → 교체)"""
+    body = json.dumps(snapshot(), ensure_ascii=False, indent=2) if path.endswith(".json") else render_prometheus()
+    tmp = f"{path}.tmp-{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(body)
+    os.replace(tmp, path)
+
+
+_server: Optional[ThreadingHTTPServer] = None
+
+
+def serve_metrics(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """/metrics (Prometheus 텍스트), /metrics.json 을 내보내는 백그라운드 HTTP 서버 (프로세스당 하나)"""
+    global _server
+    with _http_lock:
+        if _server is not None:
+            return _server
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.startswith("/metrics.json"):
+                    body, ctype = json.dumps(snapshot(), ensure_ascii=False).encode("utf-8"), "application/json"
+                elif self.path.startswith("/metrics"):
+                    body, ctype = render_prometheus().encode("utf-8"), "text/plain; version=0.0.4"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", f"{ctype}; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        _server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        return _server
+
+
+def export_from_env() -> None:
+    """METRICS_PORT 가 있으면 엔드포인트 서버 시작(한 번), METRICS_FILE 이 있으면 현재 지표를 파일로 저장"""
+    port = os.getenv("METRICS_PORT")
+    if port and _server is None:
+        try:
+            serve_metrics(int(port))
+        except OSError as e:  # 다른 프로세스가 이미 사용 중
+            record_error("instrumentation.serve_metrics", e)
+    path = os.getenv("METRICS_FILE")
+    if path:
+        write_metrics(path)
+
+
+# =========================================================
+# Streamlit 디버그 패널
+# =========================================================
+def debug_enabled(query_params: Optional[Dict[str, Any]] = None) -> bool:
+    """환경변수 DEBUG_PANEL=1 또는 주소에 ?debug=1 이면 디버그 패널 표시"""
+    if os.getenv("DEBUG_PANEL", "").lower() in ("1", "true", "yes"):
+        return True
+    v = (query_params or {}).get("debug")
+    return str(v).lower() in ("1", "true", "yes")
+
+
+def render_debug_panel(trace: Trace) -> None:
+    """사이드바에 마지막 rerun 의 시간 흐름(구간 막대) + HTTP/캐시 요약 표시"""
+    import streamlit as st
+
+    total = max(trace.duration or 0.0, 1e-9)
+    rows = []
+    for name, start, dur, depth, thread in sorted(trace.spans, key=lambda x: x[1]):
+        left, width = start / total * 100, max(dur / total * 100, 0.4)
+        color = "#E74C3C" if "✗" in name else ("#2F6DF6" if name.startswith("HTTP") else "#2E8B57")
+        rows.append(
+            f"<div style='font-size:0.72rem; margin:2px 0; padding-left:{depth * 8}px;' title='{thread}'>"
+            f"<div style='display:flex; justify-content:space-between;'><span>{name}</span><span>{dur * 1000:.1f}ms</span></div>"
+            f"<div style='background:#F1F3F7; height:6px; border-radius:3px; position:relative;'>"
+            f"<div style='position:absolute; left:{left:.2f}%; width:{width:.2f}%; height:6px; border-radius:3px; background:{color};'></div>"
+            f"</div></div>"
+        )
+
+    snap = snapshot()["counters"]
+    req = {tuple(sorted(r["labels"].items())): r["value"] for r in snap.get("cache_requests", [])}
+    miss = {tuple(sorted(r["labels"].items())): r["value"] for r in snap.get("cache_misses", [])}
+    cache_lines = [
+        f"{dict(k)['cache']}: {int(n - miss.get(k, 0))}/{int(n)} 적중" for k, n in sorted(req.items())
+    ]
+    http_total = sum(r["value"] for r in snap.get("http_requests", []))
+    http_err = sum(r["value"] for r in snap.get("http_errors", []))
+
+    with st.sidebar.expander(f"⏱️ 실행 시간 ({trace.name} · {total * 1000:.0f}ms)", expanded=False):
+        st.markdown("".join(rows) or "<div class='muted'>기록된 구간 없음</div>", unsafe_allow_html=True)
+        st.caption(f"외부 호출 누적 {int(http_total)}건 (오류 {int(http_err)}) · " + (" · ".join(cache_lines) or "캐시 기록 없음"))
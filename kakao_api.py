@@ -1,12 +1,15 @@
-import requests
 import time
 import threading
 import os
+from urllib.parse import urlsplit
 from dotenv import load_dotenv
 
+import resilience
+
 load_dotenv()
 
 KAKAO_REST_API_KEY = os.getenv("KAKAO_REST_API_KEY")
+KAKAO_API_BASE_URL = os.getenv("KAKAO_API_BASE_URL", "https://dapi.kakao.com").rstrip("/")
 lock = threading.Lock()
 MIN_INTERVAL = 0.2 # 카카오 API 가이드에 맞춘 간격 조절
 last_call_time = 0
@@ -20,21 +23,32 @@ def rate_limited():
             time.sleep(MIN_INTERVAL - elapsed)
         last_call_time = time.time()
 
+def _search(path, params):
+    """카카오 로컬 API 호출 → JSON. 오류(재시도 소진, 차단 중, 200 이외 응답)는 resilience.UpstreamError"""
+    url = f"{KAKAO_API_BASE_URL}{path}"
+    headers = {"Authorization": f"KakaoAK {KAKAO_REST_API_KEY}"}
+    res = resilience.get(url, headers=headers, params=params, timeout=5, before_attempt=rate_limited)
+    if res.status_code != 200:
+        raise resilience.UpstreamError(
+            urlsplit(url).netloc, f"카카오 API 오류 (HTTP {res.status_code})", status=res.status_code
+        )
+    return res.json()
+
 def get_kakao_count(query, region):
+    """'지역 키워드' 검색 결과 수. API 키가 없으면 0, 호출 실패는 UpstreamError (0건과 구분)"""
     if not KAKAO_REST_API_KEY:
         return 0
-        
-    rate_limited()
-    url = "https://dapi.kakao.com/v2/local/search/keyword.json"
-    headers = {"Authorization": f"KakaoAK {KAKAO_REST_API_KEY}"}
+
     params = {"query": f"{region} {query}", "size": 1} # 개수만 파악하므로 size는 최소화
+    # meta의 total_count를 쓰면 정확한 전체 개수를 알 수 있음
+    return _search("/v2/local/search/keyword.json", params).get("meta", {}).get("total_count", 0)
+
+def get_kakao_coordinates(address):
+    """주소(예: '서울특별시 종로구 청운동') → (위도, 경도). 검색 결과가 없거나 API 키가 없으면 None, 호출 실패는 UpstreamError"""
+    if not KAKAO_REST_API_KEY:
+        return None
 
-    try:
-        res = requests.get(url, headers=headers, params=params, timeout=5)
-        if res.status_code == 200:
-            # meta의 total_count를 쓰면 정확한 전체 개수를 알 수 있음
-            return res.json().get("meta", {}).get("total_count", 0)
-        else:
-            return 0
-    except:
-        return 0
\ No newline at end of file
+    docs = _search("/v2/local/search/address.json", {"query": address, "size": 1}).get("documents", [])
+    if docs:
+        return float(docs[0]["y"]), float(docs[0]["x"])
+    return None
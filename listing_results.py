@@ -0,0 +1,237 @@
+"""
+매물 검색 결과 묶음 (render_search 목록/지도/상세 공용)
+- 검색 결과 DataFrame이 확정될 때 한 번만 만들어 st.session_state에 보관
+- 목록 카드 HTML을 행마다 미리 렌더해 두고, 화면에는 현재 페이지 구간만 이어 붙여 한 번에 출력
+  (행마다 st.markdown/st.button 을 만들지 않으므로 결과가 수천 건이어도 렌더 비용이 페이지 크기에 비례)
+- 목록 내 검색: 단지/건물명·특징·중개사에 대한 2-gram 역색인 (완성형 글자 + 초성 두 벌)
+  → 후보 교집합 후 정규식으로 확인. 부분 문자열/접두어/초성('ㄹㅁㅇ')/혼합('래미ㅇ') 검색 지원
+- 매물ID → 행 번호 해시 색인: 선택/강조/상세 조회를 O(1)로 (열 전체 비교·문자열 변환 반복 없음)
+"""
+
+from __future__ import annotations
+
+import html
+import re
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PAGE_SIZE = 30
+SEARCH_FIELDS = ["단지/건물명", "특징", "중개사"]
+
+# 한글 음절(가~힣) = 0xAC00 + (초성 x 21 + 중성) x 28 + 종성 → 초성 하나당 588자 연속 구간
+_HANGUL_BASE, _HANGUL_END, _PER_INITIAL = 0xAC00, 0xD7A3, 588
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_CHOSEONG_IDX = {c: i for i, c in enumerate(CHOSEONG)}
+_FIELD_SEP = "\x00"
+
+
+def _text(v, default: str = "-") -> str:
+    if v is None or (isinstance(v, float) and np.isnan(v)):
+        return default
+    s = str(v)
+    return html.escape(s) if s else default
+
+
+def render_row_html(
+    df: pd.DataFrame,
+    bucket_color: Dict[str, str],
+) -> List[str]:
+    """목록 카드 HTML (행 순서 그대로). 가격/면적/인프라 점수 포맷까지 여기서 한 번만 처리"""
+    n = len(df)
+
+    def col(name):
+        return df[name].to_numpy(dtype=object) if name in df.columns else np.full(n, None, dtype=object)
+
+    titles, prices, buckets = col("단지/건물명"), col("가격"), col("가격구간")
+    rlets, trads, floors = col("매물유형"), col("거래유형"), col("층")
+    # 여러 지역을 함께 검색한 경우에만 카드에 검색 지역 표시
+    regions = col("검색지역")
+    multi_region = "검색지역" in df.columns and df["검색지역"].nunique() > 1
+    # 로컬 저장소 이력 (신규 / 직전 대비 가격 변동)
+    is_new = df["신규"].fillna(False).to_numpy(dtype=bool) if "신규" in df.columns else np.zeros(n, dtype=bool)
+    delta = pd.to_numeric(df["가격변동(만원)"], errors="coerce").to_numpy() if "가격변동(만원)" in df.columns else np.full(n, np.nan)
+    py = pd.to_numeric(df["면적(평)"], errors="coerce").to_numpy() if "면적(평)" in df.columns else np.full(n, np.nan)
+    infra = pd.to_numeric(df["인프라점수"], errors="coerce").to_numpy() if "인프라점수" in df.columns else np.full(n, np.nan)
+
+    rows = []
+    for i in range(n):
+        b = buckets[i] if isinstance(buckets[i], str) else "가격정보없음"
+        py_txt = f"{py[i]:.1f}평" if not np.isnan(py[i]) else "-"
+        infra_txt = f" · 인프라 {infra[i]:.0f}점" if not np.isnan(infra[i]) else ""
+        tags = f"<span class='li-region'>{_text(regions[i])}</span>" if multi_region else ""
+        if is_new[i]:
+            tags += "<span class='li-badge new'>NEW</span>"
+        if not np.isnan(delta[i]) and delta[i] != 0:
+            arrow, cls = ("▼", "down") if delta[i] < 0 else ("▲", "up")
+            tags += f"<span class='li-badge {cls}'>{arrow}{abs(delta[i]):,.0f}만</span>"
+        rows.append(
+            f"<div class='list-item'>"
+            f"<div class='list-row'>"
+            f"<div class='swatch' style='background:{bucket_color.get(b, '#9AA0A6')}'></div>"
+            f"<div style='flex:1; min-width:0;'>"
+            f"<div class='li-title'><span class='li-no'>{i + 1}</span>{_text(titles[i])}{tags}</div>"
+            f"<div class='li-sub'><b>{_text(prices[i])}</b> · {html.escape(b)}</div>"
+            f"<div class='li-meta'>{_text(rlets[i])} / {_text(trads[i])} · {py_txt} · {_text(floors[i])}{infra_txt}</div>"
+            f"</div></div></div>"
+        )
+    return rows
+
+
+def normalize_text(text: str) -> str:
+    """검색용 정규화: 소문자 + 공백 제거"""
+    return "".join(str(text).lower().split())
+
+
+def to_choseong(text: str) -> str:
+    """한글 음절은 초성 자모로, 나머지 문자는 그대로 ('래미안' → 'ㄹㅁㅇ')"""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_END:
+            out.append(CHOSEONG[(code - _HANGUL_BASE) // _PER_INITIAL])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def _query_pattern(q: str) -> "re.Pattern[str]":
+    """초성 자모는 그 초성으로 시작하는 음절 구간과도 일치하도록 정규식 생성"""
+    parts = []
+    for ch in q:
+        i = _CHOSEONG_IDX.get(ch)
+        if i is None:
+            parts.append(re.escape(ch))
+        else:
+            lo = chr(_HANGUL_BASE + i * _PER_INITIAL)
+            hi = chr(_HANGUL_BASE + (i + 1) * _PER_INITIAL - 1)
+            parts.append(f"[{ch}{lo}-{hi}]")
+    return re.compile("".join(parts))
+
+
+class ListingSearchIndex:
+    """
+    결과 목록 한 벌에 대한 2-gram 역색인 (결과가 도착할 때 한 번 생성).
+    - full: 정규화 문자열의 2-gram → 행 번호 배열 / cho: 초성 문자열의 2-gram → 행 번호 배열
+    - 1글자 질의는 1-gram 색인 사용
+    search()는 질의 n-gram 게시 목록 교집합으로 후보를 좁힌 뒤 후보만 정규식으로 확인한다.
+    """
+
+    def __init__(self, df: pd.DataFrame, fields: Sequence[str] = SEARCH_FIELDS):
+        n = len(df)
+        cols = [df[f].fillna("").astype(str).to_numpy() for f in fields if f in df.columns]
+        self.docs: List[str] = [
+            _FIELD_SEP.join(normalize_text(c[i]) for c in cols) for i in range(n)
+        ] if cols else [""] * n
+        self.names: List[str] = [normalize_text(v) for v in cols[0]] if cols else [""] * n
+        self.cho_docs: List[str] = [to_choseong(d) for d in self.docs]
+        self.full = self._build(self.docs)
+        self.cho = self._build(self.cho_docs)
+
+    @staticmethod
+    def _build(docs: Sequence[str]) -> Dict[str, np.ndarray]:
+        postings: Dict[str, List[int]] = {}
+        for i, d in enumerate(docs):
+            grams = set(d)
+            grams.update(d[k : k + 2] for k in range(len(d) - 1))
+            grams.discard(_FIELD_SEP)
+            for g in grams:
+                postings.setdefault(g, []).append(i)
+        return {g: np.asarray(p, dtype=np.int32) for g, p in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    @staticmethod
+    def _grams(q: str) -> List[str]:
+        return [q] if len(q) == 1 else [q[k : k + 2] for k in range(len(q) - 1)]
+
+    def _candidates(self, q: str) -> np.ndarray:
+        # 초성 2-gram 은 모든 질의(완성형/초성/혼합)의 필요조건, 완성형 2-gram 은 자모가 없는 구간만
+        lists = [self.cho.get(g) for g in self._grams(to_choseong(q))]
+        lists += [
+            self.full.get(g)
+            for g in self._grams(q)
+            if not any(ch in _CHOSEONG_IDX for ch in g)
+        ]
+        if any(p is None for p in lists):
+            return np.empty(0, dtype=np.int32)
+        lists.sort(key=len)
+        cand = lists[0]
+        for p in lists[1:]:
+            if len(cand) == 0:
+                break
+            cand = np.intersect1d(cand, p, assume_unique=True)
+        return cand
+
+    def search(self, query: str, *, prefix: bool = False) -> np.ndarray:
+        """
+        질의와 일치하는 행 번호(오름차순 = 결과 목록 순서).
+        prefix=True 면 단지/건물명이 질의로 시작하는 행만 (특징/중개사는 부분 일치 대상)
+        """
+        q = normalize_text(query)
+        if not q:
+            return np.arange(len(self.docs))
+        cand = self._candidates(q)
+        has_jamo = any(ch in _CHOSEONG_IDX for ch in q)
+        if prefix:
+            pat = _query_pattern(q)
+            hits = [i for i in cand if pat.match(self.names[i])]
+        elif len(q) <= 2 and (not has_jamo or q == to_choseong(q)):
+            # 2글자 이하 질의는 게시 목록 자체가 정확한 결과 (완성형만 / 초성만인 경우)
+            return cand.astype(np.intp)
+        elif not has_jamo:
+            hits = [i for i in cand if q in self.docs[i]]
+        else:
+            pat = _query_pattern(q)
+            hits = [i for i in cand if pat.search(self.docs[i])]
+        return np.asarray(hits, dtype=np.intp)
+
+
+class ListingResults:
+    """
+    검색 결과 DataFrame + 미리 계산한 목록 표시용 데이터.
+    df는 정렬/reset_index 가 끝난 최종 결과여야 하며, 이후 변경하지 않는다.
+    """
+
+    def __init__(self, df: pd.DataFrame, bucket_color: Dict[str, str]):
+        self.df = df
+        self.ids = df["매물ID"].astype(str).to_numpy() if "매물ID" in df.columns else np.array([], dtype=str)
+        # 같은 매물ID가 여러 번 있으면 첫 행 (기존 df[df["매물ID"] == sel].iloc[0] 과 동일)
+        self.id_pos: Dict[str, int] = {}
+        for i, atcl_no in enumerate(self.ids):
+            self.id_pos.setdefault(atcl_no, i)
+        self.titles = df["단지/건물명"].fillna("").astype(str).to_numpy() if len(df) else np.array([], dtype=str)
+        self.rows_html = render_row_html(df, bucket_color)
+        self.search_index = ListingSearchIndex(df)
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def position(self, atcl_no) -> Optional[int]:
+        """매물ID → 행 번호 (없으면 None)"""
+        if atcl_no is None:
+            return None
+        return self.id_pos.get(str(atcl_no))
+
+    def row(self, atcl_no) -> Optional[pd.Series]:
+        """매물ID → 결과 행 (없으면 None)"""
+        pos = self.position(atcl_no)
+        return None if pos is None else self.df.iloc[pos]
+
+    def page(self, positions: Sequence[int], page_no: int, page_size: int = DEFAULT_PAGE_SIZE) -> np.ndarray:
+        """positions(표시 대상 행 번호) 중 page_no(1부터) 페이지에 해당하는 행 번호"""
+        positions = np.asarray(positions, dtype=np.intp)
+        start = (max(page_no, 1) - 1) * page_size
+        return positions[start : start + page_size]
+
+    def page_html(self, page_positions: Sequence[int], selected_pos: Optional[int] = None) -> str:
+        """현재 페이지 카드들을 하나의 HTML 문자열로 (선택된 카드만 강조 클래스로 교체)"""
+        parts = []
+        for p in page_positions:
+            h = self.rows_html[p]
+            if selected_pos is not None and p == selected_pos:
+                h = h.replace("class='list-item'", "class='list-item selected'", 1)
+            parts.append(h)
+        return "<div class='list-wrap'>" + "".join(parts) + "</div>"
@@ -0,0 +1,378 @@
+"""
+네이버 매물 로컬 저장소 (SQLite)
+- 수집한 매물을 atclNo 기준으로 upsert 하면서 최초/최근 확인 시각과 가격 변동 이력을 기록
+- 행 형식: 색인에 쓰는 열(지역코드, 거래유형, 가격 등)만 컬럼으로 두고,
+  나머지 원본 필드는 고정 키 순서의 JSON 배열을 zlib 압축한 BLOB 하나로 저장 (WITHOUT ROWID 테이블)
+- 색인: (cortar_no, trad_tp_cd, price), (cortar_no, first_seen)
+  → "어제 이후 새 매물", "가격 인하 매물", 지역/거래유형/가격 조건 조회를 다시 수집하지 않고 바로 처리
+- regions 테이블에 지역별 마지막 수집 시각/수집 상한을 두어, 최근에 그 이상 수집한 지역은 저장소에서 먼저 응답
+
+사용:
+    store = ListingStore()
+    store.upsert(items, cortar_no="1168000000")
+    store.new_since(time.time() - 86400, cortar_no="1168000000")
+    store.price_drops(since=time.time() - 86400)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from utils import TABLE_COLUMNS, parse_price_to_manwon
+
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "listings.sqlite3")
+
+# 압축 BLOB 에 담는 원본 필드 (순서 고정, 바꾸면 기존 행 해석이 달라지므로 뒤에만 추가)
+PAYLOAD_KEYS = [k for k, _ in TABLE_COLUMNS if k != "searchRegion"] + ["tradTpCd", "rletTpCd", "rentPrc", "cortarNo"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    atcl_no    TEXT PRIMARY KEY,
+    cortar_no  TEXT NOT NULL,
+    trad_tp_cd TEXT,
+    price      INTEGER,
+    rent       INTEGER,
+    cfm_ymd    TEXT,
+    first_seen INTEGER NOT NULL,
+    last_seen  INTEGER NOT NULL,
+    payload    BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_listings_region_trade_price ON listings (cortar_no, trad_tp_cd, price);
+CREATE INDEX IF NOT EXISTS idx_listings_region_first_seen ON listings (cortar_no, first_seen);
+
+CREATE TABLE IF NOT EXISTS price_history (
+    atcl_no    TEXT NOT NULL,
+    changed_at INTEGER NOT NULL,
+    old_price  INTEGER,
+    new_price  INTEGER,
+    old_rent   INTEGER,
+    new_rent   INTEGER,
+    PRIMARY KEY (atcl_no, changed_at)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_price_history_changed_at ON price_history (changed_at);
+
+CREATE TABLE IF NOT EXISTS regions (
+    cortar_no   TEXT PRIMARY KEY,
+    last_synced INTEGER NOT NULL,
+    item_count  INTEGER NOT NULL,
+    sync_limit  INTEGER,
+    first_synced INTEGER
+) WITHOUT ROWID;
+"""
+
+# 예전 저장소 파일의 regions 테이블에 없던 열 (ALTER TABLE 로 추가)
+_REGION_COLUMNS = {"sync_limit": "INTEGER", "first_synced": "INTEGER"}
+
+
+def _encode(item: Mapping[str, Any]) -> bytes:
+    return zlib.compress(
+        json.dumps([item.get(k) for k in PAYLOAD_KEYS], ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    )
+
+
+def _decode(blob: bytes) -> Dict[str, Any]:
+    values = json.loads(zlib.decompress(blob).decode("utf-8"))
+    return {k: v for k, v in zip(PAYLOAD_KEYS, values) if v is not None}
+
+
+def _to_int(v: Any) -> Optional[int]:
+    try:
+        return int(str(v).replace(",", "")) if v not in (None, "") else None
+    except ValueError:
+        return None
+
+
+class ListingStore:
+    """스레드 간 공유 가능한 SQLite 매물 저장소 (연결 하나 + 잠금)"""
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        cols = {row[1] for row in self._conn.execute("PRAGMA table_info(regions)")}
+        missing = [c for c in _REGION_COLUMNS if c not in cols]
+        if not missing:
+            return
+        with self._conn:
+            for c in missing:
+                self._conn.execute(f"ALTER TABLE regions ADD COLUMN {c} {_REGION_COLUMNS[c]}")
+            # 최초 수집 시각은 지역 매물 중 가장 먼저 확인된 시각으로 채움 (수집 상한은 알 수 없으므로 비워 둠)
+            self._conn.execute(
+                "UPDATE regions SET first_synced = (SELECT MIN(first_seen) FROM listings WHERE listings.cortar_no = regions.cortar_no) "
+                "WHERE first_synced IS NULL"
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------------
+    def upsert(
+        self,
+        items: Iterable[Mapping[str, Any]],
+        cortar_no: Optional[str] = None,
+        seen_at: Optional[float] = None,
+        mark_synced: bool = True,
+        limit: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """
+        매물 목록 저장. 새 매물은 first_seen 기록, 기존 매물은 last_seen 갱신,
+        가격(보증금/매매가)이나 월세가 바뀌면 price_history 에 한 줄 추가.
+        limit: 이번 수집의 매물 수 상한 (지역 동기화 기록에 남겨 더 많이 요청하면 다시 수집)
+        반환: {"new": n, "updated": n, "price_changed": n}
+        """
+        now = int(seen_at if seen_at is not None else time.time())
+        rows = []
+        for it in items:
+            atcl_no = it.get("atclNo")
+            if not atcl_no:
+                continue
+            rows.append(
+                (
+                    str(atcl_no),
+                    # 수집 기준 지역코드 우선 (구 단위로 수집해도 구 코드로 조회되도록)
+                    str(cortar_no or it.get("cortarNo") or ""),
+                    it.get("tradTpCd"),
+                    parse_price_to_manwon(it.get("hanPrc")),
+                    _to_int(it.get("rentPrc")),
+                    it.get("atclCfmYmd"),
+                    _encode(it),
+                )
+            )
+
+        stats = {"new": 0, "updated": 0, "price_changed": 0}
+        with self._lock, self._conn:
+            cur = self._conn.cursor()
+            existing: Dict[str, tuple] = {}
+            ids = [r[0] for r in rows]
+            for k in range(0, len(ids), 500):
+                chunk = ids[k : k + 500]
+                q = f"SELECT atcl_no, price, rent FROM listings WHERE atcl_no IN ({','.join('?' * len(chunk))})"
+                for atcl_no, price, rent in cur.execute(q, chunk):
+                    existing[atcl_no] = (price, rent)
+
+            history = []
+            for atcl_no, _, _, price, rent, _, _ in rows:
+                if atcl_no not in existing:
+                    stats["new"] += 1
+                    continue
+                stats["updated"] += 1
+                old_price, old_rent = existing[atcl_no]
+                if (old_price, old_rent) != (price, rent):
+                    stats["price_changed"] += 1
+                    history.append((atcl_no, now, old_price, price, old_rent, rent))
+
+            cur.executemany(
+                """
+                INSERT INTO listings (atcl_no, cortar_no, trad_tp_cd, price, rent, cfm_ymd, first_seen, last_seen, payload)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(atcl_no) DO UPDATE SET
+                    cortar_no = excluded.cortar_no,
+                    trad_tp_cd = excluded.trad_tp_cd,
+                    price = excluded.price,
+                    rent = excluded.rent,
+                    cfm_ymd = excluded.cfm_ymd,
+                    last_seen = excluded.last_seen,
+                    payload = excluded.payload
+                """,
+                [(a, c, t, p, r, y, now, now, b) for a, c, t, p, r, y, b in rows],
+            )
+            cur.executemany("INSERT OR REPLACE INTO price_history VALUES (?, ?, ?, ?, ?, ?)", history)
+            if mark_synced and cortar_no:
+                cur.execute(
+                    """
+                    INSERT INTO regions (cortar_no, last_synced, item_count, sync_limit, first_synced)
+                    VALUES (?, ?, (SELECT COUNT(*) FROM listings WHERE cortar_no = ?), ?, ?)
+                    ON CONFLICT(cortar_no) DO UPDATE SET
+                        last_synced = excluded.last_synced,
+                        item_count = excluded.item_count,
+                        sync_limit = excluded.sync_limit
+                    """,
+                    (str(cortar_no), now, str(cortar_no), _to_int(limit), now),
+                )
+        return stats
+
+    def touch_region(self, cortar_no: str, since: float, seen_at: Optional[float] = None) -> int:
+        """
+        since 이후 확인됐던 지역 매물의 last_seen 을 seen_at 으로 올림 (반환: 갱신 행 수).
+        증분 동기화가 앞쪽 페이지만 보고 멈췄을 때, 보지 않은 뒤쪽 매물을 계속 게시 중으로 간주하기 위함
+        """
+        now = int(seen_at if seen_at is not None else time.time())
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "UPDATE listings SET last_seen = ? WHERE cortar_no = ? AND last_seen >= ? AND last_seen < ?",
+                (now, str(cortar_no), int(since), now),
+            )
+        return cur.rowcount
+
+    # ------------------------------------------------------------------
+    # 읽기
+    # ------------------------------------------------------------------
+    def _select(self, where: str, params: Sequence[Any], order: str = "", limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        q = f"SELECT payload, first_seen, last_seen FROM listings WHERE {where} {order}"
+        if limit is not None:
+            q += f" LIMIT {int(limit)}"
+        with self._lock:
+            rows = self._conn.execute(q, params).fetchall()
+        out = []
+        for blob, first_seen, last_seen in rows:
+            it = _decode(blob)
+            it["firstSeen"] = first_seen
+            it["lastSeen"] = last_seen
+            out.append(it)
+        return out
+
+    def last_synced(self, cortar_no: str) -> Optional[int]:
+        with self._lock:
+            row = self._conn.execute("SELECT last_synced FROM regions WHERE cortar_no = ?", (str(cortar_no),)).fetchone()
+        return row[0] if row else None
+
+    def sync_limit(self, cortar_no: str) -> Optional[int]:
+        """지역 마지막 수집의 매물 수 상한 (기록이 없으면 None)"""
+        with self._lock:
+            row = self._conn.execute("SELECT sync_limit FROM regions WHERE cortar_no = ?", (str(cortar_no),)).fetchone()
+        return row[0] if row else None
+
+    def is_fresh(self, cortar_no: str, max_age_s: float, min_limit: Optional[int] = None) -> bool:
+        """
+        지역을 max_age_s 초 안에 수집한 적이 있으면 True.
+        min_limit 을 주면 마지막 수집 상한이 그보다 작거나 기록이 없을 때 False (저장된 매물이 모자랄 수 있으므로)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_synced, sync_limit FROM regions WHERE cortar_no = ?", (str(cortar_no),)
+            ).fetchone()
+        if row is None or time.time() - row[0] > max_age_s:
+            return False
+        return min_limit is None or (row[1] is not None and row[1] >= min_limit)
+
+    def changed(self, items: Iterable[Mapping[str, Any]]) -> List[Mapping[str, Any]]:
+        """items 중 저장소에 없거나 가격/월세/확인일자가 달라진 매물만 (증분 동기화의 중단 판단용)"""
+        items = [it for it in items if it.get("atclNo")]
+        ids = [str(it["atclNo"]) for it in items]
+        known: Dict[str, tuple] = {}
+        with self._lock:
+            for k in range(0, len(ids), 500):
+                chunk = ids[k : k + 500]
+                q = f"SELECT atcl_no, price, rent, cfm_ymd FROM listings WHERE atcl_no IN ({','.join('?' * len(chunk))})"
+                for atcl_no, price, rent, cfm_ymd in self._conn.execute(q, chunk):
+                    known[atcl_no] = (price, rent, cfm_ymd)
+        return [
+            it
+            for atcl_no, it in zip(ids, items)
+            if known.get(atcl_no)
+            != (parse_price_to_manwon(it.get("hanPrc")), _to_int(it.get("rentPrc")), it.get("atclCfmYmd"))
+        ]
+
+    def listings(
+        self,
+        cortar_no: str,
+        trad_tp_cd: Optional[str] = None,
+        max_price: Optional[int] = None,
+        limit: Optional[int] = None,
+        active_since: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """지역(+거래유형, 최대 가격) 조건 매물. active_since 이후 다시 확인된 매물만 (내려간 매물 제외용)"""
+        where, params = ["cortar_no = ?"], [str(cortar_no)]
+        if trad_tp_cd:
+            where.append("trad_tp_cd = ?")
+            params.append(trad_tp_cd)
+        if max_price is not None:
+            where.append("price <= ?")
+            params.append(int(max_price))
+        if active_since is not None:
+            where.append("last_seen >= ?")
+            params.append(int(active_since))
+        return self._select(" AND ".join(where), params, "ORDER BY cfm_ymd DESC, atcl_no DESC", limit)
+
+    def new_since(self, since: float, cortar_no: Optional[str] = None) -> List[Dict[str, Any]]:
+        """since(epoch 초) 이후 처음 확인된 매물"""
+        if cortar_no:
+            return self._select("cortar_no = ? AND first_seen >= ?", (str(cortar_no), int(since)), "ORDER BY first_seen DESC")
+        return self._select("first_seen >= ?", (int(since),), "ORDER BY first_seen DESC")
+
+    def price_drops(self, since: Optional[float] = None, cortar_no: Optional[str] = None) -> List[Dict[str, Any]]:
+        """since 이후 가격(또는 월세)이 내려간 기록 (매물 필드 + old/new 가격)"""
+        q = """
+            SELECT h.atcl_no, h.changed_at, h.old_price, h.new_price, h.old_rent, h.new_rent, l.payload
+            FROM price_history h JOIN listings l ON l.atcl_no = h.atcl_no
+            WHERE h.changed_at >= ? AND (h.new_price < h.old_price OR h.new_rent < h.old_rent)
+        """
+        params: List[Any] = [int(since or 0)]
+        if cortar_no:
+            q += " AND l.cortar_no = ?"
+            params.append(str(cortar_no))
+        q += " ORDER BY h.changed_at DESC"
+        with self._lock:
+            rows = self._conn.execute(q, params).fetchall()
+        out = []
+        for atcl_no, changed_at, old_p, new_p, old_r, new_r, blob in rows:
+            it = _decode(blob)
+            it.update({"changedAt": changed_at, "oldPrice": old_p, "newPrice": new_p, "oldRent": old_r, "newRent": new_r})
+            out.append(it)
+        return out
+
+    def history(self, atcl_nos: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        매물ID별 {first_seen, region_first_synced, last_change_at, prev_price, price} (검색 결과 표시용 일괄 조회).
+        region_first_synced 는 매물 지역을 처음 수집한 시각 — first_seen 이 이와 같으면 첫 수집 때부터 있던 매물
+        """
+        out: Dict[str, Dict[str, Any]] = {}
+        ids = [str(a) for a in atcl_nos]
+        with self._lock:
+            for k in range(0, len(ids), 500):
+                chunk = ids[k : k + 500]
+                marks = ",".join("?" * len(chunk))
+                for atcl_no, first_seen, price, first_synced in self._conn.execute(
+                    f"""
+                    SELECT l.atcl_no, l.first_seen, l.price, r.first_synced
+                    FROM listings l LEFT JOIN regions r ON r.cortar_no = l.cortar_no
+                    WHERE l.atcl_no IN ({marks})
+                    """,
+                    chunk,
+                ):
+                    out[atcl_no] = {
+                        "first_seen": first_seen,
+                        "region_first_synced": first_synced,
+                        "price": price,
+                        "prev_price": None,
+                        "last_change_at": None,
+                    }
+                for atcl_no, changed_at, old_price in self._conn.execute(
+                    f"""
+                    SELECT atcl_no, changed_at, old_price FROM price_history
+                    WHERE atcl_no IN ({marks})
+                    ORDER BY changed_at
+                    """,
+                    chunk,
+                ):
+                    if atcl_no in out:
+                        out[atcl_no]["prev_price"] = old_price
+                        out[atcl_no]["last_change_at"] = changed_at
+        return out
+
+
+if __name__ == "__main__":
+    import sys
+
+    store = ListingStore()
+    day_ago = time.time() - 86400
+    region = sys.argv[1] if len(sys.argv) > 1 else None
+    print(f"어제 이후 새 매물: {len(store.new_since(day_ago, region))}건")
+    print(f"어제 이후 가격 인하: {len(store.price_drops(day_ago, region))}건")
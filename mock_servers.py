@@ -0,0 +1,779 @@
+"""
+외부 API 로컬 대역 서버 (네이버 부동산 / 카카오 로컬 / Overpass / 공공데이터포털)
+- 실서비스 없이 scraper.py, kakao_api.py, poi_schools.py, poi_engine.py, public_api.py, search_area.py 의
+  수집 경로를 그대로 실행해 보기 위한 개발·벤치마크용 HTTP 서버 (표준 라이브러리만 사용)
+- 응답 형태와 페이지 처리(articleList 의 more/page, StanReginCd 의 pageNo/numOfRows)는 각 클라이언트가 읽는 구조를 따름
+- 응답 내용과 지연/오류는 (seed, 요청 경로+파라미터, 같은 요청의 반복 횟수)로 정해지므로 같은 설정이면 매번 같은 결과
+- 업스트림별 프로필: 지연(로그정규 분포 중앙값/분산), 초당 허용 요청(토큰 버킷, 초과 시 429 등 실제와 같은 형태의 거절),
+  오류율(5xx), 응답 지연(timeout 유발), 깨진 응답 비율
+
+클라이언트는 아래 환경변수의 기본 주소를 사용하므로, 서버를 띄운 뒤 출력되는 값을 export 하고 앱/스크립트를 실행하면 됨.
+    NAVER_LAND_BASE_URL, NAVER_FRONT_API_BASE_URL, KAKAO_API_BASE_URL, OVERPASS_URL,
+    PUBLIC_DATA_BASE_URL, API_ENDPOINT_room, API_ENDPOINT_offi
+
+사용:
+    python mock_servers.py                          # 기본 프로필로 실행 (Ctrl+C 로 종료)
+    python mock_servers.py --latency-scale 0        # 지연 없이 (처리량 측정용)
+    python mock_servers.py --error-rate 0.05 --no-rate-limit
+
+    with MockUpstreams(latency_scale=0).start() as mock:   # 코드에서 (클라이언트 import 전에 env 적용)
+        os.environ.update(mock.env())
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlencode, urlparse
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+REGION_CODE_PATH = os.path.join(_ROOT, "region_code.txt")
+SIGUNGU_COORDS_PATH = os.path.join(_ROOT, "data", "korea_sigungu_coordinates.csv")
+
+ARTICLE_PAGE_SIZE = 20  # articleList 한 페이지 매물 수 (네이버와 동일)
+
+# 업스트림별 기본 프로필
+# latency_ms=(중앙값, 로그 표준편차), rps/burst=토큰 버킷(0 이면 제한 없음),
+# error_rate=5xx 비율, hang_rate=응답을 hang_s 초 늦추는 비율, malformed_rate=잘린 본문 비율
+SERVICE_PROFILES: Dict[str, Dict[str, Any]] = {
+    "naver": {"latency_ms": (180, 0.5), "rps": 3.0, "burst": 6, "error_rate": 0.0, "hang_rate": 0.0, "malformed_rate": 0.0},
+    "naver_front": {"latency_ms": (120, 0.4), "rps": 5.0, "burst": 10, "error_rate": 0.0, "hang_rate": 0.0, "malformed_rate": 0.0},
+    "kakao": {"latency_ms": (40, 0.4), "rps": 10.0, "burst": 20, "error_rate": 0.0, "hang_rate": 0.0, "malformed_rate": 0.0},
+    "overpass": {"latency_ms": (1500, 0.6), "rps": 1.0, "burst": 2, "error_rate": 0.0, "hang_rate": 0.0, "malformed_rate": 0.0},
+    "data_go_kr": {"latency_ms": (300, 0.5), "rps": 30.0, "burst": 30, "error_rate": 0.0, "hang_rate": 0.0, "malformed_rate": 0.0},
+}
+
+_APT_NAMES = ["래미안", "자이", "힐스테이트", "e편한세상", "푸르지오", "아이파크", "롯데캐슬", "더샵", "센트레빌", "현대"]
+_SUFFIXES = ["", " 1차", " 2차", " 퍼스트", " 센트럴", " 파크", " 리버뷰"]
+_RLET_TYPES = [("APT", "아파트", 0.35), ("OPST", "오피스텔", 0.25), ("VL", "빌라", 0.25), ("OR", "원룸", 0.15)]
+_TRADE_TYPES = [("B1", "전세", 0.45), ("B2", "월세", 0.5), ("B3", "단기임대", 0.05)]
+_DIRECTIONS = ["남향", "남동향", "남서향", "동향", "서향", "북향"]
+_FEATURES = ["역세권", "신축", "풀옵션", "주차가능", "즉시입주", "남향 채광", "리모델링", "학군우수", "반려동물가능", ""]
+_REALTORS = ["행복", "우리", "으뜸", "미래", "스마일", "정직", "한빛", "대성"]
+
+# Overpass 태그별 km² 당 개수 (대략적인 도심 밀도)
+_OSM_DENSITY = {
+    ("amenity", "school"): 2.0,
+    ("amenity", "hospital"): 0.3,
+    ("amenity", "clinic"): 6.0,
+    ("amenity", "pharmacy"): 5.0,
+    ("shop", "convenience"): 12.0,
+    ("shop", "supermarket"): 2.0,
+    ("shop", "mall"): 0.2,
+    ("railway", "station"): 0.5,
+    ("amenity", "cafe"): 15.0,
+    ("amenity", "restaurant"): 30.0,
+}
+
+
+# =========================================================
+# 지역 데이터 (region_code.txt + 시군구 중심좌표)
+# =========================================================
+class _Regions:
+    """법정동코드/이름/중심좌표 조회 (최초 사용 시 한 번 로드)"""
+
+    def __init__(self):
+        self.names: Dict[str, str] = {}
+        self.active: List[Tuple[str, str, str]] = []
+        self._found: Dict[str, Optional[str]] = {}
+        self.centers: Dict[str, Tuple[float, float]] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> None:
+        with self._lock:
+            if self._loaded:
+                return
+            raw = open(REGION_CODE_PATH, "rb").read()
+            try:
+                text = raw.decode("utf-8")
+            except UnicodeDecodeError:
+                text = raw.decode("cp949")
+            for line in text.splitlines()[1:]:
+                parts = line.split("\t")
+                if len(parts) >= 3 and parts[0].isdigit():
+                    self.names[parts[0]] = parts[1]
+                    self.active.append((parts[0], parts[1], parts[2].strip()))
+            if os.path.exists(SIGUNGU_COORDS_PATH):
+                with open(SIGUNGU_COORDS_PATH, encoding="utf-8-sig") as f:
+                    next(f)
+                    for line in f:
+                        code, _, _, lat, lon = line.rstrip("\n").split(",")
+                        self.centers[code] = (float(lat), float(lon))
+            self._loaded = True
+
+    def rows(self) -> List[Tuple[str, str, str]]:
+        self._load()
+        return self.active
+
+    def name(self, code: str) -> str:
+        self._load()
+        return self.names.get(code) or self.names.get(code[:5].ljust(10, "0"), "")
+
+    def find(self, keyword: str) -> Optional[str]:
+        """검색어 → 법정동코드 (이름이 검색어로 끝나는 가장 짧은 지역)"""
+        self._load()
+        kw = " ".join(keyword.split())
+        if kw not in self._found:
+            flat = kw.replace(" ", "")
+            hits = [c for c, n in self.names.items() if n == kw or n.endswith(" " + kw) or n.replace(" ", "").endswith(flat)]
+            self._found[kw] = min(hits, key=lambda c: (len(self.names[c]), c)) if hits else None
+        return self._found[kw]
+
+    def find_prefix(self, text: str) -> Optional[str]:
+        """'서울특별시 종로구 편의점' 처럼 지역명 뒤에 다른 말이 붙은 문자열 → 가장 긴 앞부분 지역"""
+        words = text.split()
+        for k in range(len(words), 0, -1):
+            code = self.find(" ".join(words[:k]))
+            if code:
+                return code
+        return None
+
+    def center(self, code: str) -> Tuple[float, float]:
+        """시군구 중심좌표 (표에 없으면 코드 해시로 서울 근처 임의 좌표)"""
+        self._load()
+        if code[:5] in self.centers:
+            lat, lon = self.centers[code[:5]]
+        else:
+            r = random.Random(code[:5])
+            lat, lon = 37.45 + r.random() * 0.2, 126.85 + r.random() * 0.3
+        if code[5:8] != "000":
+            # 읍면동은 시군구 중심에서 코드별로 조금 떨어진 위치
+            r = random.Random(code)
+            lat, lon = lat + r.uniform(-0.02, 0.02), lon + r.uniform(-0.025, 0.025)
+        return round(lat, 6), round(lon, 6)
+
+
+REGIONS = _Regions()
+
+
+def _rng(*parts: Any) -> random.Random:
+    return random.Random(zlib.crc32("|".join(map(str, parts)).encode("utf-8")))
+
+
+def _weighted(r: random.Random, options):
+    x, acc = r.random(), 0.0
+    for *vals, w in options:
+        acc += w
+        if x <= acc:
+            return vals
+    return options[-1][:-1]
+
+
+def _han_price(manwon: int) -> str:
+    """만원 정수 → 네이버 hanPrc 형식 ('2억 5,000', '8,000', '3억')"""
+    eok, rest = divmod(int(manwon), 10000)
+    if eok and rest:
+        return f"{eok}억 {rest:,}"
+    if eok:
+        return f"{eok}억"
+    return f"{rest:,}"
+
+
+# =========================================================
+# 업스트림별 응답 생성
+# =========================================================
+def naver_region_total(cortar_no: str, listing_scale: float) -> int:
+    """지역 매물 총수 (시군구 수백 건, 읍면동 수십 건)"""
+    r = _rng("total", cortar_no)
+    base = r.randint(30, 120) if cortar_no[5:8] != "000" else r.randint(150, 900)
+    return max(0, int(base * listing_scale))
+
+
+def naver_article(cortar_no: str, idx: int, as_of: date) -> Dict[str, Any]:
+    """지역 cortar_no 의 idx 번째 매물 (idx 가 작을수록 최근 확인 → sort=dates 순서와 같음)"""
+    r = _rng("atcl", cortar_no, idx)
+    lat0, lon0 = REGIONS.center(cortar_no)
+    rlet_cd, rlet_nm = _weighted(r, _RLET_TYPES)
+    trad_cd, trad_nm = _weighted(r, _TRADE_TYPES)
+    spc2 = round(r.lognormvariate(math.log(59 if rlet_cd == "APT" else 30), 0.4), 2)
+    if trad_cd == "B1":
+        price, rent = int(r.lognormvariate(math.log(spc2 * 500), 0.35)) // 500 * 500 or 1000, None
+    else:
+        price, rent = r.choice([300, 500, 1000, 2000, 3000, 5000]), r.randint(35, 180)
+    total_flr = r.randint(4, 35) if rlet_cd in ("APT", "OPST") else r.randint(2, 5)
+    name = r.choice(_APT_NAMES) + r.choice(_SUFFIXES) if rlet_cd == "APT" else f"{r.choice(_APT_NAMES)}{rlet_nm}"
+    cfm = as_of - timedelta(days=idx // 15)
+    atcl_no = f"2{zlib.crc32(cortar_no.encode()) % 10**4:04d}{idx:05d}"
+    item = {
+        "atclNo": atcl_no,
+        "cortarNo": cortar_no,
+        "atclNm": name,
+        "atclStatCd": "R0",
+        "rletTpCd": rlet_cd,
+        "uprRletTpCd": rlet_cd,
+        "rletTpNm": rlet_nm,
+        "tradTpCd": trad_cd,
+        "tradTpNm": trad_nm,
+        "vrfcTpCd": "OWNER",
+        "flrInfo": f"{r.randint(1, total_flr)}/{total_flr}",
+        "prc": price,
+        "rentPrc": rent or 0,
+        "hanPrc": _han_price(price),
+        "spc1": str(round(spc2 * 1.3, 2)),
+        "spc2": str(spc2),
+        "direction": r.choice(_DIRECTIONS),
+        "atclCfmYmd": cfm.strftime("%y.%m.%d"),
+        "repImgUrl": f"/{cortar_no}/{atcl_no}_1.jpg" if r.random() < 0.8 else "",
+        "repImgTpCd": "AGENT",
+        "repImgThumb": "f130_98",
+        "lat": round(lat0 + r.gauss(0, 0.01), 7),
+        "lng": round(lon0 + r.gauss(0, 0.012), 7),
+        "atclFetrDesc": " ".join(sorted({r.choice(_FEATURES) for _ in range(2)} - {""})),
+        "tagList": r.sample(["역세권", "신축", "주차가능", "즉시입주", "풀옵션"], k=2),
+        "bildNm": f"{r.randint(101, 115)}동" if rlet_cd == "APT" else "",
+        "minute": 0,
+        "sameAddrCnt": r.randint(1, 4),
+        "sameAddrDirectCnt": 0,
+        "sameAddrMaxPrc": _han_price(price),
+        "sameAddrMinPrc": _han_price(price),
+        "cpid": "bizmk",
+        "cpNm": "매경부동산",
+        "cpCnt": 1,
+        "rltrNm": f"{r.choice(_REALTORS)}공인중개사사무소",
+        "directTradYn": "N",
+        "minMviFee": 0,
+        "maxMviFee": 0,
+        "etRoomCnt": 0,
+        "tradePriceHan": "",
+        "tradeRentPrice": 0,
+        "tradeCheckedByOwner": False,
+        "cpLinkVO": {"cpId": "bizmk", "mobileArticleUrl": "", "mobileArticleLinkTypeCode": "NONE"},
+        "dtlAddrYn": "N",
+        "dtlAddr": "",
+        "isVrExposed": False,
+    }
+    return item
+
+
+def naver_gallery(atcl_no: str) -> Dict[str, Any]:
+    r = _rng("img", atcl_no)
+    return {
+        "isSuccess": True,
+        "result": [
+            {"imageUrl": f"https://landthumb-phinf.pstatic.net/mock/{atcl_no}_{i}.jpg?type=m562", "imageType": "ROOM"}
+            for i in range(r.randint(0, 8))
+        ],
+    }
+
+
+def overpass_elements(query: str, seed: int) -> List[Dict[str, Any]]:
+    """Overpass QL 에서 around/bbox 영역과 ["k"="v"] 태그를 읽어 밀도에 맞춘 요소 생성"""
+    tags = list(dict.fromkeys(re.findall(r'\["([^"]+)"="([^"]+)"\]', query)))
+    m = re.search(r"around:\s*([\d.]+)\s*,\s*([\d.]+)\s*,\s*([\d.]+)", query)
+    if m:
+        radius_m, lat, lon = float(m.group(1)), float(m.group(2)), float(m.group(3))
+        d_lat = radius_m / 111_195
+        d_lon = d_lat / max(math.cos(math.radians(lat)), 1e-6)
+        area_km2 = math.pi * (radius_m / 1000) ** 2
+        s, w, n, e = lat - d_lat, lon - d_lon, lat + d_lat, lon + d_lon
+    else:
+        b = re.search(r"\(\s*([\d.]+)\s*,\s*([\d.]+)\s*,\s*([\d.]+)\s*,\s*([\d.]+)\s*\)", query)
+        if not b:
+            return []
+        s, w, n, e = (float(x) for x in b.groups())
+        mid = math.radians((s + n) / 2)
+        area_km2 = (n - s) * 111.195 * (e - w) * 111.195 * math.cos(mid)
+        radius_m = None
+    out: List[Dict[str, Any]] = []
+    for k, v in tags:
+        r = _rng("osm", seed, k, v, round(s, 4), round(w, 4), round(n, 4), round(e, 4))
+        count = int(_OSM_DENSITY.get((k, v), 1.0) * area_km2 * r.uniform(0.7, 1.3))
+        for i in range(count):
+            if radius_m is not None:
+                # 원 안 균등 분포
+                rr, th = math.sqrt(r.random()), r.random() * 2 * math.pi
+                el_lat = (s + n) / 2 + rr * (n - s) / 2 * math.sin(th)
+                el_lon = (w + e) / 2 + rr * (e - w) / 2 * math.cos(th)
+            else:
+                el_lat, el_lon = r.uniform(s, n), r.uniform(w, e)
+            name = f"{r.choice(_REALTORS)}{'초등학교' if v == 'school' and i % 3 == 0 else '중학교' if v == 'school' and i % 3 == 1 else '고등학교' if v == 'school' else v}"
+            el_id = zlib.crc32(f"{k}{v}{el_lat:.6f}{el_lon:.6f}".encode())
+            if i % 4 == 0:
+                out.append({"type": "way", "id": el_id, "center": {"lat": round(el_lat, 7), "lon": round(el_lon, 7)}, "tags": {k: v, "name": name}})
+            else:
+                out.append({"type": "node", "id": el_id, "lat": round(el_lat, 7), "lon": round(el_lon, 7), "tags": {k: v, "name": name}})
+    return out
+
+
+def rtms_rent_items(lawd_cd: str, deal_ymd: str, category: str) -> List[Dict[str, Any]]:
+    """국토부 전월세 실거래 (search_area.py 가 읽는 XML item 필드)"""
+    r = _rng("rtms", lawd_cd, deal_ymd, category)
+    sgg_name = REGIONS.name(lawd_cd.ljust(10, "0")).split(" ")[-1]
+    dongs = [n.split(" ")[-1] for c, n, st in REGIONS.rows() if c.startswith(lawd_cd) and c[5:8] != "000" and st == "존재"][:30] or ["중앙동"]
+    items = []
+    for _ in range(r.randint(0, 60)):
+        area = round(r.lognormvariate(math.log(30), 0.35), 2)
+        monthly = r.choice([0, 0, r.randint(30, 120)])
+        deposit = r.choice([500, 1000, 3000, 5000]) if monthly else int(area * r.uniform(300, 700))
+        item = {
+            "buildYear": str(r.randint(1990, 2023)),
+            "contractTerm": "",
+            "contractType": r.choice(["", "신규", "갱신"]),
+            "dealDay": str(r.randint(1, 28)),
+            "dealMonth": str(int(deal_ymd[4:])),
+            "dealYear": deal_ymd[:4],
+            "deposit": f"{deposit:,}",
+            "floor": str(r.randint(1, 15)),
+            "jibun": f"{r.randint(1, 999)}-{r.randint(1, 99)}",
+            "monthlyRent": str(monthly),
+            "preDeposit": "",
+            "preMonthlyRent": "",
+            "sggCd": lawd_cd,
+            "sggNm": sgg_name,
+            "umdNm": r.choice(dongs),
+            "useRRRight": "",
+        }
+        if category == "offi":
+            item.update({"excluUseAr": str(area), "offiNm": f"{r.choice(_APT_NAMES)}오피스텔"})
+        else:
+            item.update({"totalFloorAr": str(area), "houseType": r.choice(["단독", "다가구"])})
+        items.append(item)
+    return items
+
+
+def _xml(tag: str, value: Any) -> str:
+    text = str(value).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return f"<{tag}>{text}</{tag}>"
+
+
+# =========================================================
+# 서버
+# =========================================================
+class _TokenBucket:
+    def __init__(self, rps: float, burst: int):
+        self.rps, self.capacity = rps, max(1, burst)
+        self.tokens, self.t = float(self.capacity), time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self) -> bool:
+        if self.rps <= 0:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.t) * self.rps)
+            self.t = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class _Service:
+    """업스트림 하나: 라우트 + 프로필(지연/제한/오류) + 요청 통계"""
+
+    def __init__(self, name: str, profile: Dict[str, Any], owner: "MockUpstreams"):
+        self.name, self.profile, self.owner = name, profile, owner
+        self.bucket = _TokenBucket(profile.get("rps", 0), profile.get("burst", 1))
+        self.lock = threading.Lock()
+        self.seen: Dict[str, int] = {}
+        self.stats = {"requests": 0, "rate_limited": 0, "errors": 0, "hangs": 0, "malformed": 0, "inflight": 0, "max_inflight": 0}
+        self.server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def plan(self, key: str) -> Tuple[random.Random, str]:
+        """요청 하나의 운명(지연 난수, 결과 종류). 같은 요청의 n번째 호출은 항상 같은 결과"""
+        with self.lock:
+            n = self.seen.get(key, 0)
+            self.seen[key] = n + 1
+        r = _rng(self.owner.seed, self.name, key, n)
+        p = self.profile
+        x = r.random()
+        if x < p.get("error_rate", 0):
+            return r, "error"
+        x -= p.get("error_rate", 0)
+        if x < p.get("hang_rate", 0):
+            return r, "hang"
+        x -= p.get("hang_rate", 0)
+        if x < p.get("malformed_rate", 0):
+            return r, "malformed"
+        return r, "ok"
+
+    def delay(self, r: random.Random) -> float:
+        median_ms, sigma = self.profile.get("latency_ms", (0, 0))
+        if median_ms <= 0 or self.owner.latency_scale <= 0:
+            return 0.0
+        return r.lognormvariate(math.log(median_ms), sigma) / 1000 * self.owner.latency_scale
+
+    def bump(self, key: str, d: int = 1) -> None:
+        with self.lock:
+            self.stats[key] += d
+            if key == "inflight":
+                self.stats["max_inflight"] = max(self.stats["max_inflight"], self.stats["inflight"])
+
+
+Response = Tuple[int, str, bytes, Dict[str, str]]
+
+
+def _json(obj: Any, status: int = 200) -> Response:
+    return status, "application/json;charset=UTF-8", json.dumps(obj, ensure_ascii=False).encode("utf-8"), {}
+
+
+def _text(body: str, status: int = 200, ctype: str = "text/html;charset=UTF-8") -> Response:
+    return status, ctype, body.encode("utf-8"), {}
+
+
+class MockUpstreams:
+    """
+    업스트림별 로컬 HTTP 서버 묶음.
+    profiles 로 업스트림별 SERVICE_PROFILES 값을 덮어쓸 수 있음 (예: {"naver": {"error_rate": 0.1}}).
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        ports: Optional[Dict[str, int]] = None,
+        seed: int = 0,
+        latency_scale: float = 1.0,
+        listing_scale: float = 1.0,
+        as_of: Optional[date] = None,
+        profiles: Optional[Dict[str, Dict[str, Any]]] = None,
+        hang_s: float = 30.0,
+    ):
+        self.host, self.seed = host, seed
+        self.latency_scale, self.listing_scale = latency_scale, listing_scale
+        self.as_of = as_of or date.today()
+        self.hang_s = hang_s
+        self.ports = ports or {}
+        self.services: Dict[str, _Service] = {}
+        for name, base in SERVICE_PROFILES.items():
+            self.services[name] = _Service(name, {**base, **(profiles or {}).get(name, {})}, self)
+        self._routes: Dict[str, Callable[[str, Dict[str, str], Dict[str, str], bytes], Response]] = {
+            "naver": self._naver,
+            "naver_front": self._naver_front,
+            "kakao": self._kakao,
+            "overpass": self._overpass,
+            "data_go_kr": self._data_go_kr,
+        }
+        self._threads: List[threading.Thread] = []
+
+    # ------------------------------------------------------------------
+    # 수명 주기
+    # ------------------------------------------------------------------
+    def start(self) -> "MockUpstreams":
+        for name, svc in self.services.items():
+            svc.server = ThreadingHTTPServer((self.host, self.ports.get(name, 0)), self._handler(svc))
+            svc.server.daemon_threads = True
+            t = threading.Thread(target=svc.server.serve_forever, name=f"mock-{name}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def stop(self) -> None:
+        for svc in self.services.values():
+            if svc.server is not None:
+                svc.server.shutdown()
+                svc.server.server_close()
+                svc.server = None
+
+    def __enter__(self) -> "MockUpstreams":
+        return self if any(s.server for s in self.services.values()) else self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def env(self) -> Dict[str, str]:
+        """클라이언트 모듈이 읽는 기본 주소 환경변수 (클라이언트 import 전에 적용)"""
+        s = self.services
+        gov = s["data_go_kr"].base_url
+        return {
+            "NAVER_LAND_BASE_URL": s["naver"].base_url,
+            "NAVER_FRONT_API_BASE_URL": s["naver_front"].base_url,
+            "KAKAO_API_BASE_URL": s["kakao"].base_url,
+            "OVERPASS_URL": f"{s['overpass'].base_url}/api/interpreter",
+            "PUBLIC_DATA_BASE_URL": gov,
+            "API_ENDPOINT_room": f"{gov}/1613000/RTMSDataSvcSHRent/getRTMSDataSvcSHRent",
+            "API_ENDPOINT_offi": f"{gov}/1613000/RTMSDataSvcOffiRent/getRTMSDataSvcOffiRent",
+        }
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {name: dict(svc.stats) for name, svc in self.services.items()}
+
+    # ------------------------------------------------------------------
+    # HTTP 처리
+    # ------------------------------------------------------------------
+    def _handler(self, svc: _Service):
+        owner = self
+        route = self._routes[svc.name]
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # 헤더/본문을 따로 쓰므로 지연 ACK 와 겹쳐 40ms씩 멈추지 않게
+
+            def log_message(self, *args):  # 요청마다 stderr 출력하지 않음
+                pass
+
+            def _handle(self, method: str) -> None:
+                parsed = urlparse(self.path)
+                params = {k: v[-1] for k, v in parse_qs(parsed.query, keep_blank_values=True).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                if method == "POST" and body:
+                    params.update({k: v[-1] for k, v in parse_qs(body.decode("utf-8"), keep_blank_values=True).items()})
+                key = f"{method} {parsed.path}?{urlencode(sorted(params.items()))}"
+
+                svc.bump("requests")
+                svc.bump("inflight")
+                try:
+                    r, fate = svc.plan(key)
+                    wait = svc.delay(r)
+                    if not svc.bucket.take():
+                        svc.bump("rate_limited")
+                        resp = owner._rate_limited(svc.name)
+                    elif fate == "error":
+                        svc.bump("errors")
+                        resp = _text("<html><body>Service Unavailable</body></html>", r.choice([500, 502, 503]))
+                    else:
+                        if fate == "hang":
+                            svc.bump("hangs")
+                            wait += owner.hang_s
+                        resp = route(parsed.path, params, dict(self.headers), body)
+                        if fate == "malformed" and resp[0] == 200:
+                            svc.bump("malformed")
+                            resp = (resp[0], resp[1], resp[2][: max(1, len(resp[2]) // 2)], resp[3])
+                    if wait > 0:
+                        time.sleep(wait)
+                    status, ctype, payload, headers = resp
+                    self.send_response(status)
+                    self.send_header("Content-Type", ctype)
+                    self.send_header("Content-Length", str(len(payload)))
+                    for k, v in headers.items():
+                        self.send_header(k, v)
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    svc.bump("inflight", -1)
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+        return Handler
+
+    @staticmethod
+    def _rate_limited(name: str) -> Response:
+        """업스트림별 요청 한도 초과 응답 형태"""
+        if name == "kakao":
+            return _json({"errorType": "RateLimitExceeded", "message": "API limit has been exceeded."}, 429)
+        if name == "overpass":
+            return _text("<html><body><p>rate_limited</p></body></html>", 429)
+        if name == "data_go_kr":
+            return _text(
+                "<OpenAPI_ServiceResponse><cmmMsgHeader><errMsg>SERVICE ERROR</errMsg>"
+                "<returnAuthMsg>LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR</returnAuthMsg>"
+                "<returnReasonCode>22</returnReasonCode></cmmMsgHeader></OpenAPI_ServiceResponse>",
+                200,
+                "text/xml;charset=UTF-8",
+            )
+        return _text("<html><body>Too Many Requests</body></html>", 429)
+
+    # ------------------------------------------------------------------
+    # 라우트
+    # ------------------------------------------------------------------
+    def _naver(self, path: str, q: Dict[str, str], headers: Dict[str, str], body: bytes) -> Response:
+        if path.startswith("/search/result/"):
+            code = REGIONS.find(unquote(path[len("/search/result/"):]))
+            if code is None:
+                return _text("<html><body>검색 결과가 없습니다.</body></html>")
+            lat, lon = REGIONS.center(code)
+            loc = f"/map/{lat}:{lon}:12:{code}/?{urlencode({'cortarNo': code, 'lat': lat, 'lon': lon})}"
+            return 302, "text/html", b"", {"Location": loc}
+        if path.startswith("/map/"):
+            return _text(f"<html><script>var filter = {{ cortarNo: '{q.get('cortarNo', '')}', lat: '{q.get('lat', '')}', lon: '{q.get('lon', '')}' }};</script></html>")
+
+        cortar_no = q.get("cortarNo", "")
+        if path == "/cluster/clusterList":
+            if not cortar_no:
+                return _json({"code": "error", "message": "cortarNo required"})
+            total = naver_region_total(cortar_no, self.listing_scale)
+            lat, lon = REGIONS.center(cortar_no)
+            # 클러스터 여러 개로 나눠 count 합 = 총 매물 수
+            r = _rng("cluster", cortar_no)
+            counts, left = [], total
+            while left > 0:
+                c = min(left, r.randint(5, 80))
+                counts.append(c)
+                left -= c
+            clusters = [
+                {"lgeo": f"{cortar_no}{i}", "count": c, "z": 12, "lat": lat + r.uniform(-0.02, 0.02), "lon": lon + r.uniform(-0.02, 0.02), "tourExist": False}
+                for i, c in enumerate(counts)
+            ]
+            return _json(
+                {
+                    "code": "success",
+                    "data": {
+                        "ARTICLE": clusters,
+                        "cortar": {"detail": {"cortarNo": cortar_no, "regionName": REGIONS.name(cortar_no).split(" ")[-1], "cortarType": "sec" if cortar_no[5:8] != "000" else "city"}},
+                    },
+                }
+            )
+        if path == "/cluster/ajax/articleList":
+            if not cortar_no:
+                return _json({"code": "error", "message": "cortarNo required"})
+            total = naver_region_total(cortar_no, self.listing_scale)
+            page = max(1, int(q.get("page") or 1))
+            start = (page - 1) * ARTICLE_PAGE_SIZE
+            end = min(start + ARTICLE_PAGE_SIZE, total)
+            body_items = [naver_article(cortar_no, i, self.as_of) for i in range(start, end)]
+            if q.get("sort") == "prc":
+                body_items.sort(key=lambda it: it["prc"])
+            return _json({"code": "success", "hasPaidPreferArticle": False, "hasArticle": total > 0, "more": end < total, "TIME": False, "z": 12, "page": page, "body": body_items})
+        if path == "/article/ajax/articleInfo" or path.startswith("/article/info/"):
+            return _text("<html><body></body></html>", 404)
+        return _json({"code": "error", "message": "not found"}, 404)
+
+    def _naver_front(self, path: str, q: Dict[str, str], headers: Dict[str, str], body: bytes) -> Response:
+        if path in ("/front-api/v1/article/galleryImages", "/api/article/galleryImages"):
+            atcl_no = q.get("articleNumber", "")
+            if not atcl_no:
+                return _json({"isSuccess": False, "detailCode": "INVALID_PARAMETER"}, 400)
+            return _json(naver_gallery(atcl_no))
+        if path == "/front-api/v1/article/basicInfo":
+            atcl_no = q.get("articleId", "")
+            if not atcl_no:
+                return _json({"isSuccess": False, "detailCode": "INVALID_PARAMETER"}, 400)
+            return _json({"isSuccess": True, "result": {"articleNumber": atcl_no, "photos": naver_gallery(atcl_no)["result"]}})
+        return _json({"isSuccess": False, "detailCode": "NOT_FOUND"}, 404)
+
+    def _kakao(self, path: str, q: Dict[str, str], headers: Dict[str, str], body: bytes) -> Response:
+        auth = headers.get("Authorization") or headers.get("authorization") or ""
+        if not auth.startswith("KakaoAK "):
+            return _json({"errorType": "AccessDeniedError", "message": "cannot find appkey"}, 401)
+        query = q.get("query", "")
+        size = max(1, min(int(q.get("size") or 15), 15))
+        if path == "/v2/local/search/keyword.json":
+            r = _rng("kakao", query)
+            total = int(r.lognormvariate(math.log(40), 1.0))
+            lat, lon = REGIONS.center(REGIONS.find_prefix(query) or "00000")
+            docs = [
+                {"id": str(r.randint(10**7, 10**9)), "place_name": f"{query.split(' ')[-1]} {i + 1}", "x": str(round(lon + r.gauss(0, 0.01), 7)), "y": str(round(lat + r.gauss(0, 0.01), 7))}
+                for i in range(min(size, total))
+            ]
+            return _json({"documents": docs, "meta": {"total_count": total, "pageable_count": min(total, 45), "is_end": total <= size}})
+        if path == "/v2/local/search/address.json":
+            code = REGIONS.find(query)
+            if code is None:
+                return _json({"documents": [], "meta": {"total_count": 0, "pageable_count": 0, "is_end": True}})
+            lat, lon = REGIONS.center(code)
+            doc = {"address_name": REGIONS.name(code), "address_type": "REGION", "x": str(lon), "y": str(lat), "address": {"b_code": code}}
+            return _json({"documents": [doc], "meta": {"total_count": 1, "pageable_count": 1, "is_end": True}})
+        return _json({"errorType": "NotFound", "message": "not found"}, 404)
+
+    def _overpass(self, path: str, q: Dict[str, str], headers: Dict[str, str], body: bytes) -> Response:
+        if path != "/api/interpreter":
+            return _text("not found", 404)
+        query = q.get("data", "")
+        if not query.strip():
+            return _text("<p><strong>Error</strong>: no query</p>", 400)
+        return _json(
+            {
+                "version": 0.6,
+                "generator": "Overpass API (mock)",
+                "osm3s": {"timestamp_osm_base": datetime.combine(self.as_of, datetime.min.time()).isoformat() + "Z"},
+                "elements": overpass_elements(query, self.seed),
+            }
+        )
+
+    def _data_go_kr(self, path: str, q: Dict[str, str], headers: Dict[str, str], body: bytes) -> Response:
+        if not q.get("serviceKey"):
+            return _text(
+                "<OpenAPI_ServiceResponse><cmmMsgHeader><errMsg>SERVICE ERROR</errMsg>"
+                "<returnAuthMsg>SERVICE_KEY_IS_NOT_REGISTERED_ERROR</returnAuthMsg>"
+                "<returnReasonCode>30</returnReasonCode></cmmMsgHeader></OpenAPI_ServiceResponse>",
+                200,
+                "text/xml;charset=UTF-8",
+            )
+        if path == "/1741000/StanReginCd/getStanReginCdList":
+            rows = REGIONS.rows()
+            page = max(1, int(q.get("pageNo") or 1))
+            per = max(1, min(int(q.get("numOfRows") or 10), 1000))
+            chunk = rows[(page - 1) * per : page * per]
+            if not chunk:
+                return _json({"RESULT": {"resultCode": "INFO-200", "resultMsg": "해당하는 데이터가 없습니다."}})
+            return _json(
+                {
+                    "StanReginCd": [
+                        {"head": [{"totalCount": len(rows)}, {"numOfRows": str(per), "pageNo": str(page), "type": "JSON"}, {"RESULT": {"resultCode": "INFO-0", "resultMsg": "NOMAL SERVICE"}}]},
+                        {
+                            "row": [
+                                {"region_cd": c, "locatadd_nm": n, "flag": "Y" if st == "존재" else "N", "sido_cd": c[:2], "sgg_cd": c[2:5], "umd_cd": c[5:8], "ri_cd": c[8:10]}
+                                for c, n, st in chunk
+                            ]
+                        },
+                    ]
+                }
+            )
+        m = re.match(r"/1613000/RTMSDataSvc(SH|Offi)Rent/getRTMSDataSvc(?:SH|Offi)Rent$", path)
+        if m:
+            items = rtms_rent_items(q.get("LAWD_CD", ""), q.get("DEAL_YMD", self.as_of.strftime("%Y%m")), "offi" if m.group(1) == "Offi" else "room")
+            xml_items = "".join("<item>" + "".join(_xml(k, v) for k, v in it.items()) + "</item>" for it in items)
+            return _text(
+                "<?xml version=\"1.0\" encoding=\"UTF-8\" standalone=\"yes\"?><response><header><resultCode>000</resultCode>"
+                f"<resultMsg>OK</resultMsg></header><body><items>{xml_items}</items><numOfRows>{max(len(items), 10)}</numOfRows>"
+                f"<pageNo>1</pageNo><totalCount>{len(items)}</totalCount></body></response>",
+                200,
+                "application/xml;charset=UTF-8",
+            )
+        return _text("<OpenAPI_ServiceResponse><cmmMsgHeader><returnReasonCode>04</returnReasonCode></cmmMsgHeader></OpenAPI_ServiceResponse>", 404, "text/xml")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="외부 API 로컬 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port-base", type=int, default=0, help="0 이면 빈 포트 자동 선택, 아니면 업스트림 순서대로 +0, +1, ...")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="지연 배율 (0 이면 지연 없음)")
+    parser.add_argument("--listing-scale", type=float, default=1.0, help="지역별 매물 수 배율")
+    parser.add_argument("--error-rate", type=float, default=None, help="모든 업스트림 5xx 비율 덮어쓰기")
+    parser.add_argument("--hang-rate", type=float, default=None, help="모든 업스트림 응답 지연(timeout 유발) 비율 덮어쓰기")
+    parser.add_argument("--no-rate-limit", action="store_true", help="요청 한도(429) 끄기")
+    args = parser.parse_args()
+
+    overrides: Dict[str, Dict[str, Any]] = {}
+    for name in SERVICE_PROFILES:
+        o: Dict[str, Any] = {}
+        if args.error_rate is not None:
+            o["error_rate"] = args.error_rate
+        if args.hang_rate is not None:
+            o["hang_rate"] = args.hang_rate
+        if args.no_rate_limit:
+            o["rps"] = 0
+        overrides[name] = o
+    ports = {name: args.port_base + i for i, name in enumerate(SERVICE_PROFILES)} if args.port_base else None
+
+    mock = MockUpstreams(
+        host=args.host, ports=ports, seed=args.seed, latency_scale=args.latency_scale,
+        listing_scale=args.listing_scale, profiles=overrides,
+    ).start()
+    print("# 아래 환경변수를 적용한 셸에서 앱/스크립트를 실행하세요 (API 키 값은 아무 문자열이면 됩니다)")
+    for k, v in mock.env().items():
+        print(f"export {k}={v}")
+    print("export KAKAO_REST_API_KEY=mock SERVICE_KEY=mock DATA_API_KEY=mock")
+    try:
+        while True:
+            time.sleep(60)
+            print(json.dumps(mock.stats(), ensure_ascii=False))
+    except KeyboardInterrupt:
+        mock.stop()
+
+
+if __name__ == "__main__":
+    main()
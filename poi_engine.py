@@ -0,0 +1,574 @@
+"""
+다중 카테고리 POI 엔진 (학교 외 인프라 전체의 좌표 단위 데이터)
+- OSM Overpass + station_code.csv 에서 인프라 카테고리별 좌표를 일괄 적재
+- numpy 배열 기반 저장소(POIStore): 위경도 float32 + 카테고리 코드 int8
+- 격자(grid) 공간 인덱스: 셀 키 정렬 + searchsorted 로 후보만 골라 거리 계산
+- count_within: 매물 전체 좌표에 대해 "반경 r(m) 내 카테고리별 개수"를 한 번에 계산
+- score_listings: 위 개수 + 최근접 역 거리로 매물별 가중 인프라 점수(0~100) 일괄 계산
+- BBoxPOILoader: 전국 POI 파일이 없을 때 검색 범위만 백그라운드에서 Overpass 로 적재 (POI_LIVE_FETCH=1, 검색은 기다리지 않음)
+
+카테고리는 scoring.py / team_explore.INFRA_COLS 와 같은 이름을 사용합니다.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import resilience
+from instrumentation import count
+from poi_schools import OVERPASS_URL
+from utils import haversine_distance_array
+
+POI_CATEGORIES = [
+    "school",
+    "subway",
+    "hospital",
+    "cafe",
+    "academy",
+    "department",
+    "convenience",
+    "culture",
+    "park",
+]
+POI_LABELS = {
+    "school": "학교",
+    "subway": "지하철",
+    "hospital": "병원",
+    "cafe": "카페",
+    "academy": "학원",
+    "department": "백화점",
+    "convenience": "편의점",
+    "culture": "문화생활",
+    "park": "공원",
+}
+
+# 카테고리별 OSM 태그 조건 (key, value). 하나라도 맞으면 해당 카테고리로 분류
+OSM_TAG_FILTERS: Dict[str, List[Tuple[str, str]]] = {
+    "school": [("amenity", "school")],
+    "subway": [("station", "subway")],
+    "hospital": [("amenity", "hospital"), ("amenity", "clinic")],
+    "cafe": [("amenity", "cafe")],
+    "academy": [("amenity", "prep_school")],
+    "department": [("shop", "department_store"), ("shop", "mall")],
+    "convenience": [("shop", "convenience")],
+    "culture": [
+        ("amenity", "cinema"),
+        ("amenity", "theatre"),
+        ("amenity", "arts_centre"),
+        ("amenity", "library"),
+        ("tourism", "museum"),
+    ],
+    "park": [("leisure", "park")],
+}
+
+# 매물 점수용 가중치 묶음 (team_explore 사이드바 가중치 슬라이더와 같은 구성)
+INFRA_WEIGHT_GROUPS: Dict[str, List[str]] = {
+    "subway": ["subway"],
+    "school": ["school", "academy"],
+    "hospital": ["hospital"],
+    "culture": ["culture"],
+    "mall": ["department"],
+}
+# 반경 내 개수가 이 값 근처면 만족도가 약 63%(1 - e^-1)에 도달하도록 하는 포화 기준
+SATURATION_COUNTS = {
+    "school": 2,
+    "subway": 1,
+    "hospital": 8,
+    "cafe": 15,
+    "academy": 10,
+    "department": 1,
+    "convenience": 6,
+    "culture": 2,
+    "park": 2,
+}
+# 역세권 점수: 최근접 역이 0m면 1, 이 거리 이상이면 0 (도보 약 12분)
+STATION_DECAY_M = 1000
+
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(__file__), "data", "poi_points.npz")
+STORE_VERSION = 1
+
+# 대한민국 전체 범위 (south, west, north, east) - 전국 일괄 적재용
+KOREA_BBOX = (33.0, 124.5, 38.7, 131.0)
+# 전국 POI 파일이 없을 때 검색 범위 POI 를 Overpass 에서 백그라운드로 받아 쓸지 (기본: 지하철역만)
+POI_LIVE_FETCH = os.getenv("POI_LIVE_FETCH", "").lower() in ("1", "true", "yes")
+
+_M_PER_DEG_LAT = 110_540.0
+_M_PER_DEG_LON_EQ = 111_320.0
+
+
+class POIStore:
+    """
+    카테고리별 POI 좌표를 배열로 보관하는 저장소.
+    - lat/lon: float32 (약 1m 정밀도), cat: int8 (POI_CATEGORIES 인덱스)
+    - names: 선택(툴팁 표시용). 대량 적재 시 생략 가능
+    격자 인덱스(질의 반경별)와 카테고리별 부분 저장소는 처음 한 번만 만들고 재사용합니다.
+    """
+
+    def __init__(
+        self,
+        lat: Sequence[float],
+        lon: Sequence[float],
+        cat: Sequence[int],
+        names: Optional[Sequence[str]] = None,
+        categories: Sequence[str] = POI_CATEGORIES,
+    ):
+        self.lat = np.ascontiguousarray(lat, dtype=np.float32)
+        self.lon = np.ascontiguousarray(lon, dtype=np.float32)
+        self.cat = np.ascontiguousarray(cat, dtype=np.int8)
+        self.names = np.asarray(names, dtype=str) if names is not None else None
+        self.categories = list(categories)
+        if not (len(self.lat) == len(self.lon) == len(self.cat)):
+            raise ValueError("lat/lon/cat 배열 길이가 서로 다릅니다.")
+
+        # 경도 1도 길이는 위도가 높을수록 짧아지므로, 데이터 최대 위도 기준으로 잡아야
+        # 투영 거리 <= 실제 거리 가 보장되어 인접 셀 탐색에서 누락이 생기지 않는다.
+        max_abs_lat = float(np.abs(self.lat).max()) + 1.0 if len(self.lat) else 38.0
+        self._m_per_deg_lon = _M_PER_DEG_LON_EQ * math.cos(math.radians(min(max_abs_lat, 89.0)))
+        self._grids: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self._category_stores: Dict[int, "POIStore"] = {}
+
+    # ------------------------------------------------------------------
+    # 생성 / 저장
+    # ------------------------------------------------------------------
+    @classmethod
+    def empty(cls) -> "POIStore":
+        return cls([], [], [])
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, object]]) -> "POIStore":
+        """[{"category": "cafe", "lat": .., "lon": .., "name": ..}, ...] → POIStore"""
+        code = {c: i for i, c in enumerate(POI_CATEGORIES)}
+        lat: List[float] = []
+        lon: List[float] = []
+        cat: List[int] = []
+        names: List[str] = []
+        for r in records:
+            c = code.get(str(r.get("category")))
+            if c is None:
+                continue
+            try:
+                r_lat = float(r["lat"])
+                r_lon = float(r["lon"])
+            except Exception:
+                continue
+            lat.append(r_lat)
+            lon.append(r_lon)
+            cat.append(c)
+            names.append(str(r.get("name", "") or ""))
+        return cls(lat, lon, cat, names)
+
+    @classmethod
+    def from_stations(cls, subway_lines: Dict[str, Dict[str, Tuple[float, float]]]) -> "POIStore":
+        """subway_data.SUBWAY_LINES 구조를 subway 카테고리 POI로 변환 (환승역 좌표 중복 제거)"""
+        seen: Dict[Tuple[float, float], str] = {}
+        for stations in subway_lines.values():
+            for name, (s_lat, s_lon) in stations.items():
+                seen.setdefault((round(s_lat, 5), round(s_lon, 5)), name)
+        code = POI_CATEGORIES.index("subway")
+        coords = list(seen.keys())
+        return cls(
+            [c[0] for c in coords],
+            [c[1] for c in coords],
+            [code] * len(coords),
+            list(seen.values()),
+        )
+
+    @classmethod
+    def concat(cls, stores: Sequence["POIStore"]) -> "POIStore":
+        stores = [s for s in stores if len(s)]
+        if not stores:
+            return cls.empty()
+        names = None
+        if all(s.names is not None for s in stores):
+            names = np.concatenate([s.names for s in stores])
+        return cls(
+            np.concatenate([s.lat for s in stores]),
+            np.concatenate([s.lon for s in stores]),
+            np.concatenate([s.cat for s in stores]),
+            names,
+        )
+
+    def save(self, path: str = DEFAULT_STORE_PATH) -> str:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        arrays = {
+            "version": np.array(STORE_VERSION),
+            "categories": np.array(self.categories),
+            "lat": self.lat,
+            "lon": self.lon,
+            "cat": self.cat,
+        }
+        if self.names is not None:
+            arrays["names"] = self.names
+        np.savez_compressed(path, **arrays)
+        return os.path.abspath(path)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_STORE_PATH) -> "POIStore":
+        with np.load(path, allow_pickle=False) as z:
+            if int(z["version"]) != STORE_VERSION:
+                raise ValueError(f"POI 저장소 버전이 다릅니다: {int(z['version'])} != {STORE_VERSION}")
+            stored = [str(c) for c in z["categories"]]
+            # 저장 당시 카테고리 순서가 달라도 현재 POI_CATEGORIES 코드로 재매핑
+            remap = np.array([POI_CATEGORIES.index(c) if c in POI_CATEGORIES else -1 for c in stored], dtype=np.int8)
+            cat = remap[z["cat"]]
+            keep = cat >= 0
+            names = z["names"][keep] if "names" in z.files else None
+            return cls(z["lat"][keep], z["lon"][keep], cat[keep], names)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    def category_counts(self) -> Dict[str, int]:
+        counts = np.bincount(self.cat, minlength=len(self.categories)) if len(self) else np.zeros(len(self.categories), int)
+        return {c: int(n) for c, n in zip(self.categories, counts)}
+
+    def subset_bbox(self, bbox: Tuple[float, float, float, float]) -> "POIStore":
+        """(south, west, north, east) 범위 안의 POI만 남긴 새 저장소"""
+        s, w, n, e = bbox
+        m = (self.lat >= s) & (self.lat <= n) & (self.lon >= w) & (self.lon <= e)
+        return POIStore(self.lat[m], self.lon[m], self.cat[m], self.names[m] if self.names is not None else None)
+
+    def _cell_keys(self, lat: np.ndarray, lon: np.ndarray, cell_m: int) -> Tuple[np.ndarray, np.ndarray]:
+        ix = np.floor(np.asarray(lon, np.float64) * self._m_per_deg_lon / cell_m).astype(np.int64)
+        iy = np.floor(np.asarray(lat, np.float64) * _M_PER_DEG_LAT / cell_m).astype(np.int64)
+        return ix, iy
+
+    def _grid(self, cell_m: int) -> Tuple[np.ndarray, np.ndarray]:
+        """cell 크기별 (정렬 순서, 정렬된 셀 키) - 최초 1회 생성 후 캐시"""
+        g = self._grids.get(cell_m)
+        if g is None:
+            ix, iy = self._cell_keys(self.lat, self.lon, cell_m)
+            keys = (ix << 32) + iy
+            order = np.argsort(keys, kind="stable")
+            g = (order, keys[order])
+            self._grids[cell_m] = g
+        return g
+
+    def _category_store(self, code: int) -> "POIStore":
+        """카테고리 하나만 담은 부분 저장소 - 최초 1회 생성 후 캐시 (격자도 부분 저장소에 함께 남음)"""
+        sub = self._category_stores.get(code)
+        if sub is None:
+            mask = self.cat == code
+            sub = self if mask.all() else POIStore(self.lat[mask], self.lon[mask], self.cat[mask], categories=self.categories)
+            self._category_stores[code] = sub
+        return sub
+
+    def _candidate_pairs(self, lat: np.ndarray, lon: np.ndarray, radius_m: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        질의 좌표별로 주변 3x3 셀에 든 POI 후보 (질의 인덱스, POI 인덱스) 쌍을 벡터 연산으로 생성.
+        cell 크기 = 반경 이므로 반경 내 POI는 반드시 3x3 셀 안에 있다.
+        """
+        cell_m = max(int(math.ceil(radius_m)), 1)
+        order, sorted_keys = self._grid(cell_m)
+        qx, qy = self._cell_keys(lat, lon, cell_m)
+        q_all: List[np.ndarray] = []
+        p_all: List[np.ndarray] = []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                keys = ((qx + dx) << 32) + (qy + dy)
+                starts = np.searchsorted(sorted_keys, keys, side="left")
+                lens = np.searchsorted(sorted_keys, keys, side="right") - starts
+                total = int(lens.sum())
+                if total == 0:
+                    continue
+                q_idx = np.repeat(np.arange(len(keys)), lens)
+                run_start = np.repeat(np.cumsum(lens) - lens, lens)
+                pos = np.repeat(starts, lens) + (np.arange(total) - run_start)
+                q_all.append(q_idx)
+                p_all.append(order[pos])
+        if not q_all:
+            return np.empty(0, np.int64), np.empty(0, np.int64)
+        return np.concatenate(q_all), np.concatenate(p_all)
+
+    def count_within(
+        self,
+        lats: Sequence[float],
+        lons: Sequence[float],
+        radius_m: float = 500,
+        *,
+        chunk_size: int = 4096,
+    ) -> np.ndarray:
+        """
+        각 질의 좌표에서 반경 radius_m(m) 안에 있는 카테고리별 POI 개수.
+        반환: (질의 수, len(POI_CATEGORIES)) int32 배열. 좌표가 NaN인 행은 0.
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        n_cat = len(self.categories)
+        out = np.zeros((len(lats), n_cat), dtype=np.int32)
+        if len(self) == 0 or len(lats) == 0:
+            return out
+
+        valid = np.flatnonzero(~(np.isnan(lats) | np.isnan(lons)))
+        # 후보 쌍 배열이 너무 커지지 않도록 질의를 chunk 단위로 나눠 처리
+        for s in range(0, len(valid), chunk_size):
+            idx = valid[s:s + chunk_size]
+            q_idx, p_idx = self._candidate_pairs(lats[idx], lons[idx], radius_m)
+            if len(q_idx) == 0:
+                continue
+            d_m = haversine_distance_array(lats[idx][q_idx], lons[idx][q_idx], self.lat[p_idx], self.lon[p_idx]) * 1000
+            hit = d_m <= radius_m
+            flat = q_idx[hit] * n_cat + self.cat[p_idx[hit]]
+            counts = np.bincount(flat, minlength=len(idx) * n_cat).reshape(len(idx), n_cat)
+            out[idx] = counts
+        return out
+
+    def count_within_frame(self, lats: Sequence[float], lons: Sequence[float], radius_m: float = 500):
+        """count_within 결과를 카테고리명을 컬럼으로 하는 DataFrame으로 반환"""
+        import pandas as pd
+
+        return pd.DataFrame(self.count_within(lats, lons, radius_m), columns=self.categories)
+
+    def nearest_distance(
+        self,
+        lats: Sequence[float],
+        lons: Sequence[float],
+        category: str,
+        max_radius_m: float = 3000,
+    ) -> np.ndarray:
+        """각 질의 좌표에서 해당 카테고리 최근접 POI까지의 거리(m). max_radius_m 밖이면 inf"""
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        out = np.full(len(lats), np.inf)
+        sub = self._category_store(self.categories.index(category))
+        if len(sub.lat) == 0 or len(lats) == 0:
+            return out
+
+        valid = np.flatnonzero(~(np.isnan(lats) | np.isnan(lons)))
+        q_idx, p_idx = sub._candidate_pairs(lats[valid], lons[valid], max_radius_m)
+        if len(q_idx) == 0:
+            return out
+        d_m = haversine_distance_array(lats[valid][q_idx], lons[valid][q_idx], sub.lat[p_idx], sub.lon[p_idx]) * 1000
+        best = np.full(len(valid), np.inf)
+        np.minimum.at(best, q_idx, d_m)
+        best[best > max_radius_m] = np.inf
+        out[valid] = best
+        return out
+
+
+def score_listings(
+    store: POIStore,
+    lats: Sequence[float],
+    lons: Sequence[float],
+    weights: Dict[str, float],
+    radius_m: float = 500,
+) -> np.ndarray:
+    """
+    매물 좌표 배열 전체에 대한 가중 인프라 점수(0~100, 소수 1자리).
+    - subway: 최근접 역까지 거리로 선형 감쇠 (STATION_DECAY_M 에서 0)
+    - 나머지: 반경 내 개수를 1 - exp(-개수/포화기준) 으로 0~1 정규화
+    - weights: INFRA_WEIGHT_GROUPS 키별 가중치. 묶음 안 카테고리는 평균
+    좌표가 없는 매물은 NaN.
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    n_cat = len(store.categories)
+
+    # 카테고리별 가중치 벡터 (묶음 가중치를 묶음 크기로 나눠 평균 효과)
+    w = np.zeros(n_cat)
+    for group, cats in INFRA_WEIGHT_GROUPS.items():
+        g_w = float(weights.get(group, 0) or 0)
+        for c in cats:
+            w[store.categories.index(c)] += g_w / len(cats)
+    w_sum = w.sum()
+    scores = np.full(len(lats), np.nan)
+    if len(lats) == 0:
+        return scores
+    if w_sum <= 0:
+        scores[~(np.isnan(lats) | np.isnan(lons))] = 0.0
+        return scores
+
+    counts = store.count_within(lats, lons, radius_m)
+    caps = np.array([SATURATION_COUNTS.get(c, 1) for c in store.categories], dtype=np.float64)
+    norm = 1.0 - np.exp(-counts / caps)
+
+    sub_i = store.categories.index("subway")
+    if w[sub_i] > 0:
+        d = store.nearest_distance(lats, lons, "subway", STATION_DECAY_M)
+        norm[:, sub_i] = np.clip(1.0 - d / STATION_DECAY_M, 0.0, 1.0)
+
+    valid = ~(np.isnan(lats) | np.isnan(lons))
+    scores[valid] = np.round(norm[valid] @ w / w_sum * 100, 1)
+    return scores
+
+
+# ----------------------------------------------------------------------
+# 적재 (OSM Overpass / 지하철역 CSV)
+# ----------------------------------------------------------------------
+def _classify_osm_tags(tags: Dict[str, str]) -> Optional[str]:
+    for category, conds in OSM_TAG_FILTERS.items():
+        for k, v in conds:
+            if tags.get(k) == v:
+                return category
+    return None
+
+
+def _overpass_bbox_query(bbox: Tuple[float, float, float, float], categories: Sequence[str]) -> str:
+    s, w, n, e = bbox
+    lines: List[str] = []
+    for category in categories:
+        for k, v in OSM_TAG_FILTERS.get(category, []):
+            lines.append(f'  nwr["{k}"="{v}"]({s},{w},{n},{e});')
+    body = "\n".join(lines)
+    return f"[out:json][timeout:180];\n(\n{body}\n);\nout center tags;\n"
+
+
+def fetch_pois_osm(
+    bbox: Tuple[float, float, float, float],
+    categories: Sequence[str] = POI_CATEGORIES,
+    *,
+    timeout: int = 180,
+) -> POIStore:
+    """
+    Overpass API 한 번 호출로 bbox(south, west, north, east) 안의 카테고리별 POI를 일괄 조회.
+    poi_schools.fetch_nearby_schools_osm과 같은 방식(out center tags)으로 좌표를 얻는다.
+    Overpass 오류는 빈 저장소 대신 resilience.UpstreamError 로 올린다.
+    """
+    query = _overpass_bbox_query(bbox, categories)
+    resp = resilience.post(OVERPASS_URL, data={"data": query}, timeout=timeout, coalesce=True)
+    data = resilience.raise_for_status(resp, "Overpass").json()
+
+    records: List[Dict[str, object]] = []
+    wanted = set(categories)
+    for el in data.get("elements", []) if isinstance(data, dict) else []:
+        if not isinstance(el, dict):
+            continue
+        tags = el.get("tags", {}) if isinstance(el.get("tags"), dict) else {}
+        category = _classify_osm_tags(tags)
+        if category is None or category not in wanted:
+            continue
+        if "lat" in el and "lon" in el:
+            el_lat, el_lon = el["lat"], el["lon"]
+        elif isinstance(el.get("center"), dict):
+            el_lat, el_lon = el["center"].get("lat"), el["center"].get("lon")
+        else:
+            continue
+        name = tags.get("name") or tags.get("name:ko") or ""
+        records.append({"category": category, "lat": el_lat, "lon": el_lon, "name": name})
+    return POIStore.from_records(records)
+
+
+def iter_bbox_tiles(
+    bbox: Tuple[float, float, float, float], tile_deg: float = 0.5
+) -> Iterable[Tuple[float, float, float, float]]:
+    """큰 범위를 Overpass 타임아웃에 걸리지 않을 크기의 타일로 분할"""
+    s, w, n, e = bbox
+    lat = s
+    while lat < n:
+        lon = w
+        while lon < e:
+            yield (lat, lon, min(lat + tile_deg, n), min(lon + tile_deg, e))
+            lon += tile_deg
+        lat += tile_deg
+
+
+def build_poi_store(
+    bbox: Tuple[float, float, float, float] = KOREA_BBOX,
+    output_path: str = DEFAULT_STORE_PATH,
+    *,
+    tile_deg: float = 0.5,
+) -> POIStore:
+    """
+    bbox 전체를 타일 단위로 Overpass에서 적재하고 지하철역 CSV와 합쳐 저장.
+    subway 카테고리는 station_code.csv(역 좌표)를 기준으로 사용한다.
+    """
+    from subway_data import SUBWAY_LINES
+
+    osm_categories = [c for c in POI_CATEGORIES if c != "subway"]
+    tiles = list(iter_bbox_tiles(bbox, tile_deg))
+    stores = [POIStore.from_stations(SUBWAY_LINES)]
+    failed = []
+    for i, tile in enumerate(tiles):
+        try:
+            stores.append(fetch_pois_osm(tile, osm_categories))
+        except resilience.UpstreamError as e:
+            failed.append(tile)
+            print(f"⚠️ 타일 {tile} 적재 실패: {e}")
+        if (i + 1) % 10 == 0 or (i + 1) == len(tiles):
+            print(f"🔄 진행 중: [{i+1}/{len(tiles)}] 타일 적재 완료...")
+
+    if failed:
+        print(f"⚠️ {len(failed)}개 타일이 빠졌습니다. 잠시 후 다시 실행하세요.")
+    store = POIStore.concat(stores)
+    path = store.save(output_path)
+    print(f"✅ POI 적재 완료: 총 {len(store)}건 → {path}")
+    print(store.category_counts())
+    return store
+
+
+class BBoxPOILoader:
+    """
+    검색 범위 bbox 의 POI 를 백그라운드 스레드 하나에서 Overpass 로 적재해 base 저장소와 합쳐 둔다.
+    get(bbox) 은 기다리지 않음: 적재가 끝났으면 합친 저장소, 아직이거나 실패했으면 적재를 걸어 두고 None.
+    끝난 결과는 ttl_s 초, 실패는 retry_s 초 동안 보관 (실패한 bbox 를 rerun 마다 다시 요청하지 않도록).
+    """
+
+    def __init__(
+        self,
+        base: POIStore,
+        *,
+        ttl_s: float = 3600,
+        retry_s: float = 60,
+        max_entries: int = 32,
+        timeout: int = 25,
+    ):
+        self.base = base
+        self.ttl_s = ttl_s
+        self.retry_s = retry_s
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="poi-bbox")
+        self._jobs: "OrderedDict[Tuple[float, float, float, float], Tuple[float, Future]]" = OrderedDict()
+
+    def _load(self, bbox: Tuple[float, float, float, float]) -> POIStore:
+        osm_categories = [c for c in POI_CATEGORIES if c != "subway"]
+        return POIStore.concat([self.base, fetch_pois_osm(bbox, osm_categories, timeout=self.timeout)])
+
+    def get(self, bbox: Tuple[float, float, float, float]) -> Optional[POIStore]:
+        now = time.monotonic()
+        with self._lock:
+            job = self._jobs.get(bbox)
+            if job is not None and job[1].done():
+                keep_s = self.retry_s if job[1].exception() is not None else self.ttl_s
+                if now - job[0] > keep_s:
+                    job = None
+            if job is None:
+                job = (now, self._pool.submit(self._load, bbox))
+                self._jobs[bbox] = job
+                while len(self._jobs) > self.max_entries:
+                    self._jobs.popitem(last=False)[1][1].cancel()
+            self._jobs.move_to_end(bbox)
+        fut = job[1]
+        if not fut.done():
+            count("poi_bbox_loads", result="pending")
+            return None
+        if fut.exception() is not None:
+            count("poi_bbox_loads", result="failed")
+            return None
+        count("poi_bbox_loads", result="ready")
+        return fut.result()
+
+
+def load_poi_store(path: str = DEFAULT_STORE_PATH) -> POIStore:
+    """저장된 POI 파일을 읽는다. 파일이 없으면 지하철역만 담긴 저장소를 반환"""
+    if os.path.exists(path):
+        return POIStore.load(path)
+    from subway_data import SUBWAY_LINES
+
+    return POIStore.from_stations(SUBWAY_LINES)
+
+
+if __name__ == "__main__":
+    build_poi_store()
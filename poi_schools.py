@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import os
 from typing import Dict, List, Optional
 
-import requests
 import streamlit as st
 
+import resilience
+from instrumentation import cached
 
-OVERPASS_URL = "https://overpass-api.de/api/interpreter"
+
+OVERPASS_URL = os.getenv("OVERPASS_URL", "https://overpass-api.de/api/interpreter")
 
 
 def _classify_school_level(name: str) -> str:
@@ -20,7 +23,7 @@ def _classify_school_level(name: str) -> str:
     return "기타"
 
 
-@st.cache_data(ttl=60 * 60, show_spinner=False)
+@cached("nearby_schools", st.cache_data(ttl=60 * 60, show_spinner=False))
 def fetch_nearby_schools_osm(
     lat: float,
     lon: float,
@@ -34,6 +37,7 @@ def fetch_nearby_schools_osm(
       '초등학교/중학교/고등학교'로 휴리스틱 분류한다.
     반환 예시:
       [{ "name": "...", "lat": 37..., "lon": 126..., "level": "초" }, ...]
+    Overpass 오류는 빈 목록 대신 resilience.UpstreamError 로 올린다 (실패 결과가 캐시되지 않게).
     """
     radius_m = int(max(100, min(radius_m, 20000)))
     limit = int(max(1, min(limit, 1000)))
@@ -48,12 +52,8 @@ def fetch_nearby_schools_osm(
     out center tags;
     """
 
-    try:
-        resp = requests.post(OVERPASS_URL, data={"data": query}, timeout=25)
-        resp.raise_for_status()
-        data = resp.json()
-    except Exception:
-        return []
+    resp = resilience.post(OVERPASS_URL, data={"data": query}, timeout=25, coalesce=True)
+    data = resilience.raise_for_status(resp, "Overpass").json()
 
     out: List[Dict[str, object]] = []
     elements = data.get("elements", []) if isinstance(data, dict) else []
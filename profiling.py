@@ -0,0 +1,237 @@
+"""
+Streamlit rerun 프로파일링 (선택 실행)
+- rerun 한 번(app.py 전체 실행)을 프로파일러로 감싸 페이지별(lobby / explore / search)로 누적
+  · sample  : 샘플링 — 스크립트 스레드의 호출 스택을 PROFILE_INTERVAL_S(기본 5ms)마다 기록.
+              부하가 작아 실제 사용 중에도 켤 수 있음. 결과는 접힌 스택(folded) 형식
+              → flamegraph.pl, speedscope, inferno 등에서 바로 플레임그래프로 열림
+  · cprofile: 결정적 — cProfile 로 모든 함수 호출 횟수/시간 기록 (부하 큼). 결과는 .pstats (snakeviz 등)
+- 켜는 방법: 환경변수 PROFILE_RERUNS=sample|cprofile (모든 세션), 또는 주소에 ?profile=sample|cprofile (그 세션만)
+  주소 ?profile= 은 PROFILE_ALLOW_QUERY=1 일 때만 받음 (아무 방문자나 cProfile/파일 기록을 켜지 못하도록)
+  PROFILE_RATE=0.1 이면 rerun 10번 중 1번 정도만 프로파일 (운영 트래픽용)
+- 출력: PROFILE_DIR(기본 profiles/)/<페이지>.folded, <페이지>.pstats — rerun 마다 누적 결과로 덮어씀
+
+사용:
+    PROFILE_RERUNS=sample streamlit run app.py
+    python profiling.py top profiles/search.folded          # 자기 시간 / 포함 시간 상위 함수
+    flamegraph.pl profiles/search.folded > search.svg       # 또는 https://www.speedscope.app 에 파일 열기
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from instrumentation import count, record_error
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(_ROOT, "profiles"))
+PROFILE_INTERVAL_S = float(os.getenv("PROFILE_INTERVAL_S", "0.005"))
+MODES = ("sample", "cprofile")
+
+_lock = threading.Lock()
+_folded: Dict[str, Counter] = {}
+_stats: Dict[str, Any] = {}  # 페이지 → pstats.Stats
+
+
+def profile_mode(query_params: Optional[Mapping[str, Any]] = None) -> Optional[str]:
+    """이번 rerun 의 프로파일 방식 (PROFILE_ALLOW_QUERY=1 이면 주소 ?profile= 우선, 없으면 PROFILE_RERUNS). 끄면 None"""
+    if os.getenv("PROFILE_ALLOW_QUERY", "").lower() not in ("1", "true", "yes"):
+        query_params = None
+    mode = str((query_params or {}).get("profile", "") or os.getenv("PROFILE_RERUNS", "")).lower()
+    if mode in ("1", "true", "yes"):
+        mode = "sample"
+    if mode not in MODES:
+        return None
+    rate = float(os.getenv("PROFILE_RATE", "1"))
+    if rate < 1 and random.random() >= rate:
+        return None
+    return mode
+
+
+# =========================================================
+# 샘플링
+# =========================================================
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _folded_stack(frame) -> str:
+    """프레임 → 'root;...;leaf'. 이 저장소 밖의 바깥쪽 프레임(Streamlit 실행기 등)은 잘라냄"""
+    codes = []
+    while frame is not None:
+        codes.append(frame.f_code)
+        frame = frame.f_back
+    codes.reverse()
+    for i, code in enumerate(codes):
+        if code.co_filename.startswith(_ROOT):
+            codes = codes[i:]
+            break
+    return ";".join(_frame_label(c) for c in codes)
+
+
+class StackSampler:
+    """대상 스레드의 호출 스택을 interval 초마다 세는 백그라운드 스레드"""
+
+    def __init__(self, thread_id: int, interval: float = PROFILE_INTERVAL_S):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rerun-sampler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                break
+            self.samples[_folded_stack(frame)] += 1
+
+    def start(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+
+# =========================================================
+# rerun 감싸기
+# =========================================================
+@contextmanager
+def profile_rerun(page: str, query_params: Optional[Mapping[str, Any]] = None) -> Iterator[Optional[str]]:
+    """
+    블록(rerun 한 번)을 프로파일해 page 별 누적 결과에 더하고 파일로 저장.
+    프로파일이 꺼져 있으면 아무것도 하지 않음. st.rerun()/st.stop() 으로 끝나도 기록
+    """
+    mode = profile_mode(query_params)
+    if mode is None:
+        yield None
+        return
+
+    profiler = sampler = None
+    if mode == "cprofile":
+        import cProfile
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:  # 다른 세션이 이미 프로파일 중 (3.12+ 는 프로세스당 하나)
+            record_error("profiling.cprofile", e)
+            profiler = None
+    else:
+        sampler = StackSampler(threading.get_ident()).start()
+
+    t0 = time.perf_counter()
+    try:
+        yield mode
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            _add_stats(page, profiler)
+        if sampler is not None:
+            _add_samples(page, sampler.stop())
+        count("profiled_reruns", page=page, mode=mode)
+        count("profiled_seconds", time.perf_counter() - t0, page=page, mode=mode)
+
+
+def _add_samples(page: str, samples: Counter) -> None:
+    with _lock:
+        agg = _folded.setdefault(page, Counter())
+        agg.update(samples)
+        lines = [f"{stack} {n}\n" for stack, n in sorted(agg.items())]
+        # 세션 스레드끼리 같은 파일을 동시에 덮어쓰지 않도록 잠금 안에서 기록
+        _write(os.path.join(PROFILE_DIR, f"{page}.folded"), "".join(lines))
+
+
+def _add_stats(page: str, profiler) -> None:
+    import pstats
+
+    with _lock:
+        if page in _stats:
+            _stats[page].add(profiler)
+        else:
+            _stats[page] = pstats.Stats(profiler)
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        path = os.path.join(PROFILE_DIR, f"{page}.pstats")
+        tmp = _tmp_path(path)
+        _stats[page].dump_stats(tmp)
+        os.replace(tmp, path)
+
+
+def _tmp_path(path: str) -> str:
+    """덮어쓰기 전 임시 파일 이름 (프로세스/스레드마다 달라 서로의 임시 파일을 치우지 않음)"""
+    return f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+
+
+def _write(path: str, body: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = _tmp_path(path)
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(body)
+    os.replace(tmp, path)
+
+
+# =========================================================
+# 결과 요약
+# =========================================================
+def load_folded(path: str) -> Counter:
+    out: Counter = Counter()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            stack, _, n = line.rstrip("\n").rpartition(" ")
+            if stack:
+                out[stack] += int(n)
+    return out
+
+
+def top_frames(samples: Counter, n: int = 20) -> Tuple[List[Tuple[str, int]], List[Tuple[str, int]]]:
+    """(자기 시간 상위, 포함 시간 상위) — 각 (함수, 샘플 수)"""
+    self_counts: Counter = Counter()
+    incl: Counter = Counter()
+    for stack, c in samples.items():
+        frames = stack.split(";")
+        self_counts[frames[-1]] += c
+        for fr in set(frames):
+            incl[fr] += c
+    return self_counts.most_common(n), incl.most_common(n)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="rerun 프로파일 결과 요약")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_top = sub.add_parser("top", help="접힌 스택(.folded) 상위 함수")
+    p_top.add_argument("path")
+    p_top.add_argument("-n", type=int, default=20)
+    p_stats = sub.add_parser("stats", help="cProfile 결과(.pstats) 누적 시간 상위 함수")
+    p_stats.add_argument("path")
+    p_stats.add_argument("-n", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.cmd == "top":
+        samples = load_folded(args.path)
+        total = sum(samples.values()) or 1
+        self_top, incl_top = top_frames(samples, args.n)
+        print(f"{args.path}: 샘플 {total}개 (약 {total * PROFILE_INTERVAL_S:.1f}s)")
+        print("\n[자기 시간]")
+        for fr, c in self_top:
+            print(f"  {c / total:6.1%}  {fr}")
+        print("\n[포함 시간]")
+        for fr, c in incl_top:
+            print(f"  {c / total:6.1%}  {fr}")
+    else:
+        import pstats
+
+        pstats.Stats(args.path).sort_stats("cumulative").print_stats(args.n)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,15 @@
-import requests
 import pandas as pd
 import os
 import time
+from urllib.parse import urlsplit
 from dotenv import load_dotenv
 
+import resilience
+
 load_dotenv()
 
 PUBLIC_DATA_API_KEY = os.getenv("SERVICE_KEY")
+PUBLIC_DATA_BASE_URL = os.getenv("PUBLIC_DATA_BASE_URL", "http://apis.data.go.kr").rstrip("/")
 
 def get_all_dongs():
     print("📡 전국 기초자치단체(시/군/구) 데이터 수집 시작...")
@@ -16,7 +19,7 @@ def get_all_dongs():
     # 기초자치단체는 전국에 약 226~250개 사이이므로 보통 1페이지로 충분하지만,
     # 안전하게 루프를 사용합니다.
     while True:
-        url = "http://apis.data.go.kr/1741000/StanReginCd/getStanReginCdList"
+        url = f"{PUBLIC_DATA_BASE_URL}/1741000/StanReginCd/getStanReginCdList"
         params = {
             "serviceKey": PUBLIC_DATA_API_KEY,
             "pageNo": page,
@@ -24,24 +27,23 @@ def get_all_dongs():
             "type": "json"
         }
 
-        try:
-            res = requests.get(url, params=params, timeout=15)
-            if res.status_code != 200:
-                print(f"❌ API 연결 실패: {res.status_code}")
-                break
-                
-            data = res.json()
-            
-            if "StanReginCd" in data and len(data["StanReginCd"]) > 1:
-                items = data["StanReginCd"][1].get("row", [])
-                if not items: 
-                    break
-                all_items.extend(items)
-                page += 1
-            else:
+        # 중간 페이지 오류를 '수집 완료'로 착각하지 않도록 실패는 UpstreamError 로 올림
+        res = resilience.get(url, params=params, timeout=15)
+        if res.status_code != 200:
+            print(f"❌ API 연결 실패: {res.status_code}")
+            raise resilience.UpstreamError(
+                urlsplit(url).netloc, f"법정동 코드 API 오류 (HTTP {res.status_code})", status=res.status_code
+            )
+
+        data = res.json()
+
+        if "StanReginCd" in data and len(data["StanReginCd"]) > 1:
+            items = data["StanReginCd"][1].get("row", [])
+            if not items:
                 break
-        except Exception as e:
-            print(f"⚠️ 수집 알림: {e}")
+            all_items.extend(items)
+            page += 1
+        else:
             break
 
     if not all_items:
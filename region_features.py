@@ -0,0 +1,291 @@
+"""
+지역 피처 행렬 (지역 탐색 페이지 공용)
+- region_rent_infra_final.csv + korea_sigungu_coordinates.csv (시군구) 또는
+  region_rent_infra_dong.csv (법정동, 중심좌표 포함) 를 한 번만 병합/정규화해
+  타입이 고정된 numpy 배열(.npy) + 코드 인덱스로 data/region_features/<level>/ 에 저장
+- 로드 시 mmap_mode="r" 로 열어 프로세스 간 페이지 캐시를 공유하고, 복사 없이 사용
+- 원본 CSV가 바뀌었거나 FEATURE_VERSION이 다르면 자동으로 다시 빌드
+
+사용:
+    python region_features.py [sigungu|dong]   # 빌드
+    feats = load_region_features()             # RegionFeatures (배열 묶음)
+    feats = load_region_features("dong")       # 법정동(동/리) 단위
+    df = feats.to_frame()              # 기존 team_explore 컬럼 구성의 DataFrame
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+FEATURE_VERSION = 1
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+FEATURE_ROOT = os.path.join(DATA_DIR, "region_features")
+
+INFRA_COLS = [
+    "school",
+    "subway",
+    "hospital",
+    "cafe",
+    "academy",
+    "department",
+    "convenience",
+    "culture",
+]
+RENT_COLS = [
+    "전세_평균보증금",
+    "전세_평균면적",
+    "전세_거래건수",
+    "월세_평균보증금",
+    "월세_평균월세",
+    "월세_평균면적",
+    "월세_거래건수",
+    "전체_거래건수",
+]
+# 인프라 심층 분석 차트용 파생 점수
+DERIVED_COLS = ["edu_score", "transport_comm_score", "life_medical_score", "면적당_보증금"]
+
+SIDO_RENAME = {"전라북도": "전북특별자치도", "강원도": "강원특별자치도"}
+
+SOURCES = {
+    "sigungu": {
+        "main": os.path.join(DATA_DIR, "region_rent_infra_final.csv"),
+        "coords": os.path.join(DATA_DIR, "korea_sigungu_coordinates.csv"),
+    },
+    "dong": {
+        "main": os.path.join(DATA_DIR, "region_rent_infra_dong.csv"),
+        "coords": os.path.join(DATA_DIR, "korea_sigungu_coordinates.csv"),
+    },
+}
+LEVEL_LABELS = {"sigungu": "시군구", "dong": "읍면동"}
+
+
+class RegionFeatures:
+    """
+    지역 단위 피처 배열 묶음. 모든 배열은 같은 행 순서를 공유한다.
+    - code: 지역 코드 문자열 (시군구 5자리 / 법정동 10자리)  / code_index: 코드 → 행 번호
+    - name, sido_idx(+ sido_names), lat, lon
+    - infra: 원시 인프라 개수 (n, len(INFRA_COLS)) / infra_norm: 0~1 min-max 정규화
+    - rent: (n, len(RENT_COLS)) / derived: (n, len(DERIVED_COLS)) / total_score
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], meta: Dict[str, object]):
+        self.meta = meta
+        self.level = str(meta["level"])
+        self.code = arrays["code"]
+        self.name = arrays["name"]
+        self.sido_idx = arrays["sido_idx"]
+        self.sido_names: List[str] = list(meta["sido_names"])
+        self.lat = arrays["lat"]
+        self.lon = arrays["lon"]
+        self.infra = arrays["infra"]
+        self.infra_norm = arrays["infra_norm"]
+        self.total_score = arrays["total_score"]
+        self.rent = arrays["rent"]
+        self.derived = arrays["derived"]
+        self.code_index: Dict[str, int] = {str(c): i for i, c in enumerate(self.code)}
+        self._frame: Optional[pd.DataFrame] = None
+
+    def __len__(self) -> int:
+        return len(self.code)
+
+    def rent_col(self, col: str) -> np.ndarray:
+        return self.rent[:, RENT_COLS.index(col)]
+
+    def sido_mask(self, sido: str) -> np.ndarray:
+        """시도명 필터 마스크 ('전국'이면 전체 True)"""
+        if sido == "전국":
+            return np.ones(len(self), dtype=bool)
+        if sido not in self.sido_names:
+            return np.zeros(len(self), dtype=bool)
+        return self.sido_idx == self.sido_names.index(sido)
+
+    def to_frame(self) -> pd.DataFrame:
+        """기존 team_explore.load_data 결과와 같은 컬럼 구성의 DataFrame (최초 1회 생성 후 재사용)"""
+        if self._frame is None:
+            cols: Dict[str, object] = {
+                "sggCd_key": self.code,
+                "region_name": self.name,
+                "full_region": self.name,
+                "sidoNm": pd.Categorical.from_codes(self.sido_idx, self.sido_names),
+                "위도": self.lat,
+                "경도": self.lon,
+                "total_score": self.total_score,
+            }
+            for i, c in enumerate(INFRA_COLS):
+                cols[c] = self.infra[:, i]
+            for i, c in enumerate(INFRA_COLS):
+                cols[f"norm_{c}"] = self.infra_norm[:, i]
+            for i, c in enumerate(RENT_COLS):
+                cols[c] = self.rent[:, i]
+            for i, c in enumerate(DERIVED_COLS):
+                cols[c] = self.derived[:, i]
+            df = pd.DataFrame(cols)
+            df["sidoNm"] = df["sidoNm"].astype(str)
+            self._frame = df
+        return self._frame
+
+
+def _source_signature(paths: Dict[str, str]) -> Dict[str, List[float]]:
+    return {k: [os.path.getsize(p), os.path.getmtime(p)] for k, p in paths.items()}
+
+
+def _build_sigungu_frame(sources: Dict[str, str]) -> pd.DataFrame:
+    main_df = pd.read_csv(sources["main"], encoding="utf-8-sig")
+    coord_df = pd.read_csv(sources["coords"], encoding="utf-8-sig")
+
+    main_df["sggCd_key"] = main_df["sigungu_code"].astype(str).str.zfill(5).str[:5]
+    coord_df["sggCd_key"] = coord_df["시군구코드"].astype(str).str.zfill(5).str[:5]
+    df = pd.merge(main_df, coord_df[["sggCd_key", "위도", "경도"]], on="sggCd_key", how="left")
+    df = df.dropna(subset=["region_name", "위도", "경도"]).reset_index(drop=True)
+
+    # 시도명: region_name 첫 토큰 (행 단위 apply 대신 벡터 문자열 연산)
+    df["sidoNm"] = df["region_name"].astype(str).str.split().str[0].replace(SIDO_RENAME)
+    return df
+
+
+def _build_dong_frame(sources: Dict[str, str]) -> pd.DataFrame:
+    main_df = pd.read_csv(sources["main"], encoding="utf-8-sig", dtype={"dong_code": str})
+    coord_df = pd.read_csv(sources["coords"], encoding="utf-8-sig")
+
+    main_df["sggCd_key"] = main_df["dong_code"].str.zfill(10)
+    # 중심좌표가 없는 법정동은 소속 시군구 중심좌표로 대체
+    coord_df["sgg5"] = coord_df["시군구코드"].astype(str).str.zfill(5).str[:5]
+    main_df["sgg5"] = main_df["sggCd_key"].str[:5]
+    fallback = main_df[["sgg5"]].merge(coord_df[["sgg5", "위도", "경도"]], on="sgg5", how="left")
+    for c in ["위도", "경도"]:
+        if c not in main_df.columns:
+            main_df[c] = np.nan
+        main_df[c] = main_df[c].where(main_df[c].notna(), fallback[c].to_numpy())
+    df = main_df.dropna(subset=["region_name", "위도", "경도"]).reset_index(drop=True)
+
+    df["sidoNm"] = df["region_name"].astype(str).str.split().str[0].replace(SIDO_RENAME)
+    return df
+
+
+_FRAME_BUILDERS = {"sigungu": _build_sigungu_frame, "dong": _build_dong_frame}
+
+
+def available_levels() -> List[str]:
+    """원본 CSV 또는 빌드된 피처 행렬이 있는 분석 단위 목록"""
+    return [
+        level
+        for level, paths in SOURCES.items()
+        if os.path.exists(paths["main"]) or os.path.exists(os.path.join(FEATURE_ROOT, level, "meta.json"))
+    ]
+
+
+def build_region_features(level: str = "sigungu", output_dir: Optional[str] = None) -> str:
+    """원본 CSV → 피처 배열(.npy) + meta.json 생성. 임시 디렉터리에 쓴 뒤 교체한다."""
+    sources = SOURCES[level]
+    output_dir = output_dir or os.path.join(FEATURE_ROOT, level)
+    df = _FRAME_BUILDERS[level](sources)
+
+    for c in INFRA_COLS + RENT_COLS + ["total_score"]:
+        if c not in df.columns:
+            df[c] = 0
+        df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0)
+
+    infra = df[INFRA_COLS].to_numpy(dtype=np.float32)
+    lo, hi = infra.min(axis=0), infra.max(axis=0)
+    span = np.where(hi > lo, hi - lo, 1.0)
+    infra_norm = np.where(hi > lo, (infra - lo) / span, 0.0).astype(np.float32)
+
+    rent = df[RENT_COLS].to_numpy(dtype=np.float64)
+    dep, area = df["전세_평균보증금"].to_numpy(), df["전세_평균면적"].to_numpy()
+    per_area = np.zeros(len(df))
+    ok = (dep > 0) & (area > 0)
+    per_area[ok] = dep[ok] / area[ok]
+    derived = np.column_stack(
+        [
+            df["school"] + df["academy"],
+            df["subway"] + df["department"],
+            df["hospital"] + df["convenience"] + df["cafe"],
+            per_area,
+        ]
+    ).astype(np.float64)
+
+    sido_names = sorted(df["sidoNm"].unique().tolist())
+    sido_idx = pd.Categorical(df["sidoNm"], categories=sido_names).codes.astype(np.int16)
+
+    arrays = {
+        "code": df["sggCd_key"].to_numpy(dtype=str),
+        "name": df["region_name"].to_numpy(dtype=str),
+        "sido_idx": sido_idx,
+        "lat": df["위도"].to_numpy(dtype=np.float64),
+        "lon": df["경도"].to_numpy(dtype=np.float64),
+        "infra": infra,
+        "infra_norm": infra_norm,
+        "total_score": df["total_score"].to_numpy(dtype=np.float32),
+        "rent": rent,
+        "derived": derived,
+    }
+    meta = {
+        "version": FEATURE_VERSION,
+        "level": level,
+        "rows": len(df),
+        "infra_cols": INFRA_COLS,
+        "rent_cols": RENT_COLS,
+        "derived_cols": DERIVED_COLS,
+        "sido_names": sido_names,
+        "sources": _source_signature(sources),
+    }
+
+    tmp_dir = f"{output_dir}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    for k, arr in arrays.items():
+        np.save(os.path.join(tmp_dir, f"{k}.npy"), arr)
+    with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.replace(tmp_dir, output_dir)
+
+    print(f"✅ 지역 피처 행렬 빌드 완료 ({level}): {len(df)}행 → {output_dir}")
+    return output_dir
+
+
+def _is_fresh(feature_dir: str, level: str) -> bool:
+    meta_path = os.path.join(feature_dir, "meta.json")
+    if not os.path.exists(meta_path):
+        return False
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+    except Exception:
+        return False
+    if meta.get("version") != FEATURE_VERSION:
+        return False
+    try:
+        return meta.get("sources") == json.loads(json.dumps(_source_signature(SOURCES[level])))
+    except OSError:
+        # 원본 CSV 없이 배포된 경우: 빌드된 행렬을 그대로 사용
+        return True
+
+
+def load_region_features(level: str = "sigungu", *, mmap: bool = True) -> RegionFeatures:
+    """피처 행렬 로드 (없거나 오래되었으면 빌드 후 로드). mmap=True면 배열을 메모리 매핑"""
+    feature_dir = os.path.join(FEATURE_ROOT, level)
+    if not _is_fresh(feature_dir, level):
+        build_region_features(level, feature_dir)
+
+    with open(os.path.join(feature_dir, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    arrays = {}
+    for name in os.listdir(feature_dir):
+        if name.endswith(".npy"):
+            arrays[name[:-4]] = np.load(os.path.join(feature_dir, name), mmap_mode="r" if mmap else None)
+    return RegionFeatures(arrays, meta)
+
+
+if __name__ == "__main__":
+    import sys
+
+    build_region_features(sys.argv[1] if len(sys.argv) > 1 else "sigungu")
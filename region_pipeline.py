@@ -1,10 +1,54 @@
 import pandas as pd
 
+from instrumentation import timed
+
+# 분석 단위별 기본 출력 경로 (sigungu: 시군구, dong: 법정동(동/리))
+SUMMARY_PATHS = {
+    "sigungu": "data/region_rent_summary.csv",
+    "dong": "data/region_rent_summary_dong.csv",
+}
+FINAL_PATHS = {
+    "sigungu": "data/region_rent_infra_final.csv",
+    "dong": "data/region_rent_infra_dong.csv",
+}
+
+
+def load_dong_codes(region_code_path="region_code.txt"):
+    """
+    region_code.txt → 법정동(동/리) 코드표
+    반환 컬럼: dong_code(10자리), region_name(법정동명), sgg_key(5자리), umd_key
+    umd_key는 실거래 데이터 umdNm과 같은 형태 ('청운동' / '화원읍 천내리')
+    """
+    try:
+        codes = pd.read_csv(region_code_path, sep="\t", encoding="utf-8", dtype=str)
+    except UnicodeDecodeError:
+        codes = pd.read_csv(region_code_path, sep="\t", encoding="cp949", dtype=str)
+    codes.columns = ["법정동코드", "법정동명", "폐지여부"]
+
+    # 존재하는 코드 중 시도/시군구 단위(뒤 5자리가 00000)는 제외
+    codes = codes[(codes["폐지여부"] == "존재") & (codes["법정동코드"].str[5:] != "00000")]
+    tokens = codes["법정동명"].str.split()
+
+    base = pd.DataFrame({
+        "dong_code": codes["법정동코드"],
+        "region_name": codes["법정동명"],
+        "sgg_key": codes["법정동코드"].str[:5],
+    })
+    # 리 단위는 '읍/면 리' 두 토큰, 동 단위는 마지막 한 토큰이 umdNm과 일치
+    two = base.assign(umd_key=tokens.str[-2] + " " + tokens.str[-1])
+    one = base.assign(umd_key=tokens.str[-1])
+    return pd.concat([two, one]).drop_duplicates(["sgg_key", "umd_key"]).reset_index(drop=True)
+
+
+@timed("region_pipeline.build_rent_summary")
 def build_rent_summary(
     rent_csv_path="data/national_rent_data_202401.csv",
-    output_summary_path="data/region_rent_summary.csv"
+    output_summary_path=None,
+    level="sigungu",
+    region_code_path="region_code.txt",
 ):
-    df = pd.read_csv(rent_csv_path, encoding="utf-8-sig")
+    output_summary_path = output_summary_path or SUMMARY_PATHS[level]
+    df = pd.read_csv(rent_csv_path, encoding="utf-8-sig", dtype={"sggCd": str})
 
     df = df.rename(columns={
         "deposit": "보증금",
@@ -54,16 +98,29 @@ def build_rent_summary(
 
     df = df.dropna(subset=numeric_cols)
 
+    group_cols = ["region_name"]
+    if level == "dong":
+        # (시군구코드, 읍면동명) → 법정동코드/법정동명 (동 또는 리 단위)
+        dong_codes = load_dong_codes(region_code_path)
+        df["sgg_key"] = df["시군구코드"].astype(str).str.zfill(5).str[:5]
+        df = df.drop(columns=["region_name"]).merge(
+            dong_codes,
+            left_on=["sgg_key", "umdNm"],
+            right_on=["sgg_key", "umd_key"],
+            how="inner",
+        )
+        group_cols = ["dong_code", "region_name"]
+
     jeonse_df = df[df["계약유형"] == "전세"]
     monthly_df = df[df["계약유형"] == "월세"]
 
-    jeonse_summary = jeonse_df.groupby("region_name", as_index=False).agg(
+    jeonse_summary = jeonse_df.groupby(group_cols, as_index=False).agg(
         전세_평균보증금=("보증금", "mean"),
         전세_평균면적=("전용면적", "mean"),
         전세_거래건수=("보증금", "count")
     )
 
-    monthly_summary = monthly_df.groupby("region_name", as_index=False).agg(
+    monthly_summary = monthly_df.groupby(group_cols, as_index=False).agg(
         월세_평균보증금=("보증금", "mean"),
         월세_평균월세=("월세", "mean"),
         월세_평균면적=("전용면적", "mean"),
@@ -73,7 +130,7 @@ def build_rent_summary(
     rent_summary = pd.merge(
         jeonse_summary,
         monthly_summary,
-        on="region_name",
+        on=group_cols,
         how="outer"
     ).fillna(0)
 
@@ -89,18 +146,29 @@ def build_rent_summary(
     return rent_summary
 
 
+@timed("region_pipeline.merge_infra_and_rent")
 def merge_infra_and_rent(
     infra_csv_path="data/전국_기초자치_인프라_점수.csv",
-    rent_summary_path="data/region_rent_summary.csv",
-    output_path="data/region_rent_infra_final.csv"
+    rent_summary_path=None,
+    output_path=None,
+    level="sigungu",
 ):
-    infra_df = pd.read_csv(infra_csv_path, encoding="utf-8-sig")
-    rent_df = pd.read_csv(rent_summary_path, encoding="utf-8-sig")
+    rent_summary_path = rent_summary_path or SUMMARY_PATHS[level]
+    output_path = output_path or FINAL_PATHS[level]
+    infra_df = pd.read_csv(infra_csv_path, encoding="utf-8-sig", dtype={"dong_code": str})
+    rent_df = pd.read_csv(rent_summary_path, encoding="utf-8-sig", dtype={"dong_code": str})
+
+    # 동 단위는 이름이 겹칠 수 있어(예: 각 구의 '신사동') 코드로 병합
+    if level == "dong":
+        rent_df = rent_df.drop(columns=["region_name"])
+        key = "dong_code"
+    else:
+        key = "region_name"
 
     merged_df = pd.merge(
         infra_df,
         rent_df,
-        on="region_name",
+        on=key,
         how="left"
     ).fillna(0)
 
@@ -112,10 +180,16 @@ def merge_infra_and_rent(
     return merged_df
 
 
-def run_region_pipeline():
-    build_rent_summary()
-    merge_infra_and_rent()
+def run_region_pipeline(level="sigungu"):
+    build_rent_summary(level=level)
+    if level == "dong":
+        merge_infra_and_rent("data/전국_법정동_인프라_점수.csv", level="dong")
+    else:
+        merge_infra_and_rent()
 
 
 if __name__ == "__main__":
-    run_region_pipeline()
\ No newline at end of file
+    import sys
+
+    # python region_pipeline.py [sigungu|dong]
+    run_region_pipeline(sys.argv[1] if len(sys.argv) > 1 else "sigungu")
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""
+지역 테마 점수 엔진 (월세 / 전세 / 인프라)
+- region_features.RegionFeatures 배열 위에서 동작, DataFrame 복사/행 단위 apply 없음
+- 설계 행렬 M = [인프라 정규화 8열 | 전세 비율 | 월세 비율] 을 한 번만 만들어 두고,
+  가중치 슬라이더 값으로 만든 가중치 행렬 W (10 x 3) 와의 곱 한 번으로 세 테마 점수를 동시에 계산
+- TOP-K 순위: partition 기반 O(n) 선택 후 K개만 정렬 (전체 정렬 없음)
+
+기존 team_explore.calculate_custom_scores 와 같은 점수 정의:
+  인프라 = Σ(norm_col × 가중치) / 가중치합 × 100   (교육 = (학교 + 학원) / 2)
+  전세/월세 = (1 - 값 / 조회 범위 내 최댓값) × 100, 값이 0이면 -1
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from region_features import INFRA_COLS, RegionFeatures
+
+THEMES = ["월세", "전세", "인프라"]
+
+# 사이드바 가중치 슬라이더 → INFRA_COLS 열 (교육 가중치는 학교/학원에 반씩)
+WEIGHT_COLUMNS = {
+    "subway": {"subway": 1.0},
+    "school": {"school": 0.5, "academy": 0.5},
+    "hospital": {"hospital": 1.0},
+    "culture": {"culture": 1.0},
+    "mall": {"department": 1.0},
+}
+
+
+def infra_weight_vector(weights: Dict[str, float]) -> np.ndarray:
+    """{"subway": 5, "school": 4, ...} → INFRA_COLS 길이의 가중치 벡터"""
+    w = np.zeros(len(INFRA_COLS))
+    for key, cols in WEIGHT_COLUMNS.items():
+        g = float(weights.get(key, 0) or 0)
+        for col, share in cols.items():
+            w[INFRA_COLS.index(col)] += g * share
+    return w
+
+
+def top_k(
+    values: Sequence[float],
+    k: int,
+    *,
+    largest: bool = True,
+    valid: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    values 에서 상위(largest=True) 또는 하위 k개의 위치를 순위 순서대로 반환.
+    valid 마스크가 주어지면 True 인 위치만 후보(NaN 제외). 동점은 위치가 앞선 쪽이 먼저.
+    np.partition(O(n)) 으로 k개를 고른 뒤 그 k개만 정렬한다.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    mask = ~np.isnan(values) if valid is None else (np.asarray(valid, dtype=bool) & ~np.isnan(values))
+    idx = np.flatnonzero(mask)
+    if k <= 0 or len(idx) == 0:
+        return np.empty(0, dtype=np.intp)
+    key = -values[idx] if largest else values[idx]
+    if k < len(idx):
+        # k번째 값 경계의 동점은 위치 순으로 채워 sort_values(kind="stable").head(k)와 같은 결과
+        kth = np.partition(key, k - 1)[k - 1]
+        less = np.flatnonzero(key < kth)
+        ties = np.flatnonzero(key == kth)[: k - len(less)]
+        part = np.concatenate([less, ties])
+    else:
+        part = np.arange(len(idx))
+    order = part[np.lexsort((idx[part], key[part]))]
+    return idx[order]
+
+
+def top_k_frame(df, col: str, k: int, *, largest: bool = True, positive_only: bool = False):
+    """df.sort_values(col).head(k) 대체: col 기준 TOP-K 행을 순위 순서로 반환"""
+    vals = df[col].to_numpy(dtype=np.float64)
+    return df.iloc[top_k(vals, k, largest=largest, valid=vals > 0 if positive_only else None)]
+
+
+class ThemeScorer:
+    """
+    피처 행렬 하나에 대해 설계 행렬을 미리 만들어 두는 점수기.
+    score()는 (가중치, 조회 행) 만 바꿔 호출하므로 슬라이더를 움직일 때마다 행렬곱 한 번이면 된다.
+    """
+
+    def __init__(self, feats: RegionFeatures):
+        self.feats = feats
+        n_infra = len(INFRA_COLS)
+        jeonse = np.asarray(feats.rent_col("전세_평균보증금"), dtype=np.float64)
+        monthly = np.asarray(feats.rent_col("월세_평균월세"), dtype=np.float64)
+        self._jeonse_max = float(jeonse.max()) if len(jeonse) and jeonse.max() > 0 else 1.0
+        self._monthly_max = float(monthly.max()) if len(monthly) and monthly.max() > 0 else 1.0
+
+        m = np.empty((len(feats), n_infra + 2), dtype=np.float64)
+        m[:, :n_infra] = feats.infra_norm
+        m[:, n_infra] = jeonse / self._jeonse_max
+        m[:, n_infra + 1] = monthly / self._monthly_max
+        self.design = m
+        self.jeonse = jeonse
+        self.monthly = monthly
+
+    def score(
+        self,
+        weights: Dict[str, float],
+        rows: Optional[Sequence[int]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        rows(행 번호 배열, None이면 전체) 범위의 세 테마 점수를 반환.
+        반환: {"월세": arr, "전세": arr, "인프라": arr} (rows 순서, 소수 1자리)
+        """
+        rows = np.arange(len(self.feats)) if rows is None else np.asarray(rows, dtype=np.intp)
+        n_infra = len(INFRA_COLS)
+        jeonse = self.jeonse[rows]
+        monthly = self.monthly[rows]
+
+        # 조회 범위 최댓값 기준으로 비율을 다시 스케일: x/max_sub = (x/max_all) × (max_all/max_sub)
+        j_max = jeonse.max() if (jeonse > 0).any() else 0.0
+        m_max = monthly.max() if (monthly > 0).any() else 0.0
+
+        w = infra_weight_vector(weights)
+        w_sum = w.sum()
+        W = np.zeros((n_infra + 2, 3))
+        bias = np.zeros(3)
+        if w_sum > 0:
+            W[:n_infra, 2] = w / w_sum * 100
+        if j_max > 0:
+            W[n_infra, 1] = -100 * self._jeonse_max / j_max
+            bias[1] = 100
+        if m_max > 0:
+            W[n_infra + 1, 0] = -100 * self._monthly_max / m_max
+            bias[0] = 100
+
+        s = self.design[rows] @ W + bias
+        np.round(s, 1, out=s)
+        s[:, 0][monthly <= 0] = -1.0
+        s[:, 1][jeonse <= 0] = -1.0
+        return {"월세": s[:, 0], "전세": s[:, 1], "인프라": s[:, 2]}
+
+    def top_rows(
+        self,
+        theme: str,
+        weights: Dict[str, float],
+        rows: Optional[Sequence[int]] = None,
+        k: int = 5,
+    ) -> np.ndarray:
+        """
+        테마별 TOP-K 행 번호(피처 행렬 기준).
+        월세/전세는 금액이 0보다 큰 지역 중 낮은 순, 인프라는 점수 높은 순.
+        """
+        rows = np.arange(len(self.feats)) if rows is None else np.asarray(rows, dtype=np.intp)
+        if theme == "월세":
+            vals = self.monthly[rows]
+            pos = top_k(vals, k, largest=False, valid=vals > 0)
+        elif theme == "전세":
+            vals = self.jeonse[rows]
+            pos = top_k(vals, k, largest=False, valid=vals > 0)
+        else:
+            pos = top_k(self.score(weights, rows)["인프라"], k)
+        return rows[pos]
@@ -0,0 +1,351 @@
+"""
+외부 API 호출 복원력 (재시도 / 백오프 / 호스트별 차단기)
+- request(method, url, ...): requests.request 와 같은 인자. 일시 오류(연결 실패, 429, 5xx)만 최대 RetryPolicy.attempts 번 시도
+  · 재시도 간격: 지수 백오프 + 전체 지터(0 ~ base·2^n, max_delay 상한). 429/503 의 Retry-After 는 max_retry_after 까지 따름
+  · 시간 예산(deadline, 기본 = 읽기 타임아웃): 다음 시도가 예산을 넘기면 더 기다리지 않음
+    → 응답 없는 서버(읽기 타임아웃)는 재시도하지 않고, 즉시 실패(연결 거부, 5xx)만 재시도
+- 호스트별 차단기(CircuitBreaker): 연속 실패 failure_threshold 번이면 열림(open) → reset_timeout 초 동안 요청 없이 즉시 실패,
+  이후 반열림(half-open)에서 요청 하나만 시험해 성공하면 닫힘. 장애 중인 외부 서비스가 rerun 마다 타임아웃을 쌓지 않게
+- 실패는 UpstreamError(차단 중이면 CircuitOpenError)로 올림 → 호출하는 쪽에서 "오류"와 "결과 0건"을 구분할 수 있음
+  재시도 대상이 아닌 응답(200, 404 등)은 그대로 돌려주므로 상태 코드 해석은 호출하는 쪽 몫
+  (2xx 만 받을 곳은 raise_for_status(resp) — requests.HTTPError 대신 UpstreamError)
+- 요청 합치기(coalesce=True): 같은 요청(메서드 + 최종 URL + 본문)이 이미 진행 중이면 새로 보내지 않고 그 결과(응답/예외)를 함께 받음
+  → 여러 세션이 같은 지역/매물을 동시에 열어도 외부 호출은 한 번 (재시도·요청 간격 대기도 먼저 보낸 쪽만)
+- 계측: upstream_retries{host, reason}, upstream_failures{host}, upstream_fast_fails{host}, circuit_transitions{host, state},
+  upstream_coalesced{host}
+
+사용:
+    resp = resilience.get(url, params=params, headers=headers, timeout=15)
+    resp = resilience.post(OVERPASS_URL, data={"data": query}, timeout=25, policy=resilience.RetryPolicy(attempts=2))
+    resp = resilience.get(url, headers=headers, timeout=15, coalesce=True)   # 동시에 같은 요청이면 한 번만
+    data = resilience.raise_for_status(resp).json()
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Hashable, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+
+from instrumentation import count, span
+
+# 다시 시도하면 성공할 수 있는 응답 (429 는 차단기 실패로 세지 않음: 서버는 살아 있고 속도만 제한)
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+BREAKER_STATUS = frozenset({500, 502, 503, 504})
+CONNECT_TIMEOUT = 3.05  # 연결 단계 타임아웃 (읽기 타임아웃은 호출하는 쪽 timeout)
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class UpstreamError(RuntimeError):
+    """외부 서비스 호출 실패 (재시도 소진 또는 차단 중). str() 은 화면에 그대로 보여줄 수 있는 문장"""
+
+    def __init__(self, host: str, message: str, *, status: Optional[int] = None, cause: Optional[BaseException] = None):
+        super().__init__(message)
+        self.host = host
+        self.status = status
+        self.cause = cause
+
+
+class CircuitOpenError(UpstreamError):
+    """차단기가 열려 요청을 보내지 않고 바로 실패"""
+
+
+class RetryPolicy:
+    """재시도 횟수 / 백오프 / 시간 예산"""
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        base_delay: float = 0.25,
+        max_delay: float = 2.0,
+        max_retry_after: float = 5.0,
+        deadline: Optional[float] = None,
+    ):
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.deadline = deadline
+
+    def delay(self, retry: int, resp: Optional[requests.Response] = None) -> float:
+        """retry 번째(0부터) 재시도 전 대기 시간. Retry-After 가 있으면 그 값(상한 max_retry_after)"""
+        retry_after = _retry_after(resp) if resp is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** retry)))
+
+
+DEFAULT_POLICY = RetryPolicy()
+
+
+def _retry_after(resp: requests.Response) -> Optional[float]:
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# =========================================================
+# 차단기
+# =========================================================
+class CircuitBreaker:
+    """호스트 하나의 차단기 (closed → open → half_open → closed)"""
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, host: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def _set(self, state: str) -> None:
+        if state != self.state:
+            self.state = state
+            count("circuit_transitions", host=self.host, state=state)
+
+    def retry_in(self) -> float:
+        """열린 차단기가 시험 요청을 허용하기까지 남은 초"""
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """요청을 보내도 되는지. 반열림 상태에서는 시험 요청 하나만 허용"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if self.retry_in() > 0:
+                    return False
+                self._set(self.HALF_OPEN)
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def release(self) -> None:
+        """시험 요청이 성공/실패 판정 없이 끝났을 때(잘못된 요청 등) 다음 시험을 허용"""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            self._set(self.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self._set(self.OPEN)
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker_for(host: str) -> CircuitBreaker:
+    with _breakers_lock:
+        b = _breakers.get(host)
+        if b is None:
+            b = _breakers[host] = CircuitBreaker(host)
+        return b
+
+
+def breaker_states() -> Dict[str, str]:
+    """{호스트: 상태} (디버그/상태 표시용)"""
+    with _breakers_lock:
+        return {host: b.state for host, b in _breakers.items()}
+
+
+def reset_breakers() -> None:
+    with _breakers_lock:
+        _breakers.clear()
+
+
+# =========================================================
+# 요청 합치기 (single-flight)
+# =========================================================
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[requests.Response] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """같은 키의 호출이 진행 중이면 기다렸다가 그 결과를 공유 (끝난 결과는 보관하지 않음 — 캐시가 아님)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], requests.Response], host: str = "") -> requests.Response:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            count("upstream_coalesced", host=host)
+            with span(f"HTTP {host} (합쳐진 요청 대기)"):
+                flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+
+_single_flight = SingleFlight()
+
+
+def _flight_key(method: str, url: str, kwargs: Dict) -> Tuple[str, str, Optional[bytes]]:
+    """(메서드, 쿼리 포함 최종 URL, 본문). 헤더는 키에 넣지 않음 (같은 요청에 같은 헤더를 쓰는 호출만 coalesce=True)"""
+    prepared = requests.Request(
+        method, url, params=kwargs.get("params"), data=kwargs.get("data"), json=kwargs.get("json")
+    ).prepare()
+    body = prepared.body.encode() if isinstance(prepared.body, str) else prepared.body
+    return method.upper(), prepared.url, body
+
+
+# =========================================================
+# 요청
+# =========================================================
+def _split_timeout(timeout: Optional[Timeout]) -> Tuple[float, float]:
+    if isinstance(timeout, tuple):
+        return timeout
+    read = float(timeout) if timeout is not None else 15.0
+    return (min(CONNECT_TIMEOUT, read), read)
+
+
+def request(
+    method: str,
+    url: str,
+    *,
+    policy: Optional[RetryPolicy] = None,
+    before_attempt: Optional[Callable[[], None]] = None,
+    timeout: Optional[Timeout] = None,
+    coalesce: bool = False,
+    **kwargs,
+) -> requests.Response:
+    """
+    재시도/차단기를 거친 requests.request. 재시도 대상이 아닌 응답은 상태 코드와 무관하게 반환
+    - before_attempt: 매 시도 직전에 부름 (요청 간격 제한 rate_limited 등)
+    - coalesce: 같은 요청이 진행 중이면 그 응답 객체를 함께 받음 (읽기 전용으로만 쓸 것: .json(), .text, .status_code)
+    - 재시도를 다 써도 실패하면 UpstreamError, 차단기가 열려 있으면 CircuitOpenError
+    """
+    if coalesce:
+        key = _flight_key(method, url, kwargs)
+        return _single_flight.do(
+            key,
+            lambda: _request(method, url, policy=policy, before_attempt=before_attempt, timeout=timeout, **kwargs),
+            host=urlsplit(url).netloc,
+        )
+    return _request(method, url, policy=policy, before_attempt=before_attempt, timeout=timeout, **kwargs)
+
+
+def _request(
+    method: str,
+    url: str,
+    *,
+    policy: Optional[RetryPolicy],
+    before_attempt: Optional[Callable[[], None]],
+    timeout: Optional[Timeout],
+    **kwargs,
+) -> requests.Response:
+    policy = policy or DEFAULT_POLICY
+    host = urlsplit(url).netloc
+    breaker = breaker_for(host)
+    timeout = _split_timeout(timeout)
+    deadline = time.monotonic() + (policy.deadline if policy.deadline is not None else timeout[1])
+
+    status: Optional[int] = None
+    cause: Optional[BaseException] = None
+    for attempt in range(policy.attempts):
+        if not breaker.allow():
+            count("upstream_fast_fails", host=host)
+            raise CircuitOpenError(
+                host, f"{host} 응답 장애로 잠시 요청을 멈췄습니다 ({breaker.retry_in():.0f}초 후 다시 시도)", cause=cause
+            )
+        if before_attempt is not None:
+            before_attempt()
+        resp: Optional[requests.Response] = None
+        try:
+            resp = requests.request(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            breaker.record_failure()
+            status, cause, reason = None, e, type(e).__name__
+        except Exception:
+            breaker.release()
+            raise
+        else:
+            if resp.status_code not in RETRY_STATUS:
+                breaker.record_success()
+                return resp
+            if resp.status_code in BREAKER_STATUS:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            status, cause, reason = resp.status_code, None, f"HTTP{resp.status_code}"
+
+        if attempt + 1 >= policy.attempts:
+            break
+        wait = policy.delay(attempt, resp)
+        if time.monotonic() + wait >= deadline:
+            break
+        count("upstream_retries", host=host, reason=reason)
+        time.sleep(wait)
+
+    count("upstream_failures", host=host)
+    detail = f"HTTP {status}" if status is not None else type(cause).__name__
+    raise UpstreamError(host, f"{host} 요청 실패 ({detail}, {attempt + 1}회 시도)", status=status, cause=cause)
+
+
+def raise_for_status(resp: requests.Response, service: Optional[str] = None) -> requests.Response:
+    """재시도 대상이 아닌 오류 응답(400/403/404 등)도 UpstreamError 로 (requests.HTTPError 대신). 2xx 면 resp 그대로"""
+    if 200 <= resp.status_code < 300:
+        return resp
+    host = urlsplit(resp.url).netloc if resp.url else ""
+    raise UpstreamError(host, f"{service or host} 오류 (HTTP {resp.status_code})", status=resp.status_code)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
@@ -1,24 +1,34 @@
 """
 네이버 부동산 API 스크래퍼 (정리본 + 이미지 크롤링)
 - clusterList: 지도/지역 범위 내 매물 클러스터 및 totCnt 계산
-- articleList: 매물 목록 (페이지네이션)
+- articleList: 매물 목록 (페이지네이션, 매물 JSON → article_record.ArticleRecord)
+- iter_article_pages: 매물 목록을 페이지 단위로 내보내는 생성기 (받은 만큼만 메모리에, 선택적으로 몇 페이지 미리 받기)
 - get_article_image_urls: 매물 코드(atclNo)로 상세 페이지 이미지 URL 목록 조회
+- scrape_regions: 여러 지역을 동시에 수집 (모든 스레드가 하나의 요청 간격 예산을 공유)
+- 모든 호출은 resilience 를 거침 (재시도/차단기). 여러 세션이 같은 목록/사진을 동시에 요청하면 한 번만 보냄(coalesce)
 """
 
 import os
+import queue
 import re
+import threading
 import time
-from typing import Optional, List, Tuple, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Tuple, Dict, Any, Callable, Iterator, Mapping, Sequence
 from urllib.parse import urlencode, urlparse, parse_qs, urlunparse
 
-import requests
+import resilience
+from article_record import ArticleRecord, records_from_json
+from instrumentation import count, propagate, record_error
+from resilience import UpstreamError
 
-BASE_URL = "https://m.land.naver.com"
+# 엔드포인트 기본 주소는 환경변수로 바꿀 수 있음 (로컬 대역 서버: mock_servers.py)
+BASE_URL = os.getenv("NAVER_LAND_BASE_URL", "https://m.land.naver.com").rstrip("/")
 CLUSTER_LIST_URL = f"{BASE_URL}/cluster/clusterList"
 ARTICLE_LIST_URL = f"{BASE_URL}/cluster/ajax/articleList"
 
 # 상세 정보(이미지 포함)는 fin.land.naver.com Front API 사용 (일부 매물은 galleryImages/api만 동작)
-FRONT_API_BASE = "https://fin.land.naver.com"
+FRONT_API_BASE = os.getenv("NAVER_FRONT_API_BASE_URL", "https://fin.land.naver.com").rstrip("/")
 ARTICLE_BASIC_INFO_URL = f"{FRONT_API_BASE}/front-api/v1/article/basicInfo"
 ARTICLE_GALLERY_IMAGES_URL = f"{FRONT_API_BASE}/front-api/v1/article/galleryImages"
 
@@ -26,7 +36,24 @@ ARTICLE_GALLERY_IMAGES_URL = f"{FRONT_API_BASE}/front-api/v1/article/galleryImag
 RLET_TP_CD = "OR:APT:JGC:OPST:ABYG:OBYG:VL:YR:DSD:JWJT:SGJT:DDDGG"
 TRAD_TP_CD = "B1:B2:B3"
 
-REQUEST_DELAY = 0.8  # 차단 방지
+REQUEST_DELAY = 0.8  # 차단 방지 (프로세스 전체에서 m.land 요청 사이 최소 간격)
+
+_rate_lock = threading.Lock()
+_last_request_time = 0.0
+
+
+def rate_limited():
+    """
+    m.land 요청 전에 호출. 스레드가 여러 개여도 요청 사이 간격이 REQUEST_DELAY 이상이 되도록 대기
+    (동시 수집 시에도 차단 방지용 요청 속도는 단일 수집과 같음)
+    """
+    global _last_request_time
+    with _rate_lock:
+        now = time.time()
+        elapsed = now - _last_request_time
+        if elapsed < REQUEST_DELAY:
+            time.sleep(REQUEST_DELAY - elapsed)
+        _last_request_time = time.time()
 
 
 def _headers() -> Dict[str, str]:
@@ -85,7 +112,8 @@ def _thumbnail_to_full_size_url(url: str) -> str:
         q.pop("udate", None)
         new_query = urlencode(q, doseq=True)
         return urlunparse((parsed.scheme, parsed.netloc, parsed.path, parsed.params, new_query, parsed.fragment))
-    except Exception:
+    except Exception as e:
+        record_error("scraper.thumbnail_url", e)
         return u
 
 
@@ -185,7 +213,7 @@ def fetch_article_gallery_images(article_id: str) -> List[str]:
     ]
     for url in candidates:
         try:
-            resp = requests.get(url, params=params, headers=_front_headers(), timeout=12)
+            resp = resilience.get(url, params=params, headers=_front_headers(), timeout=12, coalesce=True)
             if resp.status_code != 200:
                 continue
             data = resp.json()
@@ -196,7 +224,10 @@ def fetch_article_gallery_images(article_id: str) -> List[str]:
                 return [_thumbnail_to_full_size_url(u) for u in urls]
             if data.get("isSuccess") is False:
                 continue
-        except Exception:
+        except UpstreamError:
+            raise
+        except Exception as e:
+            record_error("scraper.gallery_images", e)
             continue
     return []
 
@@ -214,7 +245,7 @@ def fetch_article_basic_info(
     if not article_id or not real_estate_type or not trade_type:
         return None
     try:
-        resp = requests.get(
+        resp = resilience.get(
             ARTICLE_BASIC_INFO_URL,
             params={
                 "articleId": article_id,
@@ -223,14 +254,17 @@ def fetch_article_basic_info(
             },
             headers=_front_headers(),
             timeout=12,
+            coalesce=True,
         )
         if resp.status_code != 200:
             return None
         data = resp.json()
         if isinstance(data, dict) and data.get("isSuccess") and isinstance(data.get("result"), dict):
             return data["result"]
-    except Exception:
-        pass
+    except UpstreamError:
+        raise
+    except Exception as e:
+        record_error("scraper.basic_info", e)
     return None
 
 
@@ -247,31 +281,46 @@ def get_article_image_urls(
     - galleryImages / basicInfo API는 실패할 수 있고
     - 이 함수는 "가능하면" 방 사진(원본/갤러리)을 가져오는 용도입니다.
     확실한 대표 썸네일은 목록 API의 repImgUrl을 사용하는 것이 안전합니다.
+    시도한 경로가 모두 외부 서비스 오류(UpstreamError)로 실패하면 빈 목록 대신 마지막 오류를 올립니다
+    (빈 목록 = 응답은 받았지만 사진이 없음).
     """
     if not atcl_no:
         return []
     atcl_no = str(atcl_no).strip()
+    tried = 0
+    errors: List[UpstreamError] = []
 
     # 1) fin.land galleryImages API (매물번호만으로 이미지 목록 조회, 우선 시도)
-    urls = fetch_article_gallery_images(atcl_no)
-    if urls:
-        return urls
+    tried += 1
+    try:
+        urls = fetch_article_gallery_images(atcl_no)
+        if urls:
+            return urls
+    except UpstreamError as e:
+        errors.append(e)
 
     # 2) fin.land basicInfo API (상세 정보에서 이미지 추출, 매물/거래 유형 코드 필요)
     if rlet_tp_cd and trad_tp_cd:
-        result = fetch_article_basic_info(atcl_no, rlet_tp_cd, trad_tp_cd)
+        tried += 1
+        try:
+            result = fetch_article_basic_info(atcl_no, rlet_tp_cd, trad_tp_cd)
+        except UpstreamError as e:
+            errors.append(e)
+            result = None
         if result:
             urls = _extract_image_urls_from_json(result)
             if urls:
                 return [_thumbnail_to_full_size_url(u) for u in dict.fromkeys(urls)]
 
     # 3) m.land articleInfo/ajax 시도
+    tried += 1
     try:
-        resp = requests.get(
+        resp = resilience.get(
             f"{BASE_URL}/article/ajax/articleInfo",
             params={"articleNo": atcl_no},
             headers={**_headers(), "Accept": "application/json, text/plain, */*"},
             timeout=10,
+            coalesce=True,
         )
         if resp.status_code == 200:
             data = resp.json()
@@ -306,19 +355,26 @@ def get_article_image_urls(
                     urls = _extract_image_urls_from_html(body)
                     if urls:
                         return [_thumbnail_to_full_size_url(u) for u in urls]
-    except Exception:
-        pass
+    except UpstreamError as e:
+        errors.append(e)
+    except Exception as e:
+        record_error("scraper.article_info", e)
 
     # 4) m.land 상세 페이지 HTML에서 직접 img src 추출
+    tried += 1
     try:
-        resp = requests.get(f"{BASE_URL}/article/info/{atcl_no}", headers=_headers(), timeout=10)
+        resp = resilience.get(f"{BASE_URL}/article/info/{atcl_no}", headers=_headers(), timeout=10, coalesce=True)
         if resp.status_code == 200:
             urls = _extract_image_urls_from_html(resp.text)
             if urls:
                 return [_thumbnail_to_full_size_url(u) for u in urls]
-    except Exception:
-        pass
+    except UpstreamError as e:
+        errors.append(e)
+    except Exception as e:
+        record_error("scraper.article_html", e)
 
+    if errors and len(errors) == tried:
+        raise errors[-1]
     return []
 
 
@@ -357,7 +413,7 @@ def fetch_cluster_list(cortar_no: str, lat: float, lon: float, z: int = 12) -> D
     }
 
     url = f"{CLUSTER_LIST_URL}?{urlencode(params)}"
-    resp = requests.get(url, headers=_headers(), timeout=15)
+    resp = resilience.get(url, headers=_headers(), timeout=15, before_attempt=rate_limited, coalesce=True)
     resp.raise_for_status()
     data = resp.json()
 
@@ -396,8 +452,9 @@ def fetch_article_list(
     top: Optional[float] = None,
     rgt: Optional[float] = None,
     z: int = 12,
+    sort: Optional[str] = None,
 ) -> Dict[str, Any]:
-    """articleList 호출"""
+    """articleList 호출 (sort="dates" 면 확인일자 최신순). body 는 ArticleRecord 목록"""
     if btm is None:
         btm, lft, top, rgt = calc_bounds(lat, lon, z)
 
@@ -416,9 +473,11 @@ def fetch_article_list(
         "cortarNo": cortar_no,
         "page": page,
     }
+    if sort:
+        params["sort"] = sort
 
     url = f"{ARTICLE_LIST_URL}?{urlencode(params)}"
-    resp = requests.get(url, headers=_headers(), timeout=15)
+    resp = resilience.get(url, headers=_headers(), timeout=15, before_attempt=rate_limited, coalesce=True)
     resp.raise_for_status()
     data = resp.json()
 
@@ -426,43 +485,47 @@ def fetch_article_list(
         raise RuntimeError(f"articleList API 오류: {data.get('code', 'unknown')}")
 
     return {
-        "body": data.get("body", []),
+        # 매물 JSON 은 필요한 필드만 남긴 ArticleRecord 로 바로 변환 (원본 dict 는 보관하지 않음)
+        "body": records_from_json(data.get("body") or []),
         "more": data.get("more", False),
         "page": data.get("page", page),
     }
 
 
-def scrape_articles(
+def iter_article_pages(
     cortar_no: str,
     lat: float,
     lon: float,
-    limit: int = 50,
-    progress_callback=None,
+    limit: Optional[int] = None,
+    sort: Optional[str] = None,
+    bounds: Optional[Tuple[float, float, float, float]] = None,
+    cluster: Optional[Dict[str, Any]] = None,
     cancel_check=None,
-) -> List[Dict[str, Any]]:
+    prefetch: int = 0,
+) -> Iterator[List[ArticleRecord]]:
     """
-    clusterList → articleList 순서로 매물 수집
-    - limit 만큼만 모이면 중단(빠른 UI용)
+    clusterList → articleList 결과를 페이지(ArticleRecord 목록) 단위로 내보내는 생성기
+    - 다음 페이지는 소비하는 쪽이 꺼낼 때 요청 (그만 꺼내면 더 요청하지 않음) → 받은 만큼만 메모리에 둠
+    - limit: 전체 매물 수 상한 (마지막 페이지는 잘라서 내보냄). None 이면 끝까지
+    - cluster: 이미 받은 fetch_cluster_list 결과 (총 건수를 먼저 알아야 하는 호출용)
+    - prefetch=n 이면 백그라운드 스레드가 최대 n 페이지까지 미리 받아 둠 (큐가 차면 대기)
     """
-    time.sleep(REQUEST_DELAY)
-    cluster = fetch_cluster_list(cortar_no, lat, lon)
-    tot_cnt = cluster["tot_cnt"]
-    btm, lft, top, rgt = cluster["btm"], cluster["lft"], cluster["top"], cluster["rgt"]
+    pages = _article_pages(cortar_no, lat, lon, limit, sort, bounds, cluster, cancel_check)
+    return _prefetched(pages, prefetch) if prefetch > 0 else pages
+
 
+def _article_pages(cortar_no, lat, lon, limit, sort, bounds, cluster, cancel_check) -> Iterator[List[ArticleRecord]]:
+    cluster = cluster or fetch_cluster_list(cortar_no, lat, lon)
+    tot_cnt = cluster["tot_cnt"]
+    btm, lft, top, rgt = bounds or (cluster["btm"], cluster["lft"], cluster["top"], cluster["rgt"])
     if tot_cnt == 0:
-        return []
+        return
 
-    all_items: List[Dict[str, Any]] = []
+    remaining = limit if limit is not None else float("inf")
     page = 1
-
-    if progress_callback:
-        progress_callback(0, min(tot_cnt, limit), "매물 수집 시작...")
-
-    while True:
+    while remaining > 0:
         if cancel_check and cancel_check():
-            break
-
-        time.sleep(REQUEST_DELAY)
+            return
         result = fetch_article_list(
             cortar_no=cortar_no,
             lat=lat,
@@ -473,19 +536,150 @@ def scrape_articles(
             lft=lft,
             top=top,
             rgt=rgt,
+            sort=sort,
         )
-
         items = result["body"]
+        if len(items) > remaining:
+            items = items[: int(remaining)]
+        remaining -= len(items)
+        yield items
+        if not result["more"]:
+            return
+        page += 1
+
+
+_PAGES_DONE = object()
+
+
+def _prefetched(pages: Iterator[List[ArticleRecord]], depth: int) -> Iterator[List[ArticleRecord]]:
+    """pages 를 별도 스레드에서 최대 depth 페이지 앞서 받아 둠. 소비를 멈추면(close/GC) 받는 스레드도 멈춤"""
+    q: "queue.Queue[Any]" = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for page in pages:
+                if not put(page):
+                    return
+            put(_PAGES_DONE)
+        except BaseException as e:
+            put(e)
+        finally:
+            pages.close()
+
+    threading.Thread(target=propagate(produce), name="article-prefetch", daemon=True).start()
+    try:
+        while True:
+            item = q.get()
+            if item is _PAGES_DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+def scrape_articles(
+    cortar_no: str,
+    lat: float,
+    lon: float,
+    limit: int = 50,
+    progress_callback=None,
+    cancel_check=None,
+) -> List[ArticleRecord]:
+    """
+    clusterList → articleList 순서로 매물 수집 (iter_article_pages 결과를 목록으로 모음)
+    - limit 만큼만 모이면 중단(빠른 UI용)
+    """
+    cluster = fetch_cluster_list(cortar_no, lat, lon)
+    tot_cnt = cluster["tot_cnt"]
+    if tot_cnt == 0:
+        return []
+
+    all_items: List[ArticleRecord] = []
+
+    if progress_callback:
+        progress_callback(0, min(tot_cnt, limit), "매물 수집 시작...")
+
+    pages = iter_article_pages(cortar_no, lat, lon, limit=limit, cluster=cluster, cancel_check=cancel_check)
+    for items in pages:
         all_items.extend(items)
 
         if progress_callback:
             progress_callback(min(len(all_items), limit), min(tot_cnt, limit), f"수집 중... ({len(all_items)})")
 
-        if len(all_items) >= limit:
-            break
-        if not result["more"]:
-            break
+    return all_items
 
-        page += 1
 
-    return all_items[:limit]
\ No newline at end of file
+def scrape_regions(
+    regions: Sequence[str],
+    resolve: Callable[[str], Tuple[str, float, float]],
+    limit: int = 50,
+    max_workers: int = 4,
+    progress_callback=None,
+    store=None,
+    max_age_s: Optional[float] = None,
+) -> Tuple[List[Mapping[str, Any]], Dict[str, str]]:
+    """
+    여러 지역 동시 수집 (지역 해석 resolve(name) → (cortarNo, lat, lon) 포함)
+    - 각 매물에 searchRegion(검색 지역명)을 붙이고, 여러 지역에 걸친 같은 atclNo는 처음 것만 남김
+    - 요청 간격은 rate_limited() 로 전체 스레드가 공유
+    - store(listing_store.ListingStore)가 주어지면 수집 결과를 저장하고,
+      max_age_s 초 안에 limit 이상으로 수집한 지역은 네이버 대신 저장소에서 바로 응답
+    반환: (매물 목록 — 새로 수집한 매물은 ArticleRecord, 저장소 매물은 dict, {실패한 지역: 오류 메시지})
+    """
+    regions = list(dict.fromkeys(r.strip() for r in regions if r and r.strip()))
+
+    def work(name: str) -> List[Mapping[str, Any]]:
+        cortar_no, lat, lon = resolve(name)
+        if store is not None and max_age_s and store.is_fresh(cortar_no, max_age_s, min_limit=limit):
+            count("listing_store_lookups", result="fresh")
+            synced = store.last_synced(cortar_no)
+            items = store.listings(cortar_no, limit=limit, active_since=synced)
+        else:
+            if store is not None and max_age_s:
+                count("listing_store_lookups", result="stale")
+            items = scrape_articles(cortar_no=cortar_no, lat=lat, lon=lon, limit=limit)
+            if store is not None:
+                store.upsert(items, cortar_no=cortar_no, limit=limit)
+        return [
+            it.replace(searchRegion=name) if isinstance(it, ArticleRecord) else {**it, "searchRegion": name}
+            for it in items
+        ]
+
+    results: Dict[str, List[Mapping[str, Any]]] = {}
+    errors: Dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(regions)))) as executor:
+        # 작업 스레드의 외부 호출도 호출한 쪽(rerun) 추적에 구간으로 남도록 컨텍스트 전달
+        futures = {name: executor.submit(propagate(work), name) for name in regions}
+        for done, (name, fut) in enumerate(futures.items(), start=1):
+            try:
+                results[name] = fut.result()
+            except Exception as e:
+                record_error("scraper.scrape_regions", e)
+                errors[name] = str(e)
+            if progress_callback:
+                progress_callback(done, len(regions), f"{name} 수집 완료 ({done}/{len(regions)})")
+
+    # 입력 지역 순서대로 병합 + atclNo 중복 제거
+    merged: List[Mapping[str, Any]] = []
+    seen = set()
+    for name in regions:
+        for it in results.get(name, []):
+            key = it.get("atclNo")
+            if key is not None:
+                if key in seen:
+                    continue
+                seen.add(key)
+            merged.append(it)
+    return merged, errors
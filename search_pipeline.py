@@ -0,0 +1,185 @@
+"""
+매물 검색 처리 단계 (render_search 에서 Streamlit 과 무관한 부분)
+- resolve_region: 검색어 → (cortarNo, lat, lon)
+- build_listing_frame: 수집 매물(JSON dict 목록) → 표(items_to_dataframe) + 가격(만원)/면적(평)/가격구간/좌표 숫자 변환(add_derived_columns)
+  iter_listing_frames: 같은 변환을 페이지 단위로 (scraper.iter_article_pages 와 함께)
+- filter_walking: 선택한 지하철 노선까지 도보 시간 계산 + 최대 도보 시간 필터
+- apply_filters: 거래유형/매물유형/면적/예산 필터
+- sort_results: 가격 내림차순 정렬
+
+app.py 와 benchmarks/search_pipeline_bench.py 가 같은 함수를 쓰므로, 벤치마크 수치가 곧 화면의 처리 비용이다.
+"""
+
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, quote, urlparse
+
+import pandas as pd
+
+import resilience
+import scraper
+from instrumentation import timed, timer
+from utils import (
+    estimate_walking_minutes,
+    haversine_distance,
+    items_to_dataframe,
+    parse_price_to_manwon,
+    sqm_to_pyeong,
+)
+
+
+# =========================================================
+# 지역 해석
+# =========================================================
+def _mobile_headers():
+    return {
+        "User-Agent": (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) "
+            "Chrome/120.0.0.0 Mobile Safari/537.36"
+        ),
+        "Referer": "https://m.land.naver.com/",
+        "Accept": "text/html,application/json",
+    }
+
+
+@timed("search.resolve")
+def resolve_region(keyword: str) -> Tuple[str, float, float]:
+    keyword = (keyword or "").strip()
+    if not keyword:
+        raise ValueError("지역명을 입력하세요. 예) 서울 종로구 / 잠실동 / 판교")
+
+    url = f"{scraper.BASE_URL}/search/result/{quote(keyword)}"
+    # 동시 수집 시에도 m.land 요청 간격 예산 공유 (재시도 포함)
+    resp = resilience.get(
+        url,
+        headers=_mobile_headers(),
+        timeout=15,
+        allow_redirects=True,
+        before_attempt=scraper.rate_limited,
+        coalesce=True,
+    )
+    resp.raise_for_status()
+
+    final_url = resp.url
+    parsed = urlparse(final_url)
+    q = parse_qs(parsed.query)
+
+    def pick(name):
+        v = q.get(name)
+        return v[0] if v else None
+
+    cortar_no = pick("cortarNo")
+    lat = pick("lat")
+    lon = pick("lon")
+
+    if cortar_no and lat and lon:
+        return str(cortar_no), float(lat), float(lon)
+
+    html = resp.text
+    m_c = re.search(r'cortarNo["\']?\s*[:=]\s*["\']?(\d+)', html)
+    m_lat = re.search(r'lat["\']?\s*[:=]\s*["\']?([0-9.]+)', html)
+    m_lon = re.search(r'lon["\']?\s*[:=]\s*["\']?([0-9.]+)', html)
+
+    if m_c and m_lat and m_lon:
+        return m_c.group(1), float(m_lat.group(1)), float(m_lon.group(1))
+
+    raise RuntimeError("지역 좌표/코드를 찾지 못했어요. 더 구체적으로 입력해보세요.")
+
+
+# =========================================================
+# 표 변환 / 파생 열
+# =========================================================
+def price_bucket_v2(price_manwon):
+    if price_manwon is None or pd.isna(price_manwon):
+        return "가격정보없음"
+    try:
+        p = float(price_manwon)
+    except:
+        return "가격정보없음"
+
+    if p < 10000:
+        return "1억 미만"
+    elif p < 50000:
+        return "1억 ~ 5억"
+    elif p < 100000:
+        return "5억 ~ 10억"
+    else:
+        return "10억 초과"
+
+
+@timed("search.parse")
+def add_derived_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """가격(만원), 면적(평), 가격구간 열 추가 + 위도/경도 숫자 변환"""
+    df["가격(만원)"] = df["가격"].apply(parse_price_to_manwon)
+    df["면적(평)"] = pd.to_numeric(df["면적(㎡)"], errors="coerce").apply(sqm_to_pyeong)
+    df["가격구간"] = df["가격(만원)"].apply(price_bucket_v2)
+    df["위도"] = pd.to_numeric(df["위도"], errors="coerce")
+    df["경도"] = pd.to_numeric(df["경도"], errors="coerce")
+    return df
+
+
+def build_listing_frame(items: List[Dict[str, Any]]) -> pd.DataFrame:
+    """수집 매물 → 표 (items_to_dataframe + add_derived_columns)"""
+    with timer("search.to_dataframe"):
+        df = items_to_dataframe(items)
+    return add_derived_columns(df)
+
+
+def iter_listing_frames(pages: Iterable[List[Dict[str, Any]]]) -> Iterator[pd.DataFrame]:
+    """페이지 단위 매물(scraper.iter_article_pages) → 페이지별 표. 앞 페이지를 필터/저장하는 동안 다음 페이지를 받을 수 있음"""
+    for items in pages:
+        if items:
+            yield build_listing_frame(items)
+
+
+# =========================================================
+# 필터 / 정렬
+# =========================================================
+@timed("search.walking")
+def filter_walking(df: pd.DataFrame, stations: Mapping[str, Tuple[float, float]], max_minutes: float) -> pd.DataFrame:
+    """노선 역들(역명 → (위도, 경도))까지 최소 도보 시간 '도보시간(분)' 계산 후 max_minutes 이하만"""
+
+    def get_w(row):
+        if pd.isna(row["위도"]) or pd.isna(row["경도"]):
+            return 999
+        m_t = 999
+        for _, (slat, slon) in stations.items():
+            d = haversine_distance(row["위도"], row["경도"], slat, slon)
+            t = estimate_walking_minutes(d)
+            if t < m_t:
+                m_t = t
+        return m_t
+
+    df["도보시간(분)"] = df.apply(get_w, axis=1)
+    return df[df["도보시간(분)"] <= max_minutes]
+
+
+@timed("search.filters")
+def apply_filters(
+    df: pd.DataFrame,
+    trad_selected: Optional[Sequence[str]] = None,
+    rlet_selected: Optional[Sequence[str]] = None,
+    py_min: float = 0.0,
+    py_max: float = 1000.0,
+    budget_limit: int = 0,
+) -> pd.DataFrame:
+    """거래유형/매물유형(선택 없으면 전체), 면적(평) 범위, 예산(만원, 0 이면 제한 없음) 필터"""
+    if trad_selected:
+        df = df[df["거래유형"].isin(trad_selected)]
+    if rlet_selected:
+        df = df[df["매물유형"].isin(rlet_selected)]
+
+    df = df[
+        (df["면적(평)"].isna())
+        | ((df["면적(평)"] >= py_min) & (df["면적(평)"] <= py_max))
+    ]
+
+    if budget_limit > 0:
+        df = df[(df["가격(만원)"].isna()) | (df["가격(만원)"] <= budget_limit)]
+    return df
+
+
+@timed("search.sort")
+def sort_results(df: pd.DataFrame) -> pd.DataFrame:
+    return df.sort_values("가격(만원)", ascending=False).reset_index(drop=True)
@@ -1,15 +1,17 @@
 # subway_data.py
 import csv
 import os
+from functools import lru_cache
 
-def load_subway_data():
+def load_subway_data(csv_path=None):
     """
     station_code.csv 파일을 읽어 호선별 역 좌표 데이터를 딕셔너리로 반환합니다.
     구조: { "1호선": { "서울": (37.55, 126.97), ... }, "2호선": { ... } }
+    csv_path 를 주면 같은 형식의 다른 역 표(예: synthetic_data.py 합성 역 표)를 읽습니다.
     """
     subway_lines = {}
     # 현재 파일 위치 기준으로 csv 경로 설정
-    csv_path = os.path.join(os.path.dirname(__file__), 'station_code.csv')
+    csv_path = csv_path or os.path.join(os.path.dirname(__file__), 'station_code.csv')
     
     if not os.path.exists(csv_path):
         print(f"Warning: {csv_path} 파일을 찾을 수 없습니다.")
@@ -45,5 +47,14 @@ def load_subway_data():
     sorted_lines = dict(sorted(subway_lines.items(), key=lambda x: x[0]))
     return sorted_lines
 
-# 앱 실행 시점에 데이터를 한 번 로드하여 캐싱
-SUBWAY_LINES = load_subway_data()
+@lru_cache(maxsize=1)
+def get_subway_lines():
+    """최초 호출 시 한 번만 CSV를 읽어 캐싱 (import 시점에는 파일을 읽지 않음)"""
+    return load_subway_data()
+
+
+def __getattr__(name):
+    # 기존 `from subway_data import SUBWAY_LINES` 호환: 속성 접근 시점에 지연 로드
+    if name == "SUBWAY_LINES":
+        return get_subway_lines()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,256 @@
+"""
+관심 지역 매물 백그라운드 동기화 (Streamlit 없이 단독 실행)
+- 감시 목록(data/sync_watchlist.json)의 지역을 지역마다 정해진 주기로 다시 수집해 ListingStore 에 기록
+- 증분 수집: articleList 를 확인일자(atclCfmYmd) 최신순으로 받아, 한 페이지가 전부
+  "이미 저장돼 있고 가격/확인일자가 그대로인 매물"이면 그 페이지에서 중단
+  → 평소에는 새로 올라오거나 다시 확인된 매물이 있는 앞쪽 페이지만 요청
+- 증분 수집에서 보지 못한 뒤쪽 매물은 계속 게시 중으로 간주(touch_region)하고,
+  full_every 번에 한 번은 전체를 다시 수집해 내려간 매물을 걸러냄
+- 앱(검색 화면)은 "최근 수집 데이터 우선"이 켜져 있으면 주기 안에 동기화된 지역을 요청 없이 저장소에서 바로 읽음
+
+사용:
+    python sync_worker.py add "서울특별시 강남구" --interval 1800
+    python sync_worker.py add 역삼동 --cortar 1168010100 --lat 37.5006 --lon 127.0364
+    python sync_worker.py list
+    python sync_worker.py run            # 주기 실행 (Ctrl+C 로 종료)
+    python sync_worker.py run --once     # 모든 지역 한 번씩만
+"""
+
+import argparse
+import heapq
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+import instrumentation
+import scraper
+from listing_store import ListingStore
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_WATCHLIST_PATH = os.path.join(_ROOT, "data", "sync_watchlist.json")
+SIGUNGU_COORDS_PATH = os.path.join(_ROOT, "data", "korea_sigungu_coordinates.csv")
+
+DEFAULT_INTERVAL_S = 1800  # 지역별 재수집 주기 (앱의 저장소 우선 유효시간 6시간보다 충분히 짧게)
+RETRY_INTERVAL_S = 300  # 수집 실패 시 다시 시도하기까지 대기
+FULL_SYNC_EVERY = 12  # 증분 N번마다 전체 수집 1번
+FULL_SYNC_LIMIT = 2000  # 전체 수집 시 지역당 최대 매물 수
+INCREMENTAL_LIMIT = 500  # 증분 수집 시 지역당 최대 매물 수 (변경분이 이보다 많으면 다음 주기에 이어서)
+
+
+# =========================================================
+# 감시 목록
+# =========================================================
+def load_watchlist(path: str = DEFAULT_WATCHLIST_PATH) -> List[Dict[str, Any]]:
+    """감시 목록 [{name, cortarNo, lat, lon, interval_s, bounds?}, ...] (파일이 없으면 빈 목록)"""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_watchlist(entries: List[Dict[str, Any]], path: str = DEFAULT_WATCHLIST_PATH) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(entries, f, ensure_ascii=False, indent=2)
+
+
+def sigungu_entry(name: str) -> Optional[Dict[str, Any]]:
+    """'시도 시군구' 이름을 시군구 좌표표로 (cortarNo, 중심좌표) 해석. 없으면 None"""
+    t = pd.read_csv(SIGUNGU_COORDS_PATH, encoding="utf-8-sig", dtype={"시군구코드": str})
+    hit = t[(t["시도"] + " " + t["시군구"]) == name]
+    if hit.empty:
+        return None
+    r = hit.iloc[0]
+    return {"name": name, "cortarNo": r["시군구코드"].ljust(10, "0"), "lat": float(r["위도"]), "lon": float(r["경도"])}
+
+
+# =========================================================
+# 지역 1개 동기화
+# =========================================================
+def sync_region(store: ListingStore, entry: Dict[str, Any], full: bool = False) -> Dict[str, int]:
+    """
+    지역 하나를 수집해 저장소에 반영.
+    full=False 면 확인일자 최신순으로 받으면서 변경 없는 페이지를 만나면 중단.
+    페이지 단위로 받아 바로 저장하므로(전체 수집은 저장하는 동안 다음 페이지를 미리 받음) 지역 매물 수와 무관하게 메모리 사용량이 일정.
+    반환: upsert 통계 + {"fetched": 받은 매물 수, "touched": 게시 유지로 간주한 매물 수}
+    """
+    cortar_no = str(entry["cortarNo"])
+    prev_synced = store.last_synced(cortar_no)
+    incremental = not full and prev_synced is not None
+
+    bounds = entry.get("bounds")
+    pages = scraper.iter_article_pages(
+        cortar_no=cortar_no,
+        lat=float(entry["lat"]),
+        lon=float(entry["lon"]),
+        limit=INCREMENTAL_LIMIT if incremental else FULL_SYNC_LIMIT,
+        sort="dates",
+        bounds=tuple(bounds) if bounds else None,
+        # 증분 수집은 첫 페이지에서 멈추는 경우가 많아 미리 받기는 전체 수집에서만
+        prefetch=0 if incremental else 1,
+    )
+
+    now = time.time()
+    stats = {"new": 0, "updated": 0, "price_changed": 0, "fetched": 0}
+    for page_items in pages:
+        # 저장 전에 확인해야 '이미 알고 있는 페이지'인지 알 수 있음
+        unchanged = incremental and bool(page_items) and not store.changed(page_items)
+        page_stats = store.upsert(page_items, cortar_no=cortar_no, seen_at=now, mark_synced=False)
+        for k, v in page_stats.items():
+            stats[k] += v
+        stats["fetched"] += len(page_items)
+        if unchanged:
+            pages.close()
+            break
+    # 끝까지 받은 뒤에만 동기화 시각 기록 (중간에 실패하면 다음 주기에 같은 기준으로 다시)
+    # 증분 수집은 보지 않은 뒤쪽 매물을 touch_region 으로 유지하므로 직전 수집 상한까지는 그대로 유효
+    limit = max(store.sync_limit(cortar_no) or 0, stats["fetched"]) if incremental else FULL_SYNC_LIMIT
+    store.upsert([], cortar_no=cortar_no, seen_at=now, limit=limit)
+    stats["touched"] = store.touch_region(cortar_no, prev_synced, now) if incremental else 0
+    return stats
+
+
+# =========================================================
+# 주기 실행
+# =========================================================
+class SyncWorker:
+    """
+    감시 목록 지역별 다음 실행 시각을 최소 힙으로 관리하며 순서대로 동기화.
+    요청 간격은 scraper.rate_limited() 를 그대로 따르므로 앱과 같은 프로세스에서 돌려도 예산을 공유한다.
+    """
+
+    def __init__(
+        self,
+        store: ListingStore,
+        entries: List[Dict[str, Any]],
+        full_every: int = FULL_SYNC_EVERY,
+    ):
+        self.store = store
+        self.entries = {str(e["cortarNo"]): e for e in entries}
+        self.full_every = max(1, full_every)
+        self._runs: Dict[str, int] = {}
+        self._heap: List[tuple] = []
+        self._stop = threading.Event()
+
+        # 재시작해도 최근에 동기화한 지역은 남은 주기만큼 기다렸다가 수집
+        now = time.time()
+        for seq, (cortar_no, e) in enumerate(self.entries.items()):
+            last = self.store.last_synced(cortar_no)
+            due = now if last is None else last + self._interval(e)
+            heapq.heappush(self._heap, (due, seq, cortar_no))
+
+    @staticmethod
+    def _interval(entry: Dict[str, Any]) -> float:
+        return float(entry.get("interval_s") or DEFAULT_INTERVAL_S)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def run_one(self, cortar_no: str) -> Optional[Dict[str, int]]:
+        """지역 하나 동기화 (실패하면 None). 실행 횟수로 전체/증분 수집을 정함"""
+        e = self.entries[cortar_no]
+        n = self._runs.get(cortar_no, 0)
+        full = n % self.full_every == self.full_every - 1
+        t0 = time.time()
+        try:
+            with instrumentation.timer("sync.region", mode="full" if full else "incremental"):
+                stats = sync_region(self.store, e, full=full)
+        except Exception as ex:
+            instrumentation.record_error("sync_worker.sync_region", ex)
+            print(f"[sync] {e.get('name', cortar_no)} 실패: {ex}")
+            return None
+        finally:
+            instrumentation.export_from_env()  # METRICS_FILE 이 있으면 지역마다 갱신
+        self._runs[cortar_no] = n + 1
+        mode = "전체" if full else "증분"
+        print(
+            f"[sync] {e.get('name', cortar_no)} {mode} 수집 {stats['fetched']}건 "
+            f"(신규 {stats['new']}, 가격변동 {stats['price_changed']}, 유지 {stats['touched']}) "
+            f"{time.time() - t0:.1f}s"
+        )
+        return stats
+
+    def run(self, once: bool = False) -> None:
+        """stop() 이 호출될 때까지 (once=True 면 모든 지역 한 번씩) 동기화"""
+        if once:
+            for cortar_no in self.entries:
+                self.run_one(cortar_no)
+            return
+
+        while self._heap and not self._stop.is_set():
+            due, seq, cortar_no = self._heap[0]
+            wait = due - time.time()
+            if wait > 0:
+                self._stop.wait(min(wait, 60))
+                continue
+            heapq.heappop(self._heap)
+            stats = self.run_one(cortar_no)
+            next_in = self._interval(self.entries[cortar_no]) if stats is not None else RETRY_INTERVAL_S
+            heapq.heappush(self._heap, (time.time() + next_in, seq, cortar_no))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="관심 지역 매물 백그라운드 동기화")
+    parser.add_argument("--watchlist", default=DEFAULT_WATCHLIST_PATH)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_add = sub.add_parser("add", help="감시 지역 추가 ('시도 시군구' 이름 또는 --cortar/--lat/--lon)")
+    p_add.add_argument("name")
+    p_add.add_argument("--cortar")
+    p_add.add_argument("--lat", type=float)
+    p_add.add_argument("--lon", type=float)
+    p_add.add_argument("--interval", type=int, default=DEFAULT_INTERVAL_S, help="재수집 주기(초)")
+
+    p_rm = sub.add_parser("remove", help="감시 지역 삭제")
+    p_rm.add_argument("name")
+
+    sub.add_parser("list", help="감시 목록과 마지막 동기화 시각")
+
+    p_run = sub.add_parser("run", help="동기화 실행")
+    p_run.add_argument("--once", action="store_true", help="모든 지역 한 번씩만 수집하고 종료")
+    p_run.add_argument("--full-every", type=int, default=FULL_SYNC_EVERY)
+
+    args = parser.parse_args()
+    entries = load_watchlist(args.watchlist)
+
+    if args.cmd == "add":
+        if args.cortar and args.lat is not None and args.lon is not None:
+            entry = {"name": args.name, "cortarNo": args.cortar, "lat": args.lat, "lon": args.lon}
+        else:
+            entry = sigungu_entry(args.name)
+            if entry is None:
+                parser.error(f"'{args.name}' 을(를) 시군구 좌표표에서 찾지 못했습니다. --cortar/--lat/--lon 을 지정하세요.")
+        entry["interval_s"] = args.interval
+        entries = [e for e in entries if str(e["cortarNo"]) != entry["cortarNo"]] + [entry]
+        save_watchlist(entries, args.watchlist)
+        print(f"추가: {entry['name']} ({entry['cortarNo']}), 주기 {args.interval}s")
+    elif args.cmd == "remove":
+        kept = [e for e in entries if e.get("name") != args.name and str(e["cortarNo"]) != args.name]
+        save_watchlist(kept, args.watchlist)
+        print(f"삭제: {len(entries) - len(kept)}개")
+    elif args.cmd == "list":
+        store = ListingStore()
+        for e in entries:
+            ts = store.last_synced(str(e["cortarNo"]))
+            last = time.strftime("%Y-%m-%d %H:%M", time.localtime(ts)) if ts else "-"
+            print(f"{e.get('name', '')}\t{e['cortarNo']}\t주기 {e.get('interval_s', DEFAULT_INTERVAL_S)}s\t마지막 {last}")
+    else:
+        if not entries:
+            parser.error("감시 목록이 비어 있습니다. 먼저 add 로 지역을 추가하세요.")
+        # METRICS_PORT 를 주면 /metrics 로 수집 현황 확인 가능 (instrumentation.py)
+        instrumentation.install_http_metrics()
+        instrumentation.export_from_env()
+        worker = SyncWorker(ListingStore(), entries, full_every=args.full_every)
+        try:
+            worker.run(once=args.once)
+        except KeyboardInterrupt:
+            worker.stop()
+            print("[sync] 종료")
+
+
+if __name__ == "__main__":
+    main()
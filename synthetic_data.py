@@ -0,0 +1,419 @@
+"""
+규모 테스트용 합성 데이터셋 생성기
+- 동봉된 원본(전월세 실거래 약 1.5천 건, 시군구 약 270개, 역 270여 개)보다 수십~수백 배 큰 데이터를
+  원본과 같은 스키마로 만들어, 지역 파이프라인/지역 탐색/매물 검색/POI 엔진을 실제 운영 규모로 측정
+- 생성물 (출력 폴더, 기본 data/synthetic/):
+    region_code.txt                 법정동 코드표 (region_code.txt 와 같은 탭 구분 형식, 가상 법정동 포함)
+    national_rent_data.csv          전월세 실거래 (data/national_rent_data_202401.csv 와 같은 열) → region_pipeline
+    korea_dong_coordinates.csv      법정동 중심좌표 (build_infra_dataset.DONG_COORDS_PATH 형식)
+    station_code.csv                지하철역 표 (station_code.csv 와 같은 열) → subway_data
+    poi_points.npz                  카테고리별 POI 좌표 (poi_engine.POIStore 저장 형식)
+    전국_법정동_인프라_점수.csv     법정동 인프라 개수 (build_dong_infra 와 같은 열, 위 POI 로 집계)
+    articles.jsonl.gz               네이버 articleList 매물 JSON (한 줄에 하나) → utils.items_to_dataframe
+    manifest.json                   생성 설정/건수
+- 실제 법정동을 먼저 쓰고, --dongs 가 그보다 많으면 실제 시군구 아래에 가상 법정동을 추가
+- 지역별 거래/매물/POI 수는 로그정규 가중치로 치우치게 (몇몇 지역에 몰리는 실제 분포와 비슷하게)
+- 같은 seed 면 항상 같은 결과. 거래는 청크 단위로 만들어 바로 쓰므로 수백만 건도 메모리 일정
+
+사용:
+    python synthetic_data.py --preset x100                         # 현재 데이터의 약 100배
+    python synthetic_data.py --preset prod --out data/synthetic_prod
+    python synthetic_data.py --transactions 3000000 --dongs 50000 --listings 100000
+
+    python -c "from region_pipeline import build_rent_summary; build_rent_summary('data/synthetic/national_rent_data.csv',
+               'data/synthetic/region_rent_summary_dong.csv', level='dong', region_code_path='data/synthetic/region_code.txt')"
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+REGION_CODE_PATH = os.path.join(_ROOT, "region_code.txt")
+SIGUNGU_COORDS_PATH = os.path.join(_ROOT, "data", "korea_sigungu_coordinates.csv")
+DEFAULT_OUTPUT_DIR = os.path.join(_ROOT, "data", "synthetic")
+
+RENT_COLUMNS = [
+    "buildYear", "contractTerm", "contractType", "dealDay", "dealMonth", "dealYear", "deposit", "excluUseAr",
+    "floor", "jibun", "monthlyRent", "offiNm", "preDeposit", "preMonthlyRent", "sggCd", "sggNm", "umdNm",
+    "useRRRight", "매물유형",
+]
+STATION_COLUMNS = ["연번", "호선", "고유역번호(외부역코드)", "역명", "위도", "경도", "작성일자", "작성기준일"]
+INFRA_COLUMNS = ["school", "subway", "hospital", "cafe", "academy", "department", "convenience", "culture"]
+
+# 규모 묶음 (개별 인자로 덮어쓸 수 있음). x100 은 동봉 데이터의 약 100배
+PRESETS: Dict[str, Dict[str, int]] = {
+    "small": {"transactions": 20_000, "dongs": 2_000, "listings": 2_000, "lines": 9, "stations_per_line": 30, "pois": 50_000},
+    "x100": {"transactions": 160_000, "dongs": 20_000, "listings": 20_000, "lines": 20, "stations_per_line": 35, "pois": 300_000},
+    "prod": {"transactions": 3_000_000, "dongs": 50_000, "listings": 100_000, "lines": 30, "stations_per_line": 40, "pois": 1_500_000},
+}
+
+# POI 카테고리 비율 (subway 는 합성 역 표에서 따로 만듦)
+POI_MIX = {
+    "cafe": 0.26,
+    "convenience": 0.16,
+    "academy": 0.15,
+    "hospital": 0.17,
+    "school": 0.06,
+    "culture": 0.05,
+    "park": 0.14,
+    "department": 0.01,
+}
+INFRA_RADIUS_M = 1000  # build_infra_dataset.DONG_RADIUS_M 과 같은 반경
+
+_BUILDING_WORDS = ["코아루", "센트럴", "타워", "시티", "스테이", "하이츠", "파크", "리버", "스퀘어", "오피스텔"]
+_BRANDS = ["래미안", "자이", "힐스테이트", "푸르지오", "더샵", "대우", "한화", "휴스턴", "대보", "e편한세상"]
+
+
+# =========================================================
+# 법정동
+# =========================================================
+def _read_region_codes(path: str = REGION_CODE_PATH) -> pd.DataFrame:
+    try:
+        codes = pd.read_csv(path, sep="\t", encoding="utf-8", dtype=str)
+    except UnicodeDecodeError:
+        codes = pd.read_csv(path, sep="\t", encoding="cp949", dtype=str)
+    codes.columns = ["법정동코드", "법정동명", "폐지여부"]
+    return codes
+
+
+def build_dong_table(n_dongs: int, seed: int = 0) -> pd.DataFrame:
+    """
+    법정동 n_dongs 개: 실제 법정동(존재) → 모자라면 실제 시군구 아래 가상 법정동(코드 9xx00) 추가.
+    열: dong_code, region_name, sgg_code, sgg_name(시도 제외), umd_name(실거래 umdNm 형태), virtual, lat, lon, weight
+    """
+    rng = np.random.default_rng([seed, 1])
+    codes = _read_region_codes()
+    codes = codes[codes["폐지여부"] == "존재"]
+    sgg = codes[(codes["법정동코드"].str[5:] == "00000") & (codes["법정동코드"].str[2:5] != "000")]
+    sgg_names = dict(zip(sgg["법정동코드"].str[:5], sgg["법정동명"]))
+
+    real = codes[(codes["법정동코드"].str[5:] != "00000") & codes["법정동코드"].str[:5].isin(sgg_names.keys())]
+    real = real.iloc[rng.permutation(len(real))[:n_dongs]].sort_values("법정동코드")
+    tokens = real["법정동명"].str.split()
+    is_ri = real["법정동코드"].str[8:] != "00"
+    dongs = pd.DataFrame({
+        "dong_code": real["법정동코드"].to_numpy(),
+        "region_name": real["법정동명"].to_numpy(),
+        "sgg_code": real["법정동코드"].str[:5].to_numpy(),
+        # 리 단위는 '읍/면 리' 두 토큰 (region_pipeline.load_dong_codes 의 umd_key 와 같은 규칙)
+        "umd_name": np.where(is_ri, tokens.str[-2] + " " + tokens.str[-1], tokens.str[-1]),
+        "virtual": False,
+    })
+
+    extra = n_dongs - len(dongs)
+    if extra > 0:
+        sgg_codes = np.array(sorted(sgg_names))
+        owner = sgg_codes[rng.integers(0, len(sgg_codes), extra)]
+        seq = pd.Series(owner).groupby(owner).cumcount().to_numpy()
+        umd = [f"가상{i + 1}동" for i in seq]
+        dongs = pd.concat([dongs, pd.DataFrame({
+            # 읍면동 자리 900~999, 리 자리 00 → 100개를 넘으면 리 자리를 씀 (코드 중복 없음)
+            "dong_code": [f"{s}{900 + i % 100:03d}{i // 100:02d}" for s, i in zip(owner, seq)],
+            "region_name": [f"{sgg_names[s]} {u}" for s, u in zip(owner, umd)],
+            "sgg_code": owner,
+            "umd_name": umd,
+            "virtual": True,
+        })], ignore_index=True)
+
+    dongs["sgg_name"] = dongs["sgg_code"].map(lambda c: sgg_names[c].split(" ", 1)[-1])
+
+    # 시군구 중심좌표 주변 (좌표표에 없는 시군구는 서울 근처 임의 위치)
+    centers = pd.read_csv(SIGUNGU_COORDS_PATH, encoding="utf-8-sig", dtype={"시군구코드": str})
+    center = dict(zip(centers["시군구코드"], zip(centers["위도"], centers["경도"])))
+    base = np.array([center.get(c, (np.nan, np.nan)) for c in dongs["sgg_code"]], dtype=np.float64)
+    missing = np.isnan(base[:, 0])
+    base[missing] = np.column_stack([37.45 + rng.random(missing.sum()) * 0.2, 126.85 + rng.random(missing.sum()) * 0.3])
+    dongs["lat"] = np.round(base[:, 0] + rng.normal(0, 0.025, len(dongs)), 6)
+    dongs["lon"] = np.round(base[:, 1] + rng.normal(0, 0.03, len(dongs)), 6)
+    # 거래/매물/POI 가 몰리는 정도
+    dongs["weight"] = rng.lognormal(0.0, 1.0, len(dongs))
+    return dongs.reset_index(drop=True)
+
+
+def write_region_codes(dongs: pd.DataFrame, path: str) -> None:
+    """원본 코드표(시도/시군구 + 폐지 포함) + 가상 법정동 → region_code.txt 형식"""
+    codes = _read_region_codes()
+    extra = dongs[dongs["virtual"]]
+    out = pd.concat([codes, pd.DataFrame({
+        "법정동코드": extra["dong_code"], "법정동명": extra["region_name"], "폐지여부": "존재",
+    })], ignore_index=True)
+    out.to_csv(path, sep="\t", index=False, encoding="utf-8")
+
+
+# =========================================================
+# 전월세 실거래
+# =========================================================
+def _fmt_thousands(values: np.ndarray) -> np.ndarray:
+    return np.array([f"{v:,}" for v in values.tolist()], dtype=object)
+
+
+def rent_transactions(dongs: pd.DataFrame, n: int, seed: int = 0, deal_ymd: str = "202401") -> pd.DataFrame:
+    """national_rent_data_202401.csv 와 같은 열의 오피스텔 전월세 거래 n 건"""
+    rng = np.random.default_rng([seed, 2, n])
+    p = dongs["weight"].to_numpy() / dongs["weight"].sum()
+    di = rng.choice(len(dongs), size=n, p=p)
+
+    area = np.round(rng.lognormal(np.log(27), 0.45, n), 2)
+    jeonse = rng.random(n) < 0.27
+    monthly = np.where(jeonse, 0, np.clip(np.round(rng.lognormal(np.log(50), 0.35, n)), 10, 400)).astype(np.int64)
+    # 전세는 면적 비례, 월세 보증금은 흔한 단위값 위주
+    deposit = np.where(
+        jeonse,
+        np.round(area * rng.lognormal(np.log(550), 0.35, n)),
+        rng.choice([300, 500, 1000, 2000, 3000, 5000], size=n, p=[0.1, 0.35, 0.3, 0.1, 0.08, 0.07]),
+    ).astype(np.int64)
+
+    renewed = rng.random(n)
+    contract_type = np.where(renewed < 0.19, "", np.where(renewed < 0.32, "갱신", "신규"))
+    start_m = int(deal_ymd[4:])
+    years = rng.choice([1, 2], size=n, p=[0.6, 0.4])
+    yy = int(deal_ymd[2:4])
+    term = np.array([f"{yy:02d}.{start_m:02d}~{yy + y:02d}.{start_m:02d}" for y in years.tolist()], dtype=object)
+    term[contract_type == ""] = ""
+
+    pre_deposit = np.full(n, "", dtype=object)
+    pre_rent = np.full(n, "", dtype=object)
+    g = contract_type == "갱신"
+    pre_deposit[g] = _fmt_thousands(deposit[g])
+    pre_rent[g] = np.where(monthly[g] > 0, (monthly[g] * 0.95).astype(np.int64), 0).astype(str)
+
+    sgg = dongs["sgg_code"].to_numpy()[di]
+    names = np.array([f"{a} {b}" for a, b in zip(rng.choice(_BRANDS, n).tolist(), rng.choice(_BUILDING_WORDS, n).tolist())])
+    return pd.DataFrame({
+        "buildYear": rng.integers(1995, 2024, n),
+        "contractTerm": term,
+        "contractType": contract_type,
+        "dealDay": rng.integers(1, 32, n),
+        "dealMonth": start_m,
+        "dealYear": int(deal_ymd[:4]),
+        "deposit": _fmt_thousands(deposit),
+        "excluUseAr": area,
+        "floor": rng.integers(1, 25, n),
+        "jibun": [f"{a}-{b}" if b else str(a) for a, b in zip(rng.integers(1, 1000, n).tolist(), rng.integers(0, 80, n).tolist())],
+        "monthlyRent": monthly,
+        "offiNm": names,
+        "preDeposit": pre_deposit,
+        "preMonthlyRent": pre_rent,
+        "sggCd": sgg,
+        "sggNm": dongs["sgg_name"].to_numpy()[di],
+        "umdNm": dongs["umd_name"].to_numpy()[di],
+        "useRRRight": np.where(g & (rng.random(n) < 0.3), "사용", ""),
+        "매물유형": "오피스텔",
+    }, columns=RENT_COLUMNS)
+
+
+def write_rent_transactions(dongs: pd.DataFrame, n: int, path: str, seed: int = 0, chunk_size: int = 500_000) -> None:
+    """거래 n 건을 chunk_size 씩 만들어 CSV 에 이어 씀 (메모리 사용량이 n 과 무관)"""
+    for i, start in enumerate(range(0, n, chunk_size)):
+        chunk = rent_transactions(dongs, min(chunk_size, n - start), seed=seed * 1_000 + i)
+        chunk.to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False, encoding="utf-8-sig" if i == 0 else "utf-8")
+        print(f"  거래 {start + len(chunk):,}/{n:,}")
+
+
+# =========================================================
+# 지하철역
+# =========================================================
+def station_table(dongs: pd.DataFrame, n_lines: int, per_line: int, seed: int = 0) -> pd.DataFrame:
+    """
+    station_code.csv 와 같은 열의 역 표. 노선마다 거래가 많은 법정동에서 출발해
+    역 간격 약 1.2km 로 방향을 조금씩 틀며 이어지는 경로
+    """
+    rng = np.random.default_rng([seed, 3])
+    p = dongs["weight"].to_numpy() / dongs["weight"].sum()
+    rows: List[Dict[str, Any]] = []
+    used: set = set()
+    for line in range(1, n_lines + 1):
+        start = dongs.iloc[rng.choice(len(dongs), p=p)]
+        lat, lon = float(start["lat"]), float(start["lon"])
+        heading = rng.uniform(0, 2 * np.pi)
+        for k in range(per_line):
+            # 가장 가까운 법정동 이름을 역명으로 (같은 노선 안 중복은 번호)
+            near = int(np.argmin((dongs["lat"].to_numpy() - lat) ** 2 + (dongs["lon"].to_numpy() - lon) ** 2))
+            base = str(dongs["umd_name"].iat[near]).split()[-1]
+            name = base[:-1] if len(base) > 2 and base[-1] in "동리읍면" else base
+            while (line, name) in used:
+                name += "2"
+            used.add((line, name))
+            rows.append({
+                "연번": len(rows) + 1,
+                "호선": line,
+                "고유역번호(외부역코드)": line * 1000 + k,
+                "역명": name,
+                "위도": round(lat, 6),
+                "경도": round(lon, 6),
+                "작성일자": (date(1974, 8, 15) + timedelta(days=int(rng.integers(0, 18000)))).isoformat(),
+                "작성기준일": "2025-08-14",
+            })
+            heading += rng.normal(0, 0.35)
+            lat += 0.0108 * np.sin(heading)
+            lon += 0.0136 * np.cos(heading)
+    return pd.DataFrame(rows, columns=STATION_COLUMNS)
+
+
+# =========================================================
+# POI
+# =========================================================
+def poi_store(dongs: pd.DataFrame, stations: pd.DataFrame, n: int, seed: int = 0):
+    """법정동 가중치대로 흩뿌린 카테고리별 POI n 개 + 합성 역(subway) → poi_engine.POIStore"""
+    from poi_engine import POI_CATEGORIES, POIStore
+
+    rng = np.random.default_rng([seed, 4])
+    p = dongs["weight"].to_numpy() / dongs["weight"].sum()
+    di = rng.choice(len(dongs), size=n, p=p)
+    cats = list(POI_MIX)
+    ci = rng.choice(len(cats), size=n, p=np.array(list(POI_MIX.values())) / sum(POI_MIX.values()))
+    code = np.array([POI_CATEGORIES.index(c) for c in cats], dtype=np.int8)[ci]
+    lat = dongs["lat"].to_numpy()[di] + rng.normal(0, 0.006, n)
+    lon = dongs["lon"].to_numpy()[di] + rng.normal(0, 0.0075, n)
+    subway = np.full(len(stations), POI_CATEGORIES.index("subway"), dtype=np.int8)
+    return POIStore(
+        np.concatenate([lat, stations["위도"].to_numpy()]),
+        np.concatenate([lon, stations["경도"].to_numpy()]),
+        np.concatenate([code, subway]),
+    )
+
+
+def dong_infra(dongs: pd.DataFrame, store) -> pd.DataFrame:
+    """build_infra_dataset.build_dong_infra 와 같은 열 (법정동 중심 반경 내 카테고리별 개수)"""
+    counts = store.count_within_frame(dongs["lat"].to_numpy(), dongs["lon"].to_numpy(), INFRA_RADIUS_M)
+    out = pd.DataFrame({
+        "dong_code": dongs["dong_code"],
+        "region_name": dongs["region_name"],
+        "sigungu_code": dongs["sgg_code"],
+        "위도": dongs["lat"],
+        "경도": dongs["lon"],
+    })
+    for col in INFRA_COLUMNS:
+        out[col] = counts[col].to_numpy()
+    out["total_score"] = out[INFRA_COLUMNS].sum(axis=1)
+    return out
+
+
+# =========================================================
+# 네이버 매물
+# =========================================================
+def iter_articles(dongs: pd.DataFrame, n: int, seed: int = 0, as_of: Optional[date] = None) -> Iterator[Dict[str, Any]]:
+    """
+    articleList body 항목과 같은 키의 매물 dict n 개 (mock_servers.naver_article 재사용 → 대역 서버 응답과 같은 형태).
+    매물ID 는 전체에서 겹치지 않게 다시 매김
+    """
+    from mock_servers import naver_article
+
+    as_of = as_of or date.today()
+    rng = np.random.default_rng([seed, 5])
+    p = dongs["weight"].to_numpy() / dongs["weight"].sum()
+    per_dong = np.bincount(rng.choice(len(dongs), size=n, p=p), minlength=len(dongs))
+    seq = 0
+    for code, k in zip(dongs["dong_code"].tolist(), per_dong.tolist()):
+        for idx in range(k):
+            item = naver_article(code, idx, as_of)
+            atcl_no = f"3{seq:09d}"
+            if item["repImgUrl"]:
+                item["repImgUrl"] = f"/{code}/{atcl_no}_1.jpg"
+            item["atclNo"] = atcl_no
+            seq += 1
+            yield item
+
+
+def write_articles(dongs: pd.DataFrame, n: int, path: str, seed: int = 0) -> None:
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        for i, item in enumerate(iter_articles(dongs, n, seed=seed), 1):
+            f.write(json.dumps(item, ensure_ascii=False, separators=(",", ":")) + "\n")
+            if i % 20_000 == 0:
+                print(f"  매물 {i:,}/{n:,}")
+
+
+def load_articles(path: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """articles.jsonl.gz → 매물 dict 목록 (scraper.scrape_articles 반환값과 같은 형태)"""
+    out: List[Dict[str, Any]] = []
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if limit is not None and len(out) >= limit:
+                break
+            out.append(json.loads(line))
+    return out
+
+
+# =========================================================
+# 전체 생성
+# =========================================================
+def generate(
+    output_dir: str = DEFAULT_OUTPUT_DIR,
+    transactions: int = PRESETS["x100"]["transactions"],
+    dongs: int = PRESETS["x100"]["dongs"],
+    listings: int = PRESETS["x100"]["listings"],
+    lines: int = PRESETS["x100"]["lines"],
+    stations_per_line: int = PRESETS["x100"]["stations_per_line"],
+    pois: int = PRESETS["x100"]["pois"],
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """모든 합성 데이터를 output_dir 에 생성하고 manifest(설정 + 파일별 건수)를 반환"""
+    os.makedirs(output_dir, exist_ok=True)
+    path = lambda name: os.path.join(output_dir, name)  # noqa: E731
+    t0 = time.time()
+
+    print(f"🏘️ 법정동 {dongs:,}개")
+    dong_df = build_dong_table(dongs, seed=seed)
+    write_region_codes(dong_df, path("region_code.txt"))
+    dong_df.rename(columns={"dong_code": "법정동코드", "lat": "위도", "lon": "경도"})[["법정동코드", "위도", "경도"]].to_csv(
+        path("korea_dong_coordinates.csv"), index=False, encoding="utf-8-sig"
+    )
+
+    print(f"📄 전월세 거래 {transactions:,}건")
+    write_rent_transactions(dong_df, transactions, path("national_rent_data.csv"), seed=seed)
+
+    print(f"🚇 지하철 {lines}개 노선 x {stations_per_line}역")
+    stations = station_table(dong_df, lines, stations_per_line, seed=seed)
+    stations.to_csv(path("station_code.csv"), index=False, encoding="utf-8")
+
+    print(f"📍 POI {pois:,}개 + 법정동 인프라 집계")
+    store = poi_store(dong_df, stations, pois, seed=seed)
+    store.save(path("poi_points.npz"))
+    dong_infra(dong_df, store).to_csv(path("전국_법정동_인프라_점수.csv"), index=False, encoding="utf-8-sig")
+
+    print(f"🏠 네이버 매물 {listings:,}건")
+    write_articles(dong_df, listings, path("articles.jsonl.gz"), seed=seed)
+
+    manifest = {
+        "seed": seed,
+        "dongs": len(dong_df),
+        "virtual_dongs": int(dong_df["virtual"].sum()),
+        "transactions": transactions,
+        "stations": len(stations),
+        "lines": lines,
+        "pois": len(store),
+        "listings": listings,
+        "elapsed_s": round(time.time() - t0, 1),
+    }
+    with open(path("manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    print(f"✅ 합성 데이터 생성 완료: {output_dir} ({manifest['elapsed_s']}s)")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="규모 테스트용 합성 데이터셋 생성")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="x100")
+    parser.add_argument("--out", default=DEFAULT_OUTPUT_DIR, help="출력 폴더")
+    parser.add_argument("--seed", type=int, default=0)
+    for key in PRESETS["x100"]:
+        parser.add_argument(f"--{key.replace('_', '-')}", type=int, dest=key, help=f"프리셋 값 대신 사용할 {key}")
+    args = parser.parse_args()
+
+    sizes = dict(PRESETS[args.preset])
+    sizes.update({k: getattr(args, k) for k in sizes if getattr(args, k) is not None})
+    generate(args.out, seed=args.seed, **sizes)
+
+
+if __name__ == "__main__":
+    main()
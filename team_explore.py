@@ -1,12 +1,19 @@
 # team_explore.py
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 import folium
 from streamlit_folium import st_folium
 import os
 
+import boundaries
+import region_features
+import region_scoring
+from region_scoring import top_k_frame
+from geo_index import GeoIndex
+
 INFRA_COLS = [
     "school",
     "subway",
@@ -28,6 +35,11 @@ INFRA_LABELS = {
     "culture": "문화생활",
 }
 
+# 읍면동 단위(수천~수만 행)에서도 지도/차트가 버벅이지 않도록 그리는 개수 상한
+MAP_MAX_POINTS = 3000
+RADAR_MAX_OPTIONS = 500
+TABLE_MAX_ROWS = 1000
+
 
 def format_price(val):
     if pd.isna(val) or val == 0:
@@ -46,85 +58,153 @@ def get_data_path(filename):
     return filename
 
 
-@st.cache_data
-def load_data():
-    main_df = pd.read_csv(get_data_path("region_rent_infra_final.csv"))
-    coord_df = pd.read_csv(get_data_path("korea_sigungu_coordinates.csv"))
-
-    main_df["sidoNm"] = main_df["region_name"].apply(lambda x: str(x).split()[0])
-    main_df["sidoNm"] = main_df["sidoNm"].replace(
-        {"전라북도": "전북특별자치도", "강원도": "강원특별자치도"}
+@st.cache_resource(show_spinner=False)
+def load_features(level="sigungu"):
+    """지역 피처 행렬(region_features)을 분석 단위별로 프로세스당 한 번만 로드해 모든 세션이 공유"""
+    return region_features.load_region_features(level)
+
+
+def load_data(level="sigungu"):
+    # 공유 객체이므로 호출하는 쪽에서 변경 전 copy() 해야 함 (render_team_explore는 view_df 복사본 사용)
+    return load_features(level).to_frame()
+
+
+@st.cache_resource(show_spinner=False)
+def load_scorer(level="sigungu"):
+    """피처 행렬 위 테마 점수 엔진 (설계 행렬은 프로세스당 한 번만 생성)"""
+    return region_scoring.ThemeScorer(load_features(level))
+
+
+@st.cache_resource(show_spinner=False)
+def load_geo_index(level="sigungu"):
+    """지역 중심좌표 최근접 이웃 인덱스 (지도 클릭 → 지역, 반경 X km 내 지역 조회용)"""
+    feats = load_features(level)
+    return GeoIndex(feats.lat, feats.lon)
+
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def rank_top_rows(selected_sido, theme, weight_items, k=5, level="sigungu"):
+    """(시도 필터, 테마, 가중치) 조합별 TOP-K 행 번호 캐시. 가중치는 인프라 테마에서만 키에 포함"""
+    rows = np.flatnonzero(load_features(level).sido_mask(selected_sido))
+    return load_scorer(level).top_rows(theme, dict(weight_items), rows, k)
+
+
+def build_point_layer(map_df, highlight_codes, marker_color, score_col="custom_score"):
+    """
+    지역 점 레이어를 GeoJson 하나로 생성 (행마다 CircleMarker 객체를 만들지 않음).
+    스타일은 feature 속성(hl)으로 결정되어 지도 JS 쪽에서 한 번에 그린다.
+    """
+    codes = map_df["sggCd_key"].to_numpy()
+    names = map_df["full_region"].to_numpy()
+    scores = np.round(map_df[score_col].to_numpy(dtype=np.float64), 1)
+    lats = map_df["위도"].to_numpy(dtype=np.float64)
+    lons = map_df["경도"].to_numpy(dtype=np.float64)
+
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [float(lons[i]), float(lats[i])]},
+            "properties": {
+                "name": str(names[i]),
+                "score": float(scores[i]),
+                "hl": bool(codes[i] in highlight_codes),
+            },
+        }
+        for i in range(len(map_df))
+    ]
+
+    def style(feature):
+        hl = feature["properties"]["hl"]
+        return {
+            "radius": 10 if hl else 5,
+            "color": marker_color if hl else "#3186cc",
+            "fillColor": marker_color if hl else "#3186cc",
+            "fillOpacity": 0.7 if hl else 0.4,
+            "weight": 2 if hl else 1,
+        }
+
+    return folium.GeoJson(
+        {"type": "FeatureCollection", "features": features},
+        name="regions",
+        marker=folium.CircleMarker(radius=5, fill=True),
+        style_function=style,
+        popup=folium.GeoJsonPopup(fields=["name", "score"], aliases=["지역", "테마 점수"]),
     )
-    main_df["sggCd_key"] = main_df["sigungu_code"].astype(str).str.zfill(5).str[:5]
-    coord_df["sggCd_key"] = coord_df["시군구코드"].astype(str).str.zfill(5).str[:5]
 
-    df = pd.merge(
-        main_df, coord_df[["sggCd_key", "위도", "경도"]], on="sggCd_key", how="left"
-    )
-    df["full_region"] = df["region_name"]
-    df.dropna(subset=["full_region", "위도", "경도"], inplace=True)
-
-    for col in INFRA_COLS:
-        if col in df.columns:
-            min_v, max_v = df[col].min(), df[col].max()
-            df[f"norm_{col}"] = (
-                (df[col] - min_v) / (max_v - min_v) if max_v != min_v else 0
-            )
 
-    df["edu_score"] = df.get("school", 0) + df.get("academy", 0)
-    df["transport_comm_score"] = df.get("subway", 0) + df.get("department", 0)
-    df["life_medical_score"] = (
-        df.get("hospital", 0) + df.get("convenience", 0) + df.get("cafe", 0)
+@st.cache_resource(show_spinner=False)
+def load_boundary_set(level, bucket):
+    """간소화 경계 도형 (분석 단위 x 줌 구간별로 프로세스당 한 번 로드)"""
+    return boundaries.load_boundaries(level, bucket)
+
+
+def map_view_zoom(view_key, zoom_key):
+    """경계 간소화 구간을 고를 지도 줌: 사용자가 실제로 보고 있는 줌(st_folium 반환값), 아직 없으면 지도 시작 줌"""
+    return st.session_state.get(view_key) or st.session_state[zoom_key]
+
+
+def follow_map_zoom(out, view_key, zoom_key, center_key, bucket):
+    """
+    st_folium 이 돌려준 실제 줌을 세션(view_key)에 기록.
+    경계 모드(bucket 이 None 이 아님)에서 간소화 구간이 바뀌면 시작 줌/중심도 지금 보던 곳으로 옮기고 rerun
+    → 새 구간 도형으로 다시 그려도 지도가 보던 위치에 머묾
+    """
+    zoom = (out or {}).get("zoom")
+    if not zoom:
+        return
+    st.session_state[view_key] = zoom
+    if bucket is not None and boundaries.zoom_bucket(zoom) != bucket:
+        center = out.get("center") or {}
+        st.session_state[zoom_key] = zoom
+        if "lat" in center and "lng" in center:
+            st.session_state[center_key] = [center["lat"], center["lng"]]
+        st.rerun()
+
+
+def build_choropleth_layer(bset, map_df, highlight_codes, marker_color, score_col="custom_score"):
+    """지역 경계 코로플레스 레이어 (GeoJson 하나, 채움색/강조는 feature 속성으로 결정)"""
+    scores = map_df[score_col].to_numpy(dtype=np.float64)
+    fc = boundaries.choropleth_geojson(
+        bset,
+        map_df["sggCd_key"].to_numpy(),
+        scores,
+        map_df["full_region"].to_numpy(),
+        highlight=highlight_codes,
+        missing=scores < 0,
     )
 
-    df["면적당_보증금"] = 0.0
-    mask = (df["전세_평균면적"] > 0) & (df["전세_평균보증금"] > 0)
-    df.loc[mask, "면적당_보증금"] = (
-        df.loc[mask, "전세_평균보증금"] / df.loc[mask, "전세_평균면적"]
+    def style(feature):
+        props = feature["properties"]
+        return {
+            "fillColor": props["fill"],
+            "fillOpacity": 0.75,
+            "color": marker_color if props["hl"] else "#666666",
+            "weight": 3 if props["hl"] else 0.5,
+        }
+
+    return folium.GeoJson(
+        fc,
+        name="regions",
+        style_function=style,
+        tooltip=folium.GeoJsonTooltip(fields=["name", "score"], aliases=["지역", "테마 점수"]),
     )
-    return df
 
 
 def calculate_custom_scores(
-    target_df, current_theme, w_subway, w_school, w_hospital, w_culture, w_mall
+    target_df, current_theme, w_subway, w_school, w_hospital, w_culture, w_mall, level="sigungu"
 ):
-    res_df = target_df.copy()
-    weights_sum = w_subway + w_school + w_hospital + w_culture + w_mall
-
-    if current_theme == "인프라":
-        if weights_sum > 0:
-            edu_norm_score = (
-                res_df.get("norm_school", 0) + res_df.get("norm_academy", 0)
-            ) / 2
-            infra_score = (
-                (res_df.get("norm_subway", 0) * w_subway)
-                + (edu_norm_score * w_school)
-                + (res_df.get("norm_hospital", 0) * w_hospital)
-                + (res_df.get("norm_culture", 0) * w_culture)
-                + (res_df.get("norm_department", 0) * w_mall)
-            )
-            res_df["custom_score"] = (infra_score / weights_sum * 100).round(1)
-        else:
-            res_df["custom_score"] = 0.0
-    elif current_theme == "전세":
-        valid_df = res_df[res_df["전세_평균보증금"] > 0]
-        if not valid_df.empty:
-            max_deposit = valid_df["전세_평균보증금"].max()
-            res_df["custom_score"] = res_df["전세_평균보증금"].apply(
-                lambda x: round((1 - (x / max_deposit)) * 100, 1) if x > 0 else -1.0
-            )
-        else:
-            res_df["custom_score"] = -1.0
-    else:  # 월세
-        valid_df = res_df[res_df["월세_평균월세"] > 0]
-        if not valid_df.empty:
-            max_monthly = valid_df["월세_평균월세"].max()
-            res_df["custom_score"] = res_df["월세_평균월세"].apply(
-                lambda x: round((1 - (x / max_monthly)) * 100, 1) if x > 0 else -1.0
-            )
-        else:
-            res_df["custom_score"] = -1.0
-
+    # target_df는 load_data() 프레임의 부분집합(원래 행 번호 인덱스 유지)이어야 함
+    weights = {
+        "subway": w_subway,
+        "school": w_school,
+        "hospital": w_hospital,
+        "culture": w_culture,
+        "mall": w_mall,
+    }
+    scores = load_scorer(level).score(weights, target_df.index.to_numpy())
+    # 얕은 복사: 공유 프레임을 건드리지 않고 점수 열만 추가 (데이터 복사 없음)
+    res_df = target_df.copy(deep=False)
+    res_df["custom_score"] = scores[current_theme]
     return res_df
 
 
@@ -135,10 +215,25 @@ def render_team_explore():
     if "team_map_zoom" not in st.session_state:
         st.session_state.team_map_zoom = 7
 
-    df = load_data()
-
     with st.sidebar:
         st.header("🗺️ 지역 및 조건 선택")
+        levels = region_features.available_levels()
+        level = "sigungu"
+        if len(levels) > 1:
+            level = st.radio(
+                "분석 단위",
+                levels,
+                format_func=lambda lv: region_features.LEVEL_LABELS.get(lv, lv),
+                horizontal=True,
+                key="team_level_select",
+            )
+        df = load_data(level)
+        feats = load_features(level)
+        map_mode = "점"
+        if level in boundaries.available_levels():
+            map_mode = st.radio(
+                "지도 표시", ["점", "경계(코로플레스)"], horizontal=True, key="team_map_mode"
+            )
         all_sido = ["전국"] + sorted(df["sidoNm"].unique().tolist())
         selected_sido = st.selectbox(
             "분석할 시도를 선택하세요", all_sido, key="team_sido_select"
@@ -170,9 +265,7 @@ def render_team_explore():
         w_culture = st.slider("🎭 문화생활", 0, 10, 2, key="team_w_culture")
         w_mall = st.slider("🛍️ 쇼핑", 0, 10, 1, key="team_w_mall")
 
-    view_df = df.copy()
-    if selected_sido != "전국":
-        view_df = view_df[view_df["sidoNm"] == selected_sido]
+    view_df = df.iloc[np.flatnonzero(feats.sido_mask(selected_sido))]
 
     st.title(f"🏘️ {selected_sido} 맞춤형 이사 지역 가이드")
 
@@ -193,34 +286,37 @@ def render_team_explore():
             key="team_theme_radio",
         )
         view_df = calculate_custom_scores(
-            view_df, theme, w_subway, w_school, w_hospital, w_culture, w_mall
+            view_df, theme, w_subway, w_school, w_hospital, w_culture, w_mall, level
+        )
+
+        weight_items = (
+            (
+                ("subway", w_subway),
+                ("school", w_school),
+                ("hospital", w_hospital),
+                ("culture", w_culture),
+                ("mall", w_mall),
+            )
+            if theme == "인프라"
+            else ()
         )
+        # view_df 인덱스 = 피처 행렬 행 번호이므로 TOP-K 행 번호로 바로 조회
+        target_df = view_df.loc[rank_top_rows(selected_sido, theme, weight_items, 5, level)]
 
         marker_color = "#3186cc"
         if theme == "월세":
-            target_df = (
-                view_df[view_df["월세_평균월세"] > 0]
-                .sort_values("월세_평균월세", ascending=True)
-                .head(5)
-            )
             theme_title, marker_color, metric_col = (
                 "💰 월세가 저렴한 지역 TOP 5",
                 "green",
                 "월세_평균월세",
             )
         elif theme == "전세":
-            target_df = (
-                view_df[view_df["전세_평균보증금"] > 0]
-                .sort_values("전세_평균보증금", ascending=True)
-                .head(5)
-            )
             theme_title, marker_color, metric_col = (
                 "🏠 전세가 저렴한 지역 TOP 5",
                 "blue",
                 "전세_평균보증금",
             )
         else:
-            target_df = view_df.sort_values("custom_score", ascending=False).head(5)
             theme_title, marker_color, metric_col = (
                 "✨ 인프라 만족도 상위 TOP 5",
                 "crimson",
@@ -260,8 +356,9 @@ def render_team_explore():
                 ):
                     st.session_state.team_map_center = [data["위도"], data["경도"]]
                     st.session_state.team_map_zoom = (
-                        13 if selected_sido != "전국" else 11
+                        14 if level == "dong" else 13 if selected_sido != "전국" else 11
                     )
+                    st.session_state.pop("team_map_view_zoom", None)
                     st.rerun()
 
     with col1:
@@ -271,34 +368,45 @@ def render_team_explore():
             zoom_start=st.session_state.team_map_zoom,
         )
 
-        for _, row in view_df.iterrows():
-            is_highlight = row["sggCd_key"] in highlight_codes
-            popup_html = f"<b>{row['full_region']}</b><br>테마 점수: {row['custom_score']:.1f}"
-
-            folium.CircleMarker(
-                location=[row["위도"], row["경도"]],
-                radius=10 if is_highlight else 5,
-                popup=folium.Popup(popup_html, max_width=300),
-                color=marker_color if is_highlight else "#3186cc",
-                fill=True,
-                fill_opacity=0.7 if is_highlight else 0.4,
-                weight=2 if is_highlight else 1,
-            ).add_to(m)
+        bset, bucket = None, None
+        if map_mode != "점":
+            bucket = boundaries.zoom_bucket(map_view_zoom("team_map_view_zoom", "team_map_zoom"))
+            bset = load_boundary_set(level, bucket)
+
+        # 점이 많으면 테마 점수 상위 MAP_MAX_POINTS 개 + TOP 5 강조 지역만 표시 (경계 모드는 전체)
+        map_df = view_df
+        if bset is not None:
+            build_choropleth_layer(bset, map_df, highlight_codes, marker_color).add_to(m)
+        elif len(view_df) > MAP_MAX_POINTS:
+            map_df = top_k_frame(view_df, "custom_score", MAP_MAX_POINTS)
+            extra = target_df.index.difference(map_df.index)
+            if len(extra):
+                map_df = pd.concat([map_df, view_df.loc[extra]])
+            st.caption(f"지역이 많아 테마 점수 상위 {MAP_MAX_POINTS:,}곳만 지도에 표시합니다. (전체 {len(view_df):,}곳)")
+        if bset is None:
+            build_point_layer(map_df, highlight_codes, marker_color).add_to(m)
 
         # ✅ 클릭 정보 받기
         out = st_folium(m, width="100%", height=500, key="team_main_map")
+        follow_map_zoom(out, "team_map_view_zoom", "team_map_zoom", "team_map_center", bucket if bset is not None else None)
+
+        # ✅ 경계 모드: 클릭한 도형(feature)의 지역 코드로 바로 찾기 (중심좌표 최근접은 큰/불규칙한 지역에서 이웃을 고름)
+        drawing = (out or {}).get("last_active_drawing") if bset is not None else None
+        if drawing:
+            code = str((drawing.get("properties") or {}).get("code", ""))
+            hit = view_df.loc[view_df["sggCd_key"].astype(str) == code, "full_region"]
+            if len(hit):
+                st.session_state["team_picked_region"] = str(hit.iloc[0])
 
         # ✅ 마커(원) 클릭 감지: 클릭 좌표 기준으로 가장 가까운 지역 찾기
-        if out and out.get("last_object_clicked"):
+        elif bset is None and out and out.get("last_object_clicked"):
             lat = out["last_object_clicked"]["lat"]
             lon = out["last_object_clicked"]["lng"]
 
-            # 가장 가까운 행 찾기 (유클리드 근사, 충분히 잘 맞음)
-            tmp = view_df.copy()
-            tmp["__d"] = (tmp["위도"] - lat) ** 2 + (tmp["경도"] - lon) ** 2
-            picked = tmp.sort_values("__d").iloc[0]
-
-            st.session_state["team_picked_region"] = str(picked["full_region"])
+            # 가장 가까운 지역 찾기 (대원거리 최근접 이웃 인덱스)
+            pos, _ = load_geo_index(level).nearest(lat, lon)
+            if pos >= 0:
+                st.session_state["team_picked_region"] = str(feats.name[pos])
 
         # ✅ 선택된 지역이 있으면 “매물 검색” 버튼 노출
         picked_region = st.session_state.get("team_picked_region")
@@ -373,7 +481,7 @@ def render_team_explore():
     st.title("📊 인프라 심층 분석")
     st.info(f"📍 현재 사이드바 설정에 따라 **'{score_label}'** 기준으로 분석 중입니다.")
 
-    top20_df = view_df.sort_values(by=score_col, ascending=False).head(20)
+    top20_df = top_k_frame(view_df, score_col, 20)
     fig_top20 = px.bar(
         top20_df,
         x=score_col,
@@ -394,7 +502,7 @@ def render_team_explore():
     col_a, col_b = st.columns(2)
     with col_a:
         fig_edu = px.bar(
-            view_df.sort_values("edu_score", ascending=True).tail(15),
+            top_k_frame(view_df, "edu_score", 15).iloc[::-1],
             x="edu_score",
             y="full_region",
             orientation="h",
@@ -402,7 +510,7 @@ def render_team_explore():
         )
         st.plotly_chart(fig_edu, use_container_width=True)
         fig_life = px.bar(
-            view_df.sort_values("life_medical_score", ascending=True).tail(15),
+            top_k_frame(view_df, "life_medical_score", 15).iloc[::-1],
             x="life_medical_score",
             y="full_region",
             orientation="h",
@@ -411,7 +519,7 @@ def render_team_explore():
         st.plotly_chart(fig_life, use_container_width=True)
     with col_b:
         fig_trans = px.bar(
-            view_df.sort_values("transport_comm_score", ascending=True).tail(15),
+            top_k_frame(view_df, "transport_comm_score", 15).iloc[::-1],
             x="transport_comm_score",
             y="full_region",
             orientation="h",
@@ -420,7 +528,7 @@ def render_team_explore():
         st.plotly_chart(fig_trans, use_container_width=True)
         rent_eff_df = view_df[view_df["면적당_보증금"] > 0]
         fig_eff = px.bar(
-            rent_eff_df.sort_values("면적당_보증금", ascending=False).tail(15),
+            top_k_frame(rent_eff_df, "면적당_보증금", 15, largest=False).iloc[::-1],
             x="면적당_보증금",
             y="full_region",
             orientation="h",
@@ -430,12 +538,13 @@ def render_team_explore():
 
     st.write("---")
     st.subheader("🎯 지역별 인프라 DNA 비교")
+    radar_options = view_df["full_region"]
+    if len(view_df) > RADAR_MAX_OPTIONS:
+        radar_options = top_k_frame(view_df, score_col, RADAR_MAX_OPTIONS)["full_region"]
     target_regions = st.multiselect(
         "비교할 지역 선택 (최대 4개)",
-        options=view_df["full_region"].unique(),
-        default=view_df.sort_values(score_col, ascending=False)["full_region"]
-        .head(3)
-        .tolist(),
+        options=radar_options.unique(),
+        default=top_k_frame(view_df, score_col, 3)["full_region"].tolist(),
     )
     if target_regions:
         fig_radar = go.Figure()
@@ -460,10 +569,10 @@ def render_team_explore():
     # 하단 테이블
     st.divider()
     st.header("📋 상세 데이터 테이블")
-    disp_df = view_df[
+    # 상위 TABLE_MAX_ROWS 행만 정렬/포맷 (읍면동 전체를 매번 정렬하지 않음)
+    disp_df = top_k_frame(view_df, score_col, TABLE_MAX_ROWS)[
         ["full_region", "전세_평균보증금", "월세_평균월세", "custom_score", "total_score"]
-    ].copy()
-    disp_df = disp_df.sort_values(score_col, ascending=False).reset_index(drop=True)
+    ].reset_index(drop=True)
     disp_df.index += 1
     disp_df["전세_평균보증금"] = disp_df["전세_평균보증금"].apply(format_price)
     disp_df["월세_평균월세"] = disp_df["월세_평균월세"].apply(format_price)
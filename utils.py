@@ -6,10 +6,13 @@ import re
 import math
 import os
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import Any, Mapping, Optional, Sequence
 
+import numpy as np
 import pandas as pd
 
+from article_record import ArticleRecord, record_columns
+
 
 TABLE_COLUMNS = [
     ("atclNo", "매물ID"),
@@ -29,6 +32,8 @@ TABLE_COLUMNS = [
     ("atclFetrDesc", "특징"),
     ("lat", "위도"),
     ("lng", "경도"),
+    # scraper.scrape_regions 가 붙이는 검색 지역명
+    ("searchRegion", "검색지역"),
 ]
 
 
@@ -41,12 +46,19 @@ def _norm(v: Any) -> str:
     return str(v)
 
 
-def items_to_dataframe(items: List[Dict[str, Any]]) -> pd.DataFrame:
-    """네이버 items(list[dict])를 TABLE_COLUMNS 기준으로 DF로 변환"""
+def items_to_dataframe(items: Sequence[Mapping[str, Any]]) -> pd.DataFrame:
+    """네이버 items(ArticleRecord 또는 dict 목록)를 TABLE_COLUMNS 기준으로 DF로 변환"""
     keys = [k for k, _ in TABLE_COLUMNS]
     headers = [h for _, h in TABLE_COLUMNS]
-    rows = [[_norm(it.get(k)) for k in keys] for it in items]
-    return pd.DataFrame(rows, columns=headers)
+    # 행 목록을 만들어 뒤집는 대신 열 단위로 바로 구성 (ArticleRecord 는 속성에서 열째로 꺼냄)
+    if items and all(type(it) is ArticleRecord for it in items):
+        cols = record_columns(items, keys)
+    else:
+        cols = {k: [it.get(k) for it in items] for k in keys}
+    # 대부분 이미 문자열이라 _norm 호출은 None/숫자/목록일 때만
+    return pd.DataFrame(
+        {h: [v if type(v) is str else _norm(v) for v in cols[k]] for k, h in TABLE_COLUMNS}, columns=headers
+    )
 
 
 def parse_price_to_manwon(text: Any) -> Optional[int]:
@@ -93,6 +105,17 @@ def haversine_distance(lat1, lon1, lat2, lon2):
     return R * c
 
 
+def haversine_distance_array(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """haversine_distance의 numpy 벡터 버전 (km). 배열끼리 브로드캐스팅 가능"""
+    R = 6371.0
+    lat1 = np.radians(np.asarray(lat1, dtype=np.float64))
+    lat2 = np.radians(np.asarray(lat2, dtype=np.float64))
+    dLat = lat2 - lat1
+    dLon = np.radians(np.asarray(lon2, dtype=np.float64) - np.asarray(lon1, dtype=np.float64))
+    a = np.sin(dLat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dLon / 2) ** 2
+    return 2 * R * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
 def estimate_walking_minutes(distance_km, speed_kmh=4.8):
     """거리 기반 도보 분 계산 (평균 시속 4.8km 기준)"""
     return (distance_km / speed_kmh) * 60